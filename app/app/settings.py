@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -20,13 +23,23 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure--m5r!xk7t#7p^k2^j4slj6r*slxve)^wb0-nx+hmidkmebzb=#'
-
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Debug mode also records every SQL query of a request in memory.
+DEBUG = os.environ.get('DEBUG') == 'true'
 
-ALLOWED_HOSTS = []
+# SECURITY WARNING: keep the secret key used in production secret!
+# Only debug mode and the test suite may fall back to the public one.
+SECRET_KEY = os.environ.get('SECRET_KEY')
+if not SECRET_KEY:
+    if not DEBUG and sys.argv[1:2] != ['test']:
+        raise ImproperlyConfigured(
+            'Set SECRET_KEY, or DEBUG=true for development.')
+    SECRET_KEY = (
+        'django-insecure--m5r!xk7t#7p^k2^j4slj6r*slxve)^wb0-nx+hmidkmebzb=#')
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get('ALLOWED_HOSTS', '').split(',') if host
+]
 
 
 # Application definition
@@ -38,6 +51,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
     'core',
     'rest_framework',
@@ -49,6 +63,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,14 +100,129 @@ WSGI_APPLICATION = 'app.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # DB_POOL=true shares a bounded pool of connections between the
+        # threads of each process; see core/backends/pooled/base.py.
+        'ENGINE': (
+            'core.backends.pooled' if os.environ.get('DB_POOL') == 'true'
+            else 'django.db.backends.postgresql'
+        ),
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        # Seconds a connection is kept for later requests. Leave at 0 with
+        # runserver, which serves every request on a new thread.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0)),
+        'POOL': {
+            'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 4)),
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 5)),
+            'MODE': os.environ.get('DB_POOL_MODE', 'session'),
+        },
     }
 }
 
+# Read replicas, as comma separated host or host:port entries. Each is
+# added as 'replica_<n>' with the primary's name and credentials; reads
+# of safe requests and exports go to a healthy one.
+DB_REPLICAS = []
+for number, address in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    host, _, port = address.partition(':')
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port,
+        'OPTIONS': {
+            'connect_timeout': int(
+                os.environ.get('DB_REPLICA_CONNECT_TIMEOUT', 2)),
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+    DB_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter'] if DB_REPLICAS else []
+
+# Clients read from the primary for this many seconds after they write.
+DB_REPLICA_PIN_SECONDS = float(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+DB_REPLICA_PIN_CACHE_ALIAS = 'default'
+# Replicas further behind than DB_REPLICA_MAX_LAG seconds, or failing, are
+# skipped; each process checks them every DB_REPLICA_CHECK_INTERVAL seconds.
+DB_REPLICA_MAX_LAG = float(os.environ.get('DB_REPLICA_MAX_LAG', 5))
+DB_REPLICA_CHECK_INTERVAL = float(
+    os.environ.get('DB_REPLICA_CHECK_INTERVAL', 5))
+
+# Kept connections idle for DB_CONN_HEALTH_CHECK_AFTER seconds are checked
+# with a round trip before a request reuses them, so a restarted database
+# does not fail the first request.
+DB_CONN_HEALTH_CHECKS = os.environ.get('DB_CONN_HEALTH_CHECKS') != 'false'
+DB_CONN_HEALTH_CHECK_AFTER = float(
+    os.environ.get('DB_CONN_HEALTH_CHECK_AFTER', 10))
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+        },
+    }
+}
+
+if os.environ.get('CACHE_BACKEND'):
+    CACHES['default'] = {
+        'BACKEND': os.environ.get('CACHE_BACKEND'),
+        'LOCATION': os.environ.get('CACHE_LOCATION'),
+    }
+
+# Anonymous GET responses of the API are cached when enabled.
+API_CACHE_ENABLED = os.environ.get('API_CACHE_ENABLED') == 'true'
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', 300))
+
+# List pages are read with values() and rendered by compiled serializers.
+API_FAST_SERIALIZERS = os.environ.get('API_FAST_SERIALIZERS') != 'false'
+
+# JSON responses are encoded with orjson when it is installed.
+API_FAST_JSON = os.environ.get('API_FAST_JSON') != 'false'
+
+# Article exports are written here by `manage.py run_exports` workers.
+EXPORT_ROOT = os.environ.get('EXPORT_ROOT', os.path.join(BASE_DIR, 'exports'))
+# Running jobs without progress for this many seconds are queued again,
+# up to EXPORT_MAX_ATTEMPTS times.
+EXPORT_STALE_AFTER = int(os.environ.get('EXPORT_STALE_AFTER', 300))
+EXPORT_MAX_ATTEMPTS = int(os.environ.get('EXPORT_MAX_ATTEMPTS', 3))
+# Finished exports are deleted after this many seconds.
+EXPORT_RETENTION = int(os.environ.get('EXPORT_RETENTION', 24 * 60 * 60))
+# Pending or running exports a user may have queued at once.
+EXPORT_MAX_ACTIVE = int(os.environ.get('EXPORT_MAX_ACTIVE', 3))
+
+
+# Request instrumentation (Server-Timing headers and core.timing logs).
+REQUEST_TIMING_ENABLED = os.environ.get('REQUEST_TIMING_ENABLED') == 'true'
+REQUEST_TIMING_SAMPLE_RATE = float(
+    os.environ.get('REQUEST_TIMING_SAMPLE_RATE', 1.0))
+REQUEST_TIMING_DUPLICATE_THRESHOLD = 3
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -112,6 +243,24 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/3.2/topics/auth/passwords/
+
+# Hashes made with another iteration count are upgraded on login.
+PASSWORD_HASH_ITERATIONS = int(
+    os.environ.get('PASSWORD_HASH_ITERATIONS', 260000))
+
+PASSWORD_HASHERS = [
+    'core.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# The suite swaps in a fast hasher; see core.test_runner.
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -136,14 +285,35 @@ STATIC_URL = '/static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Token lookups are cached for AUTH_TOKEN_CACHE_TTL seconds in a per-process
+# LRU of AUTH_TOKEN_CACHE_SIZE entries and, when AUTH_TOKEN_CACHE_ALIAS names
+# a cache, in that shared cache as well.
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get('AUTH_TOKEN_CACHE_SIZE', 1024))
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get('AUTH_TOKEN_CACHE_TTL', 60))
+AUTH_TOKEN_CACHE_ALIAS = os.environ.get('AUTH_TOKEN_CACHE_ALIAS')
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.OptionalKeysetPagination',
     'PAGE_SIZE': 100,
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    # Token buckets of core.throttling.PasswordHashThrottle: per client,
+    # and shared by all clients of the default cache, which is one process
+    # with the local-memory backend. ExportThrottle buckets are per user.
+    'DEFAULT_THROTTLE_RATES': {
+        'password_hash': os.environ.get(
+            'PASSWORD_HASH_THROTTLE_RATE', '10/min'),
+        'password_hash_total': os.environ.get(
+            'PASSWORD_HASH_TOTAL_THROTTLE_RATE', '5/sec'),
+        'export': os.environ.get('EXPORT_THROTTLE_RATE', '10/hour'),
+    },
 }
@@ -21,7 +21,11 @@ from drf_spectacular.views import (
 from django.contrib import admin
 from django.urls import path, include
 
+from core import views as core_views
+
 urlpatterns = [
+    path('health/live/', core_views.live, name='health-live'),
+    path('health/ready/', core_views.ready, name='health-ready'),
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
     path(
@@ -0,0 +1,131 @@
+"""
+Background article exports.
+
+Export jobs are rows of ExportJob. `run_exports` workers claim the oldest
+pending job with SELECT ... FOR UPDATE SKIP LOCKED, so any number of them
+can share the table without a broker, and write the CSV of
+ArticleDownloadCSVView to EXPORT_ROOT one chunk at a time.
+"""
+import csv
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.http import QueryDict
+from django.utils import timezone
+
+from article.views import ArticleDownloadCSVView
+from core.models import ExportJob
+from core.routers import use_replica
+
+logger = logging.getLogger(__name__)
+
+Status = ExportJob.Status
+
+
+class JobLost(Exception):
+    """The job was queued again while this worker was running it."""
+
+
+def to_query_dict(params):
+    """Return the stored {name: [value, ...]} of a job as a QueryDict."""
+    query = QueryDict(mutable=True)
+    for name, values in params.items():
+        query.setlist(name, values)
+    return query
+
+
+def claim_job():
+    """Mark the oldest pending job as running and return it, or None."""
+    with transaction.atomic():
+        job = ExportJob.objects.select_for_update(skip_locked=True).filter(
+            status=Status.PENDING).order_by('created_at').first()
+        if job is None:
+            return None
+        job.status = Status.RUNNING
+        job.attempts += 1
+        job.rows = 0
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.save(update_fields=[
+            'status', 'attempts', 'rows', 'started_at', 'heartbeat_at'])
+    return job
+
+
+def requeue_stale_jobs():
+    """Queue again running jobs whose worker stopped; return their count.
+
+    Jobs that already used EXPORT_MAX_ATTEMPTS attempts fail instead.
+    """
+    stale = ExportJob.objects.filter(
+        status=Status.RUNNING,
+        heartbeat_at__lt=timezone.now() - timedelta(
+            seconds=settings.EXPORT_STALE_AFTER),
+    )
+    stale.filter(attempts__gte=settings.EXPORT_MAX_ATTEMPTS).update(
+        status=Status.FAILED,
+        error='The export stopped responding too many times.',
+        finished_at=timezone.now(),
+    )
+    return stale.update(
+        status=Status.PENDING, started_at=None, heartbeat_at=None)
+
+
+def purge_expired_exports():
+    """Delete jobs finished more than EXPORT_RETENTION seconds ago."""
+    expired = ExportJob.objects.filter(
+        finished_at__lt=timezone.now() - timedelta(
+            seconds=settings.EXPORT_RETENTION))
+    for job in expired:
+        if os.path.exists(job.path):
+            os.remove(job.path)
+    return expired.delete()[0]
+
+
+def run_export(job):
+    """Write the file of a claimed job and record the outcome.
+
+    Rows are read from a replica when one is healthy and written to a
+    temporary file that replaces the final one only when complete, so a
+    download never sees a partial export.
+    """
+    running = ExportJob.objects.filter(
+        pk=job.pk, status=Status.RUNNING, started_at=job.started_at)
+    partial = f'{job.path}.{uuid.uuid4().hex}.part'
+    os.makedirs(settings.EXPORT_ROOT, exist_ok=True)
+    try:
+        with use_replica():
+            view = ArticleDownloadCSVView.for_params(
+                to_query_dict(job.params))
+            queryset = view.filter_queryset(view.get_queryset())
+            with open(partial, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(view.header)
+                for chunk in view.iter_chunks(queryset):
+                    writer.writerows(chunk)
+                    job.rows += len(chunk)
+                    if not running.update(
+                            rows=job.rows, heartbeat_at=timezone.now()):
+                        raise JobLost
+        os.replace(partial, job.path)
+    except JobLost:
+        os.remove(partial)
+        logger.warning('Export %s was taken over by another worker.', job.pk)
+        return job
+    except Exception as exc:
+        if os.path.exists(partial):
+            os.remove(partial)
+        logger.exception('Export %s failed.', job.pk)
+        job.status = Status.FAILED
+        job.error = str(exc) or type(exc).__name__
+    else:
+        job.status = Status.DONE
+        job.size = os.path.getsize(job.path)
+
+    job.finished_at = timezone.now()
+    running.update(
+        status=job.status, rows=job.rows, size=job.size, error=job.error,
+        finished_at=job.finished_at)
+    return job
@@ -8,4 +8,10 @@ class IsAuthor(permissions.BasePermission):
     """Custom permission to allow only the author to edit/delete."""
 
     def has_object_permission(self, request, view, obj):
-        return request.user in obj.authors.all()
+        prefetched = getattr(obj, '_prefetched_objects_cache', {})
+        if 'authors' in prefetched:
+            return any(
+                author.pk == request.user.pk
+                for author in prefetched['authors']
+            )
+        return obj.authors.filter(pk=request.user.pk).exists()
@@ -2,8 +2,11 @@
 Serializers for articles
 """
 from rest_framework import serializers
-from core.models import Article, Tag
+from rest_framework.reverse import reverse
+from core.cache import bump_generation
+from core.models import Article, ExportJob, Tag
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from tag.serializers import TagSerializer
 
 
@@ -24,7 +27,9 @@ class ArticleSerializer(serializers.ModelSerializer):
             'publication_date',
             'main_text',
             'authors',
-            'tags'
+            'tags',
+            'comment_count',
+            'tag_count',
         ]
         read_only_fields = ['id']
 
@@ -36,6 +41,8 @@ class ArticleSerializer(serializers.ModelSerializer):
         for tag_dict in tags:
             tag_obj, _ = Tag.objects.get_or_create(**tag_dict)
             article.tags.add(tag_obj)
+        if tags:
+            article.refresh_from_db(fields=Article.COUNTER_FIELDS)
         return article
 
     def update(self, instance, validated_data):
@@ -47,7 +54,117 @@ class ArticleSerializer(serializers.ModelSerializer):
 
         if tags is not None:
             instance.tags.set(tags)
+            instance.refresh_from_db(fields=Article.COUNTER_FIELDS)
         if authors is not None:
             instance.authors.set(authors)
 
         return instance
+
+
+class ArticleBulkListSerializer(serializers.ListSerializer):
+    """Validate and insert many articles with a fixed number of queries."""
+    max_items = 1000
+
+    def to_internal_value(self, data):
+        if isinstance(data, list) and len(data) > self.max_items:
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    f'Ensure there are no more than {self.max_items} items.'
+                ]
+            })
+        items = super().to_internal_value(data)
+
+        author_ids = {pk for item in items for pk in item['authors']}
+        found = set(get_user_model().objects.filter(
+            pk__in=author_ids).values_list('pk', flat=True))
+        errors = [
+            {'authors': [
+                f'Invalid pk "{pk}" - object does not exist.'
+                for pk in item['authors'] if pk not in found
+            ]}
+            for item in items
+        ]
+        if any(error['authors'] for error in errors):
+            raise serializers.ValidationError(
+                [error if error['authors'] else {} for error in errors])
+        return items
+
+    @transaction.atomic
+    def create(self, validated_data):
+        names = {
+            tag['name'] for item in validated_data for tag in item['tags']
+        }
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in names], ignore_conflicts=True)
+        tag_ids = dict(Tag.objects.filter(
+            name__in=names).values_list('name', 'id'))
+
+        articles = Article.objects.bulk_create([
+            Article(**{
+                key: value for key, value in item.items()
+                if key not in ('authors', 'tags', 'creator')
+            })
+            for item in validated_data
+        ])
+
+        author_links, tag_links = [], []
+        for article, item in zip(articles, validated_data):
+            author_ids = set(item['authors'])
+            if item.get('creator') is not None:
+                author_ids.add(item['creator'].pk)
+            author_links += [
+                Article.authors.through(article_id=article.pk, user_id=pk)
+                for pk in author_ids
+            ]
+            tag_links += [
+                Article.tags.through(article_id=article.pk, tag_id=tag_id)
+                for tag_id in {tag_ids[tag['name']] for tag in item['tags']}
+            ]
+        Article.authors.through.objects.bulk_create(author_links)
+        Article.tags.through.objects.bulk_create(tag_links)
+
+        # bulk_create() sends no signals, so invalidate cached reads here.
+        bump_generation(Article)
+        bump_generation(Tag)
+        return articles
+
+
+class ArticleBulkSerializer(ArticleSerializer):
+    """Serializer for one item of a bulk article upload."""
+    authors = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list
+    )
+    tags = TagSerializer(many=True, required=False, default=list)
+
+    class Meta(ArticleSerializer.Meta):
+        list_serializer_class = ArticleBulkListSerializer
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer for article export jobs."""
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id',
+            'status',
+            'params',
+            'rows',
+            'size',
+            'error',
+            'created_at',
+            'started_at',
+            'finished_at',
+            'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, job):
+        if job.status != ExportJob.Status.DONE:
+            return None
+        return reverse(
+            'article:article-export-download', args=[job.pk],
+            request=self.context.get('request'))
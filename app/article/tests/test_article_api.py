@@ -1,18 +1,25 @@
 """
 Tests for the article API.
 """
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from core.models import Article, Tag
+from core.models import Article, Comment, Tag
 from article.serializers import ArticleSerializer
+from core.pagination import OptionalKeysetPagination
 from datetime import date
+from unittest.mock import patch
+import csv
 
 
 ARTICLES_LIST_URL = reverse('article:article-list')
 ARTICLE_DOWNLOAD_URL = reverse('article:article-download')
+ARTICLE_BULK_URL = reverse('article:article-bulk')
 
 
 def create_user(**params):
@@ -35,6 +42,15 @@ def create_article(authors, **params):
     return article
 
 
+def list_representation(articles):
+    """Return the compact representation lists use by default."""
+    serializer = ArticleSerializer(articles, many=True)
+    return [
+        {k: v for k, v in article.items() if k != 'main_text'}
+        for article in serializer.data
+    ]
+
+
 class PublicArticleApiTest(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -61,9 +77,29 @@ class PublicArticleApiTest(TestCase):
 
         res = self.client.get(ARTICLES_LIST_URL)
         articles = Article.objects.all()
-        serializer = ArticleSerializer(articles, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data["results"], serializer.data)
+        self.assertEqual(res.data["results"], list_representation(articles))
+
+    def test_list_articles_query_count_constant(self):
+        """Test listing articles does not query per article."""
+        user = create_user(
+            username='user1',
+            email='u1@example.com',
+            password='pass1234'
+        )
+        tag = Tag.objects.create(name='tag1')
+        for i in range(20):
+            article = create_article(user, title=f'Article {i}')
+            article.tags.add(tag)
+
+        # count, page of articles, authors prefetch, tags prefetch
+        with self.assertNumQueries(4):
+            res = self.client.get(ARTICLES_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 20)
+        self.assertEqual(res.data["results"][0]['authors'], [user.id])
+        self.assertEqual(res.data["results"][0]['tags'][0]['name'], 'tag1')
 
     def test_filter_articles_by_authors(self):
         """Test filtering articles by author(s)."""
@@ -85,9 +121,8 @@ class PublicArticleApiTest(TestCase):
 
         res = self.client.get(ARTICLES_LIST_URL, {'authors': user1.id})
         articles = Article.objects.filter(authors=user1)
-        serializer = ArticleSerializer(articles, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data["results"], serializer.data)
+        self.assertEqual(res.data["results"], list_representation(articles))
 
     def test_filter_articles_by_tag(self):
         """Test filtering articles by tag(s)."""
@@ -140,9 +175,8 @@ class PublicArticleApiTest(TestCase):
         res = self.client.get(
             ARTICLES_LIST_URL, {'publication_date': date(2025, 6, 10)})
         articles = Article.objects.filter(publication_date=date(2025, 6, 10))
-        serializer = ArticleSerializer(articles, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data["results"], serializer.data)
+        self.assertEqual(res.data["results"], list_representation(articles))
 
     def test_keyword_search(self):
         """Test searching for a keyword."""
@@ -161,6 +195,93 @@ class PublicArticleApiTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
+    def test_full_text_search_ranks_results(self):
+        """Test search matches word forms and ranks title hits first."""
+        user = create_user(
+            username='user1',
+            email='u1@example.com',
+            password='pass1234'
+        )
+        create_article(
+            user,
+            title='Unrelated',
+            main_text='Neurons are evolving')
+        create_article(
+            user,
+            title='Evolution of neurons',
+            main_text='Nothing else')
+        create_article(user, title='Cooking', main_text='Pasta')
+
+        res = self.client.get(ARTICLES_LIST_URL, {'search': 'neuron'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        titles = [article['title'] for article in res.data["results"]]
+        self.assertEqual(titles, ['Evolution of neurons', 'Unrelated'])
+
+    def test_contains_search_mode(self):
+        """Test search_mode=contains keeps substring matching."""
+        user = create_user(
+            username='user1',
+            email='u1@example.com',
+            password='pass1234'
+        )
+        create_article(user, title='Neuroscience')
+        create_article(user, title='Cooking')
+
+        res = self.client.get(
+            ARTICLES_LIST_URL,
+            {'search': 'eurosci', 'search_mode': 'contains'})
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]['title'], 'Neuroscience')
+
+    @patch.object(OptionalKeysetPagination, 'page_size', 4)
+    def test_cursor_pagination_by_publication_date(self):
+        """Test cursor pages walk articles by publication date then id."""
+        user = create_user(
+            username='user1',
+            email='u1@example.com',
+            password='pass1234'
+        )
+        dates = [date(2025, 3, 1), date(2025, 1, 1), date(2025, 2, 1)]
+        for i in range(6):
+            create_article(user, title=f'A{i}', publication_date=dates[i % 3])
+        expected = list(Article.objects.order_by(
+            'publication_date', 'id').values_list('title', flat=True))
+
+        first = self.client.get(ARTICLES_LIST_URL, {'cursor': ''})
+        second = self.client.get(first.data['next'])
+        previous = self.client.get(second.data['previous'])
+
+        self.assertNotIn('count', first.data)
+        self.assertIsNone(first.data['previous'])
+        self.assertIsNone(second.data['next'])
+        titles = [a['title'] for a in first.data['results']]
+        titles += [a['title'] for a in second.data['results']]
+        self.assertEqual(titles, expected)
+        self.assertEqual(
+            [a['title'] for a in previous.data['results']], expected[:4])
+
+    def test_cursor_refuses_other_orderings(self):
+        """Test cursors are not combined with search or other orderings."""
+        user = create_user(username='user1', password='pass1234')
+        create_article(user, title='Neuroscience')
+
+        for params in ({'search': 'neuroscience'},
+                       {'ordering': '-comment_count'}):
+            res = self.client.get(ARTICLES_LIST_URL, {**params, 'cursor': ''})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('cursor', res.data)
+
+        res = self.client.get(
+            ARTICLES_LIST_URL, {'ordering': 'publication_date', 'cursor': ''})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_invalid_cursor_returns_not_found(self):
+        """Test a tampered cursor returns 404."""
+        res = self.client.get(ARTICLES_LIST_URL, {'cursor': 'garbage'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class PrivateArticleApiTest(TestCase):
     def setUp(self):
@@ -204,7 +325,43 @@ class PrivateArticleApiTest(TestCase):
         article = create_article(authors=new_user)
         url = reverse('article:article-detail', args=[article.id])
         res = self.client.patch(url, {'title': 'Hacked'})
-        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_checks_authorship_without_extra_queries(self):
+        """Test the author check reuses the prefetched authors."""
+        other = create_user(
+            username='other',
+            email='other@example.com',
+            password='pass'
+        )
+        article = create_article(authors=[other, self.user])
+        url = reverse('article:article-detail', args=[article.id])
+
+        # Article with its authors and tags, the update, then the authors
+        # and tags of the response; no separate ownership query.
+        with self.assertNumQueries(6):
+            res = self.client.patch(url, {'title': 'Co-written'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(res.data['authors'], [other.id, self.user.id])
+
+    def test_create_adds_requesting_author_once(self):
+        """Test the requesting user is added without a duplicate."""
+        other = create_user(
+            username='other',
+            email='other@example.com',
+            password='pass'
+        )
+        payload = {
+            'title': 'Joint',
+            'abstract': 'Sample abstract',
+            'publication_date': '2025-01-01',
+            'authors': [other.id, self.user.id],
+        }
+        res = self.client.post(ARTICLES_LIST_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertCountEqual(res.data['authors'], [other.id, self.user.id])
 
     def test_delete_own_article(self):
         """Test authorized deletion of article."""
@@ -224,7 +381,7 @@ class PrivateArticleApiTest(TestCase):
         article = create_article(authors=new_user)
         url = reverse('article:article-detail', args=[article.id])
         res = self.client.delete(url)
-        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
         self.assertTrue(Article.objects.filter(id=article.id).exists())
 
     def test_retrieve_article_detail(self):
@@ -258,4 +415,440 @@ class ArticleDownloadCSVTests(TestCase):
             'attachment; filename="articles.csv"',
             res['Content-Disposition']
         )
-        self.assertIn('Sample Title', res.content.decode())
+        self.assertIn('Sample Title', res.getvalue().decode())
+
+    def test_download_csv_streams_related_names(self):
+        """Test CSV rows include authors and tags in constant queries."""
+        tag = Tag.objects.create(name='science')
+        self.article.tags.add(tag)
+        other = create_article(authors=self.user, title='Other Title')
+        other.tags.add(tag)
+
+        res = self.client.get(ARTICLE_DOWNLOAD_URL)
+        # article chunk, authors batch, tags batch
+        with self.assertNumQueries(3):
+            rows = list(csv.reader(
+                b''.join(res.streaming_content).decode().splitlines()))
+
+        self.assertTrue(res.streaming)
+        self.assertEqual(rows[0][0], 'ID')
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][4], "['testuser']")
+        self.assertEqual(rows[2][1], 'Other Title')
+        self.assertEqual(rows[2][5], "['science']")
+
+
+@override_settings(API_CACHE_ENABLED=True)
+class ArticleResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(
+            username='testuser',
+            email='test@example.com',
+            password='pass123')
+        self.article = create_article(authors=self.user)
+
+    def test_anonymous_list_served_from_cache(self):
+        """Test a repeated anonymous list request skips the database."""
+        res = self.client.get(ARTICLES_LIST_URL, {'page': 1})
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(ARTICLES_LIST_URL, {'page': 1})
+            not_modified = self.client.get(
+                ARTICLES_LIST_URL, {'page': 1},
+                HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.data, res.data)
+        self.assertEqual(cached['ETag'], res['ETag'])
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cache_invalidated_on_write(self):
+        """Test saves, m2m changes and related tag edits invalidate."""
+        url = reverse('article:article-detail', args=[self.article.id])
+        self.client.get(url)
+
+        self.article.title = 'New Title'
+        self.article.save()
+        res = self.client.get(url)
+        self.assertEqual(res.data['title'], 'New Title')
+
+        tag = Tag.objects.create(name='old')
+        self.article.tags.add(tag)
+        res = self.client.get(url)
+        self.assertEqual(res.data['tags'][0]['name'], 'old')
+
+        tag.name = 'new'
+        tag.save()
+        res = self.client.get(url)
+        self.assertEqual(res.data['tags'][0]['name'], 'new')
+
+    def test_cache_invalidated_on_author_delete(self):
+        """Test deleting an author drops them from cached articles."""
+        other = create_user(username='other', password='pass123')
+        self.article.authors.add(other)
+        url = reverse('article:article-detail', args=[self.article.id])
+        self.client.get(url)
+        self.client.get(ARTICLES_LIST_URL)
+
+        other.delete()
+
+        self.assertEqual(self.client.get(url).data['authors'], [self.user.id])
+        res = self.client.get(ARTICLES_LIST_URL)
+        self.assertEqual(res.data['results'][0]['authors'], [self.user.id])
+
+    def test_authenticated_requests_not_cached(self):
+        """Test authenticated users always read from the database."""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(ARTICLES_LIST_URL)
+
+        with self.assertNumQueries(4):
+            self.client.get(ARTICLES_LIST_URL)
+
+
+class ArticleCounterApiTests(TestCase):
+    """Test the comment and tag counters of the article API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            username='testuser',
+            email='test@example.com',
+            password='pass123')
+
+    def test_list_sorted_by_comment_count(self):
+        """Test the list exposes the counters and sorts by them."""
+        quiet, busy, middle = [
+            create_article(authors=self.user, title=title)
+            for title in ('quiet', 'busy', 'middle')
+        ]
+        for article, count in ((busy, 3), (middle, 1)):
+            Comment.objects.bulk_create([
+                Comment(author=self.user, article=article, content='c')
+                for _ in range(count)
+            ])
+        busy.tags.add(Tag.objects.create(name='tag'))
+
+        res = self.client.get(
+            ARTICLES_LIST_URL, {'ordering': '-comment_count'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(a['id'], a['comment_count'], a['tag_count'])
+             for a in res.data['results']],
+            [(busy.id, 3, 1), (middle.id, 1, 0), (quiet.id, 0, 0)])
+
+    def test_new_comment_changes_list_etag(self):
+        """Test a new comment invalidates the list validators."""
+        article = create_article(authors=self.user)
+        etag = self.client.get(ARTICLES_LIST_URL)['ETag']
+
+        Comment.objects.create(
+            author=self.user, article=article, content='c')
+        res = self.client.get(ARTICLES_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['comment_count'], 1)
+
+
+class ArticleFacetTests(TestCase):
+    """Test facet counts on the article list."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.alice = create_user(username='alice', password='pass123')
+        self.bob = create_user(username='bob', password='pass123')
+        self.python = Tag.objects.create(name='python')
+        self.django = Tag.objects.create(name='django')
+        for authors, tags, year in [
+            ([self.alice], [self.python, self.django], 2020),
+            ([self.alice, self.bob], [self.python], 2020),
+            ([self.bob], [self.django], 2021),
+            ([self.bob], [], 2021),
+        ]:
+            article = create_article(
+                authors=authors, publication_date=date(year, 1, 1))
+            article.tags.set(tags)
+
+    def test_facet_counts_over_filtered_set(self):
+        """Test facets count every matching article, not just the page."""
+        res = self.client.get(ARTICLES_LIST_URL, {
+            'facets': 'tags,authors,year',
+            'authors': self.bob.id,
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['facets'], {
+            'tags': [
+                {'id': self.python.id, 'name': 'python', 'count': 1},
+                {'id': self.django.id, 'name': 'django', 'count': 1},
+            ],
+            'authors': [
+                {'id': self.bob.id, 'username': 'bob', 'count': 3},
+                {'id': self.alice.id, 'username': 'alice', 'count': 1},
+            ],
+            'year': [{'year': 2021, 'count': 2}, {'year': 2020, 'count': 1}],
+        })
+
+    def test_facets_are_opt_in(self):
+        """Test the list has no facets unless asked and rejects unknown."""
+        res = self.client.get(ARTICLES_LIST_URL)
+        self.assertNotIn('facets', res.data)
+
+        res = self.client.get(ARTICLES_LIST_URL, {'facets': 'title'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(API_CACHE_ENABLED=True)
+    @patch.object(OptionalKeysetPagination, 'page_size', 2)
+    def test_facets_cached_across_pages(self):
+        """Test paging with the same filters reuses the facet counts."""
+        self.client.force_authenticate(self.alice)
+        params = {'facets': 'tags,authors,year', 'count': 'false'}
+
+        # Page with its authors and tags, one grouped query per facet and
+        # the labels of the two many-to-many facets.
+        with self.assertNumQueries(8):
+            first = self.client.get(ARTICLES_LIST_URL, params)
+        with self.assertNumQueries(3):
+            second = self.client.get(
+                ARTICLES_LIST_URL, {**params, 'page': 2})
+
+        self.assertEqual(second.data['facets'], first.data['facets'])
+        Article.objects.first().tags.clear()
+        res = self.client.get(ARTICLES_LIST_URL, params)
+        self.assertEqual(
+            res.data['facets']['tags'],
+            [{'id': self.python.id, 'name': 'python', 'count': 1},
+             {'id': self.django.id, 'name': 'django', 'count': 1}])
+
+    @override_settings(API_CACHE_ENABLED=True)
+    def test_cached_facets_follow_username_changes(self):
+        """Test renaming an author refreshes cached author facets."""
+        params = {'facets': 'authors', 'authors': self.alice.id}
+        self.client.get(ARTICLES_LIST_URL, params)
+
+        self.alice.username = 'alicia'
+        self.alice.save()
+        res = self.client.get(ARTICLES_LIST_URL, params)
+
+        self.assertEqual(
+            res.data['facets']['authors'][0]['username'], 'alicia')
+
+
+class ArticleSparseFieldsTests(TestCase):
+    """Test sparse fieldsets on the article API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(username='testuser', password='pass123')
+        self.article = create_article(
+            authors=self.user, main_text='A very long body')
+        self.detail_url = reverse(
+            'article:article-detail', args=[self.article.id])
+
+    def test_list_omits_main_text_by_default(self):
+        """Test lists leave out main_text and do not read it."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ARTICLES_LIST_URL)
+
+        self.assertNotIn('main_text', res.data['results'][0])
+        self.assertIn('abstract', res.data['results'][0])
+        self.assertFalse(any(
+            'main_text' in query['sql'] for query in queries))
+
+    def test_detail_is_complete(self):
+        """Test the detail view still renders every field."""
+        res = self.client.get(self.detail_url)
+
+        self.assertEqual(res.data['main_text'], 'A very long body')
+        self.assertEqual(
+            res.data, ArticleSerializer(self.article).data)
+
+    def test_fields_and_omit(self):
+        """Test ?fields= and ?omit= select what is rendered and loaded."""
+        # Count, page and tags; authors are not prefetched.
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                ARTICLES_LIST_URL, {'fields': 'id,main_text,tags'})
+        self.assertEqual(
+            res.data['results'],
+            [{'id': self.article.id, 'main_text': 'A very long body',
+              'tags': []}])
+
+        # Without relations the page is the only query besides the count.
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                ARTICLES_LIST_URL, {'omit': 'authors,tags,abstract'})
+        self.assertEqual(
+            list(res.data['results'][0]),
+            ['id', 'title', 'publication_date', 'comment_count', 'tag_count'])
+
+        res = self.client.get(self.detail_url, {'fields': 'id,title'})
+        self.assertEqual(
+            res.data, {'id': self.article.id, 'title': self.article.title})
+
+    def test_unknown_field(self):
+        """Test naming a field the serializer lacks is an error."""
+        res = self.client.get(ARTICLES_LIST_URL, {'omit': 'body'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('omit', res.data)
+
+    def test_writes_use_every_field(self):
+        """Test ?fields= does not restrict what a write accepts."""
+        self.client.force_authenticate(self.user)
+        res = self.client.patch(
+            f'{self.detail_url}?fields=id', {'main_text': 'Edited'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['main_text'], 'Edited')
+
+
+class ArticleConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            username='testuser',
+            email='test@example.com',
+            password='pass123')
+        self.article = create_article(authors=self.user)
+        self.url = reverse('article:article-detail', args=[self.article.id])
+
+    def test_detail_not_modified(self):
+        """Test a matching ETag returns 304 without serializing."""
+        res = self.client.get(self.url)
+        self.assertIn('ETag', res)
+        self.assertIn('Last-Modified', res)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+
+    def test_list_has_no_last_modified(self):
+        """Test lists validate by ETag only, not If-Modified-Since."""
+        res = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', self.client.get(ARTICLES_LIST_URL))
+
+        res = self.client.get(
+            ARTICLES_LIST_URL,
+            HTTP_IF_MODIFIED_SINCE=res['Last-Modified'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_changes_with_article_and_tags(self):
+        """Test edits to the article, its tags and its tag names."""
+        etags = [self.client.get(self.url)['ETag']]
+        self.article.title = 'Changed'
+        self.article.save()
+        etags.append(self.client.get(self.url)['ETag'])
+        tag = Tag.objects.create(name='tag')
+        self.article.tags.add(tag)
+        etags.append(self.client.get(self.url)['ETag'])
+        tag.name = 'renamed'
+        tag.save()
+        etags.append(self.client.get(self.url)['ETag'])
+
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_list_etag_changes_on_delete(self):
+        """Test deleting an article from the list changes its ETag."""
+        create_article(authors=self.user, title='Second')
+        etag = self.client.get(ARTICLES_LIST_URL)['ETag']
+
+        self.article.delete()
+        res = self.client.get(ARTICLES_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_detail_etag_changes_when_author_deleted(self):
+        """Test deleting an author changes the article's validators."""
+        other = create_user(username='other', password='pass123')
+        self.article.authors.add(other)
+        etag = self.client.get(self.url)['ETag']
+
+        other.delete()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['authors'], [self.user.id])
+
+
+class ArticleBulkCreateTests(TestCase):
+    def setUp(self):
+        self.user = create_user(
+            username='user1',
+            email='u1@example.com',
+            password='pass'
+        )
+        self.other = create_user(
+            username='user2',
+            email='u2@example.com',
+            password='pass'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def payload(self, count, **params):
+        items = []
+        for i in range(count):
+            item = {
+                'title': f'Bulk {i}',
+                'abstract': 'Abstract',
+                'publication_date': '2025-01-01',
+                'authors': [self.other.id],
+                'tags': [{'name': 'shared'}, {'name': f'tag{i}'}],
+            }
+            item.update(params)
+            items.append(item)
+        return items
+
+    def test_auth_required(self):
+        """Test bulk creation requires authentication."""
+        res = APIClient().post(
+            ARTICLE_BULK_URL, self.payload(1), format='json')
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_create_articles(self):
+        """Test articles, tags and authors are created in batches."""
+        Tag.objects.create(name='shared')
+
+        # Independent of the number of items.
+        with self.assertNumQueries(11):
+            res = self.client.post(
+                ARTICLE_BULK_URL, self.payload(20), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 20)
+        self.assertEqual(Tag.objects.filter(name='shared').count(), 1)
+        article = Article.objects.get(title='Bulk 3')
+        self.assertEqual(
+            set(article.authors.all()), {self.user, self.other})
+        self.assertEqual(
+            sorted(article.tags.values_list('name', flat=True)),
+            ['shared', 'tag3'])
+
+    def test_bulk_create_reports_errors_per_item(self):
+        """Test invalid items are reported by index and nothing is saved."""
+        items = self.payload(3)
+        items[1]['publication_date'] = 'not a date'
+        items[2]['authors'] = [999999]
+
+        res = self.client.post(ARTICLE_BULK_URL, items, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('publication_date', res.data[1])
+        self.assertFalse(Article.objects.exists())
+
+        del items[1]
+        res = self.client.post(ARTICLE_BULK_URL, items, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('authors', res.data[1])
+        self.assertFalse(Article.objects.exists())
@@ -0,0 +1,270 @@
+"""
+Tests for the article export API.
+"""
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from article import exports
+from core.models import Article, ExportJob, Tag
+
+ARTICLE_DOWNLOAD_URL = reverse('article:article-download')
+ARTICLE_EXPORT_URL = reverse('article:article-export')
+
+
+def detail_url(job):
+    return reverse('article:article-export-detail', args=[job.pk])
+
+
+def download_url(job):
+    return reverse('article:article-export-download', args=[job.pk])
+
+
+def run_worker():
+    call_command('run_exports', once=True, stdout=StringIO())
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        override = override_settings(EXPORT_ROOT=tmpdir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = get_user_model().objects.create(username='author')
+        self.client.force_authenticate(self.user)
+        # Start every test with full throttle buckets.
+        cache.clear()
+        self.tag = Tag.objects.create(name='Biology')
+        for i in range(3):
+            article = Article.objects.create(
+                title=f'Título {i}',
+                abstract='Abstract, with "quotes"',
+                publication_date=date(2021, 1, i + 1),
+            )
+            article.authors.set([self.user])
+            if i:
+                article.tags.set([self.tag])
+
+    def export(self, params=None):
+        """Queue an export for `params`, run the worker, return the job."""
+        res = self.client.post(
+            ARTICLE_EXPORT_URL + (f'?{params}' if params else ''))
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        run_worker()
+        return ExportJob.objects.get(pk=res.data['id'])
+
+
+class ArticleExportApiTests(ExportTestCase):
+    """Test queueing, polling and downloading exports."""
+
+    def test_create_export_queues_job(self):
+        """Test posting filters queues a pending job."""
+        res = self.client.post(f'{ARTICLE_EXPORT_URL}?tags={self.tag.pk}')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        job = ExportJob.objects.get(pk=res.data['id'])
+        self.assertEqual(job.status, ExportJob.Status.PENDING)
+        self.assertEqual(job.params, {'tags': [str(self.tag.pk)]})
+        self.assertEqual(job.requested_by, self.user)
+        self.assertTrue(res['Location'].endswith(detail_url(job)))
+        self.assertIsNone(res.data['download_url'])
+
+    def test_create_export_requires_authentication(self):
+        """Test anonymous clients cannot queue exports."""
+        self.client.force_authenticate(None)
+
+        res = self.client.post(ARTICLE_EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_repeated_export_returns_active_job(self):
+        """Test queueing the same export again returns the queued job."""
+        url = f'{ARTICLE_EXPORT_URL}?tags={self.tag.pk}'
+        first = self.client.post(url)
+        ExportJob.objects.filter(pk=first.data['id']).update(
+            status=ExportJob.Status.RUNNING)
+
+        res = self.client.post(url)
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['id'], first.data['id'])
+        self.assertEqual(res['Location'], first['Location'])
+        self.assertEqual(ExportJob.objects.count(), 1)
+
+    @override_settings(EXPORT_MAX_ACTIVE=2)
+    def test_active_exports_are_capped(self):
+        """Test a user cannot queue more than EXPORT_MAX_ACTIVE jobs."""
+        for term in ('one', 'two'):
+            res = self.client.post(f'{ARTICLE_EXPORT_URL}?search={term}')
+            self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+
+        res = self.client.post(f'{ARTICLE_EXPORT_URL}?search=three')
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        ExportJob.objects.update(status=ExportJob.Status.DONE)
+        res = self.client.post(f'{ARTICLE_EXPORT_URL}?search=three')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'export': '2/hour'},
+    })
+    def test_create_export_is_throttled(self):
+        """Test a user's export requests are rate limited."""
+        for _ in range(2):
+            res = self.client.post(ARTICLE_EXPORT_URL)
+            self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+
+        res = self.client.post(ARTICLE_EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', res)
+
+    def test_create_export_rejects_invalid_filters(self):
+        """Test invalid filters are reported before queueing."""
+        res = self.client.post(f'{ARTICLE_EXPORT_URL}?tags=9999')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_export_matches_download(self):
+        """Test the finished export is the streamed CSV download."""
+        job = self.export(f'tags={self.tag.pk}')
+        streamed = b''.join(self.client.get(
+            ARTICLE_DOWNLOAD_URL, {'tags': self.tag.pk}).streaming_content)
+
+        res = self.client.get(detail_url(job))
+        self.assertEqual(res.data['status'], 'done')
+        self.assertEqual(res.data['rows'], 2)
+        self.assertEqual(res.data['size'], len(streamed))
+        self.assertTrue(res.data['download_url'].endswith(download_url(job)))
+
+        res = self.client.get(download_url(job))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        self.assertIn('attachment', res['Content-Disposition'])
+        self.assertEqual(b''.join(res.streaming_content), streamed)
+
+    def test_download_ranges(self):
+        """Test byte ranges, suffix ranges and If-Range are honoured."""
+        job = self.export()
+        with open(job.path, 'rb') as f:
+            content = f.read()
+        url = download_url(job)
+
+        res = self.client.get(url, HTTP_RANGE='bytes=5-14')
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(
+            res['Content-Range'], f'bytes 5-14/{len(content)}')
+        self.assertEqual(res['Content-Length'], '10')
+        self.assertEqual(b''.join(res.streaming_content), content[5:15])
+
+        res = self.client.get(url, HTTP_RANGE='bytes=-7')
+        self.assertEqual(b''.join(res.streaming_content), content[-7:])
+
+        res = self.client.get(url, HTTP_RANGE=f'bytes={len(content)}-')
+        self.assertEqual(
+            res.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(res['Content-Range'], f'bytes */{len(content)}')
+
+        etag = self.client.get(url)['ETag']
+        res = self.client.get(url, HTTP_RANGE='bytes=5-', HTTP_IF_RANGE=etag)
+        self.assertEqual(b''.join(res.streaming_content), content[5:])
+        res = self.client.get(
+            url, HTTP_RANGE='bytes=5-', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(res.streaming_content), content)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_download_unfinished_export(self):
+        """Test downloading a pending export is a conflict."""
+        job = ExportJob.objects.create()
+
+        res = self.client.get(download_url(job))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+
+class ExportWorkerTests(ExportTestCase):
+    """Test the export queue and the run_exports worker."""
+
+    def test_claim_skips_running_jobs(self):
+        """Test jobs are claimed oldest first, once, with an attempt."""
+        first, second = ExportJob.objects.create(), ExportJob.objects.create()
+
+        self.assertEqual(exports.claim_job(), first)
+        claimed = exports.claim_job()
+        self.assertEqual(claimed, second)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNone(exports.claim_job())
+
+    def test_stale_jobs_are_queued_again(self):
+        """Test stalled jobs are retried until they run out of attempts."""
+        old = timezone.now() - timedelta(hours=1)
+        retry = ExportJob.objects.create(
+            status=ExportJob.Status.RUNNING, attempts=1, heartbeat_at=old)
+        give_up = ExportJob.objects.create(
+            status=ExportJob.Status.RUNNING, attempts=3, heartbeat_at=old)
+        ExportJob.objects.create(
+            status=ExportJob.Status.RUNNING, attempts=1,
+            heartbeat_at=timezone.now())
+
+        self.assertEqual(exports.requeue_stale_jobs(), 1)
+        retry.refresh_from_db()
+        give_up.refresh_from_db()
+        self.assertEqual(retry.status, ExportJob.Status.PENDING)
+        self.assertEqual(give_up.status, ExportJob.Status.FAILED)
+
+    def test_failed_export_records_error(self):
+        """Test a failing export is marked failed without a file."""
+        job = ExportJob.objects.create(params={'tags': ['not a tag']})
+
+        with self.assertLogs('article.exports', 'ERROR'):
+            run_worker()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+        self.assertTrue(job.error)
+        self.assertFalse(os.listdir(settings.EXPORT_ROOT))
+
+    def test_lost_job_is_abandoned(self):
+        """Test a worker stops when its job was queued again."""
+        ExportJob.objects.create()
+        job = exports.claim_job()
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.Status.PENDING)
+
+        with self.assertLogs('article.exports', 'WARNING'):
+            exports.run_export(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.PENDING)
+        self.assertFalse(os.listdir(settings.EXPORT_ROOT))
+
+    def test_expired_exports_are_purged(self):
+        """Test old finished exports lose their job and file."""
+        job = self.export()
+        ExportJob.objects.filter(pk=job.pk).update(
+            finished_at=timezone.now() - timedelta(days=2))
+
+        run_worker()
+
+        self.assertFalse(ExportJob.objects.exists())
+        self.assertFalse(os.path.exists(job.path))
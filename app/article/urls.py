@@ -3,6 +3,7 @@ URL mappings for the article API.
 """
 from django.urls import path
 from article import views
+from comment.views import ArticleCommentListView
 app_name = 'article'
 
 urlpatterns = [
@@ -11,14 +12,39 @@ urlpatterns = [
         views.ArticleListCreateView.as_view(),
         name='article-list'
     ),
+    path(
+        'bulk/',
+        views.ArticleBulkCreateView.as_view(),
+        name='article-bulk'
+    ),
     path(
         '<int:pk>/',
         views.ArticleDetailView.as_view(),
         name='article-detail'
     ),
+    path(
+        '<int:article_pk>/comments/',
+        ArticleCommentListView.as_view(),
+        name='article-comments'
+    ),
     path(
         'download/',
         views.ArticleDownloadCSVView.as_view(),
         name='article-download'
     ),
+    path(
+        'exports/',
+        views.ArticleExportCreateView.as_view(),
+        name='article-export'
+    ),
+    path(
+        'exports/<uuid:pk>/',
+        views.ArticleExportDetailView.as_view(),
+        name='article-export-detail'
+    ),
+    path(
+        'exports/<uuid:pk>/download/',
+        views.ArticleExportDownloadView.as_view(),
+        name='article-export-download'
+    ),
 ]
@@ -1,28 +1,74 @@
 """
 Views for the article API.
 """
-from rest_framework import generics, permissions
-from core.models import Article
-from article.serializers import ArticleSerializer
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound
+from rest_framework.reverse import reverse
+from rest_framework.request import Request
+from rest_framework.response import Response
+from core.models import Article, Comment, ExportJob, Tag
+from article.serializers import (
+    ArticleBulkSerializer, ArticleSerializer, ExportJobSerializer)
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter
 from article.permissions import IsAuthor
+from core.cache import CachedResponseMixin
+from core.downloads import ranged_file_response
+from core.fastpath import FastListMixin
+from core.facets import FacetMixin
+from core.filters import FullTextSearchFilter, StableOrderingFilter
+from core.mixins import (
+    ConditionalGetMixin, EagerLoadingMixin, SparseFieldsMixin)
+from core.throttling import ExportThrottle
 import csv
-from django.http import HttpResponse
+import os
+from collections import defaultdict
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import HttpRequest, StreamingHttpResponse
 
 
-class ArticleListCreateView(generics.ListCreateAPIView):
+class Echo:
+    """File-like object that returns what is written instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class ArticleListCreateView(
+        CachedResponseMixin,
+        FastListMixin,
+        SparseFieldsMixin,
+        ConditionalGetMixin,
+        EagerLoadingMixin,
+        FacetMixin,
+        generics.ListCreateAPIView):
     """View for listing and creating articles."""
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    cache_models = (Article, Comment, Tag)
+    last_modified_fields = ('updated_at', 'tags__updated_at')
+    filter_backends = [
+        DjangoFilterBackend, FullTextSearchFilter, StableOrderingFilter]
     filterset_fields = ['publication_date', 'authors', 'tags']
     search_fields = ['title', 'abstract', 'main_text']
+    search_vector_field = 'search_vector'
+    ordering_fields = ['publication_date', 'comment_count', 'tag_count']
+    # Full texts dominate the page size; lists send them on request only.
+    list_omit_fields = ['main_text']
+    facet_fields = {
+        'tags': {'id': 'tags', 'name': 'tags__name'},
+        'authors': {'id': 'authors', 'username': 'authors__username'},
+        'year': {'year': 'publication_date__year'},
+    }
+    keyset_ordering = ('publication_date', 'id')
 
     def perform_create(self, serializer):
-        article = serializer.save()
-        if self.request.user not in article.authors.all():
-            article.authors.add(self.request.user)
+        authors = serializer.validated_data.get('authors', [])
+        if self.request.user not in authors:
+            authors = [*authors, self.request.user]
+        serializer.save(authors=authors)
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -30,10 +76,42 @@ class ArticleListCreateView(generics.ListCreateAPIView):
         return [permissions.AllowAny()]
 
 
-class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ArticleBulkCreateView(generics.CreateAPIView):
+    """View for creating many articles in one transaction."""
+    serializer_class = ArticleBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        articles = serializer.save(creator=request.user)
+        queryset = Article.objects.filter(
+            pk__in=[article.pk for article in articles]
+        ).prefetch_related('authors', 'tags')
+        return Response(
+            ArticleSerializer(queryset, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class ArticleDetailView(
+        CachedResponseMixin,
+        SparseFieldsMixin,
+        ConditionalGetMixin,
+        EagerLoadingMixin,
+        generics.RetrieveUpdateDestroyAPIView):
     """View for retrieving, updating, or deleting an article."""
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
+    cache_models = (Article, Comment, Tag)
+    last_modified_fields = ('updated_at', 'tags__updated_at')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in ['PUT', 'PATCH', 'DELETE']:
+            # Articles of other authors are reported as missing.
+            queryset = queryset.editable_by(self.request.user)
+        return queryset
 
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
@@ -45,34 +123,150 @@ class ArticleDownloadCSVView(generics.ListAPIView):
     """View for returning a csv with filtered articles."""
     queryset = Article.objects.all().order_by('id')
     serializer_class = ArticleSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['publication_date', 'authors', 'tags', 'id']
     search_fields = ['title', 'abstract', 'main_text']
+    search_vector_field = 'search_vector'
+
+    chunk_size = 2000
+    header = [
+        'ID',
+        'Title',
+        'Abstract',
+        'Publication Date',
+        'Authors',
+        'Tags'
+    ]
+
+    @classmethod
+    def for_params(cls, params):
+        """Return a view set up to filter articles by query `params`."""
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = params
+        view = cls()
+        view.setup(Request(request))
+        view.format_kwarg = None
+        return view
 
     def get(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+        writer = csv.writer(Echo())
 
-        response = HttpResponse(content_type='text/csv')
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in self.iter_rows(queryset)),
+            content_type='text/csv'
+        )
         response['Content-Disposition'] = 'attachment; filename="articles.csv"'
+        return response
 
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID',
-            'Title',
-            'Abstract',
-            'Publication Date',
-            'Authors',
-            'Tags'
-        ])
-
-        for article in queryset:
-            writer.writerow([
-                article.id,
-                article.title,
-                article.abstract,
-                article.publication_date,
-                [author.username for author in article.authors.all()],
-                [tag.name for tag in article.tags.all()],
-            ])
+    def iter_rows(self, queryset):
+        """Yield csv rows, reading articles in server-side cursor chunks."""
+        yield self.header
+        for chunk in self.iter_chunks(queryset):
+            yield from chunk
 
-        return response
+    def iter_chunks(self, queryset):
+        """Yield the csv rows of `queryset` in lists of `chunk_size`."""
+        rows = queryset.values_list(
+            'id', 'title', 'abstract', 'publication_date'
+        ).iterator(chunk_size=self.chunk_size)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            ids = [row[0] for row in chunk]
+            authors = self.related_names(
+                Article.authors.through, 'user', 'username', ids)
+            tags = self.related_names(
+                Article.tags.through, 'tag', 'name', ids)
+            yield [
+                [*row, authors.get(row[0], []), tags.get(row[0], [])]
+                for row in chunk
+            ]
+
+    def related_names(self, through, related, attr, article_ids):
+        """Map article ids to related names with a single query."""
+        names = defaultdict(list)
+        rows = through.objects.filter(
+            article_id__in=article_ids
+        ).order_by(f'{related}_id').values_list(
+            'article_id', f'{related}__{attr}')
+        for article_id, name in rows:
+            names[article_id].append(name)
+        return names
+
+
+class ArticleExportCreateView(generics.CreateAPIView):
+    """View for queueing an export of filtered articles.
+
+    Takes the query parameters of ArticleDownloadCSVView and answers 202
+    with the job; a `run_exports` worker writes the file. Queueing needs
+    authentication and is throttled per user. A request matching one of
+    the user's pending or running jobs gets that job back, and users
+    with EXPORT_MAX_ACTIVE such jobs must wait for one to finish. Job
+    ids are random UUIDs and, like the download itself, polling and
+    fetching a job need no authentication.
+    """
+    serializer_class = ExportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [ExportThrottle]
+
+    def create(self, request, *args, **kwargs):
+        # Invalid filters are reported now rather than by the worker.
+        view = ArticleDownloadCSVView.for_params(request.query_params)
+        view.filter_queryset(view.get_queryset())
+
+        params = dict(request.query_params.lists())
+        with transaction.atomic():
+            # Serializes a user's requests, so the checks below hold.
+            get_user_model().objects.select_for_update().filter(
+                pk=request.user.pk).exists()
+            active = ExportJob.objects.filter(
+                requested_by=request.user,
+                status__in=[ExportJob.Status.PENDING,
+                            ExportJob.Status.RUNNING],
+            )
+            job = active.filter(params=params).first()
+            if job is None:
+                if active.count() >= settings.EXPORT_MAX_ACTIVE:
+                    return Response(
+                        {'detail': 'Too many exports in progress; wait '
+                                   'for one to finish.'},
+                        status=status.HTTP_429_TOO_MANY_REQUESTS)
+                job = ExportJob.objects.create(
+                    params=params, requested_by=request.user)
+        serializer = self.get_serializer(job)
+        headers = {'Location': reverse(
+            'article:article-export-detail', args=[job.pk], request=request)}
+        return Response(
+            serializer.data, status=status.HTTP_202_ACCEPTED, headers=headers)
+
+
+class ArticleExportDetailView(generics.RetrieveAPIView):
+    """View for polling the status of an export."""
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+
+
+class ArticleExportDownloadView(generics.GenericAPIView):
+    """View for downloading a finished export, with HTTP range support."""
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ExportJob.Status.DONE:
+            return Response(
+                {'detail': f'The export is {job.status}.'},
+                status=status.HTTP_409_CONFLICT)
+        if not os.path.exists(job.path):
+            raise NotFound('The export has expired.')
+        return ranged_file_response(
+            request,
+            job.path,
+            filename='articles.csv',
+            content_type='text/csv',
+            etag=f'{job.pk}-{job.size}',
+            last_modified=job.finished_at.timestamp(),
+        )
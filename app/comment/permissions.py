@@ -8,4 +8,4 @@ class IsCommentAuthor(permissions.BasePermission):
     """Custom permission to allow only the author to edit/delete."""
 
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
+        return obj.author_id == request.user.pk
@@ -1,14 +1,17 @@
 """
 Test for comment api.
 """
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from core.models import Article, Comment
 from comment.serializers import CommentSerializer
+from core.pagination import KeysetPagination, OptionalKeysetPagination
 from datetime import date
+from unittest.mock import patch
 
 
 COMMENT_LIST_URL = reverse('comment:comment-list')
@@ -87,6 +90,111 @@ class PublicCommentApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data["results"], serializer.data)
 
+    def test_comment_conditional_get(self):
+        """Test comment detail returns 304 until the comment changes."""
+        user = create_user(
+            username='user1',
+            email='user1@example.com',
+            password='password1234'
+        )
+        article = create_article(authors=user)
+        comment = create_comment(author=user, article=article)
+        url = reverse('comment:comment-detail', args=[comment.id])
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        comment.content = 'edited'
+        comment.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @patch.object(OptionalKeysetPagination, 'page_size', 1)
+    def test_list_comments_with_cursor(self):
+        """Test comments can be paged with a cursor keyed on id."""
+        user = create_user(
+            username='user1',
+            email='user1@example.com',
+            password='password1234'
+        )
+        article = create_article(authors=user)
+        first = create_comment(author=user, article=article)
+        second = create_comment(author=user, article=article)
+
+        res = self.client.get(COMMENT_LIST_URL, {'cursor': ''})
+        self.assertEqual(res.data['results'][0]['id'], first.id)
+        res = self.client.get(res.data['next'])
+        self.assertEqual(res.data['results'][0]['id'], second.id)
+        self.assertIsNone(res.data['next'])
+
+    def test_filter_comments_by_article(self):
+        """Test comments can be filtered by article."""
+        user = create_user(username='user1', password='password1234')
+        article = create_article(authors=user)
+        other = create_article(authors=user)
+        comment = create_comment(author=user, article=article)
+        create_comment(author=user, article=other)
+
+        res = self.client.get(COMMENT_LIST_URL, {'article': article.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [c['id'] for c in res.data['results']], [comment.id])
+
+    @patch.object(KeysetPagination, 'page_size', 1)
+    def test_list_article_comments(self):
+        """Test one article's comments are paged with a cursor."""
+        user = create_user(username='user1', password='password1234')
+        article = create_article(authors=user)
+        first = create_comment(author=user, article=article)
+        create_comment(author=user, article=create_article(authors=user))
+        second = create_comment(author=user, article=article)
+        url = reverse('article:article-comments', args=[article.id])
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['id'], first.id)
+        self.assertEqual(res.data['results'][0]['author'], user.id)
+        res = self.client.get(res.data['next'])
+        self.assertEqual(res.data['results'][0]['id'], second.id)
+        self.assertIsNone(res.data['next'])
+
+    def test_list_comments_of_missing_article(self):
+        """Test listing the comments of a missing article returns 404."""
+        user = create_user(username='user1', password='password1234')
+        article = create_article(authors=user)
+        empty_url = reverse('article:article-comments', args=[article.id])
+        missing_url = reverse(
+            'article:article-comments', args=[article.id + 1])
+
+        res = self.client.get(empty_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+        res = self.client.get(missing_url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(API_CACHE_ENABLED=True)
+    def test_cached_article_comments(self):
+        """Test article edits keep cached pages and deletion drops them."""
+        cache.clear()
+        user = create_user(username='user1', password='password1234')
+        article = create_article(authors=user)
+        url = reverse('article:article-comments', args=[article.id])
+        self.client.get(url)
+
+        article.title = 'Edited'
+        article.save()
+        with self.assertNumQueries(0):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        article.delete()
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class PrivateTagApiTests(TestCase):
     """Test the authorized user tag api."""
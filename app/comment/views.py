@@ -1,16 +1,29 @@
 """
 Views for the comment API.
 """
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, permissions
-from core.models import Comment
+from rest_framework.exceptions import NotFound
+from core.cache import CachedResponseMixin
+from core.fastpath import FastListMixin
+from core.mixins import ConditionalGetMixin
+from core.models import Article, Comment
+from core.pagination import KeysetPagination
 from comment.serializers import CommentSerializer
 from comment.permissions import IsCommentAuthor
 
 
-class CommentListCreateView(generics.ListCreateAPIView):
+class CommentListCreateView(
+        CachedResponseMixin,
+        FastListMixin,
+        ConditionalGetMixin,
+        generics.ListCreateAPIView):
     """View for listing and creating tags."""
     queryset = Comment.objects.all().order_by('id')
     serializer_class = CommentSerializer
+    cache_models = (Comment,)
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['article']
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -21,9 +34,39 @@ class CommentListCreateView(generics.ListCreateAPIView):
         return [permissions.AllowAny()]
 
 
-class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ArticleCommentListView(
+        CachedResponseMixin,
+        FastListMixin,
+        ConditionalGetMixin,
+        generics.ListAPIView):
+    """View for listing the comments of one article."""
     queryset = Comment.objects.all().order_by('id')
     serializer_class = CommentSerializer
+    pagination_class = KeysetPagination
+    # Deleting an article bumps Comment too, so cached pages of a deleted
+    # article expire without article edits invalidating every page.
+    cache_models = (Comment,)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            article_id=self.kwargs['article_pk'])
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # Only an empty page needs to tell a missing article apart.
+        if not page and not Article.objects.filter(
+                pk=self.kwargs['article_pk']).exists():
+            raise NotFound()
+        return page
+
+
+class CommentDetailView(
+        CachedResponseMixin,
+        ConditionalGetMixin,
+        generics.RetrieveUpdateDestroyAPIView):
+    queryset = Comment.objects.all().order_by('id')
+    serializer_class = CommentSerializer
+    cache_models = (Comment,)
 
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
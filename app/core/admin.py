@@ -2,8 +2,9 @@
 Django admin customization.
 """
 from django.contrib import admin
-from .models import Article, Tag, Comment
+from .models import Article, ExportJob, Tag, Comment
 
 admin.site.register(Article)
 admin.site.register(Tag)
 admin.site.register(Comment)
+admin.site.register(ExportJob)
@@ -0,0 +1,148 @@
+"""
+Token authentication with cached token lookups.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """Map token keys to user snapshots for AUTH_TOKEN_CACHE_TTL seconds.
+
+    Entries live in a per-process LRU of AUTH_TOKEN_CACHE_SIZE entries and,
+    when AUTH_TOKEN_CACHE_ALIAS names a cache, in that shared cache too, so
+    a token looked up by one process is known to the others.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(
+            settings.AUTH_TOKEN_CACHE_SIZE or settings.AUTH_TOKEN_CACHE_ALIAS)
+
+    def get_shared(self):
+        alias = settings.AUTH_TOKEN_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def shared_key(self, key):
+        # Keep raw tokens out of the shared cache's key space.
+        return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        """Return the snapshot cached for token `key`, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                snapshot, expires = entry
+                if expires > time.monotonic():
+                    self.entries.move_to_end(key)
+                    return snapshot
+                del self.entries[key]
+
+        shared = self.get_shared()
+        if shared is None:
+            return None
+        snapshot = shared.get(self.shared_key(key))
+        if snapshot is not None:
+            self.set_local(key, snapshot)
+        return snapshot
+
+    def set(self, key, snapshot):
+        self.set_local(key, snapshot)
+        shared = self.get_shared()
+        if shared is not None:
+            shared.set(
+                self.shared_key(key), snapshot,
+                settings.AUTH_TOKEN_CACHE_TTL)
+
+    def set_local(self, key, snapshot):
+        size = settings.AUTH_TOKEN_CACHE_SIZE
+        if not size:
+            return
+        expires = time.monotonic() + settings.AUTH_TOKEN_CACHE_TTL
+        with self.lock:
+            self.entries[key] = (snapshot, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+        shared = self.get_shared()
+        if shared is not None:
+            shared.delete(self.shared_key(key))
+
+    def clear(self):
+        """Empty this process's LRU."""
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache()
+
+
+def snapshot_fields(model):
+    """Return the attnames of `model` a snapshot keeps, in column order."""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname != 'password'
+    ]
+
+
+def take_snapshot(token):
+    """Return the cacheable state of `token` and its user."""
+    user = token.user
+    return {
+        'created': token.created,
+        'user': tuple(
+            getattr(user, name) for name in snapshot_fields(type(user))),
+    }
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the token query for known tokens.
+
+    Cached users are rebuilt from a snapshot of every column but the
+    password hash, which stays deferred and is loaded if something reads
+    it. A snapshot may be out of date, so views that save the user
+    should load it again or save with update_fields. Signals in
+    core.signals drop a token's entry when it is deleted or its user
+    changes. Other processes keep their own LRU entries for up to
+    AUTH_TOKEN_CACHE_TTL seconds, so that bounds how long a revoked
+    token can still work there.
+    """
+
+    def authenticate_credentials(self, key):
+        if not token_cache.enabled:
+            return super().authenticate_credentials(key)
+
+        snapshot = token_cache.get(key)
+        if snapshot is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, take_snapshot(token))
+            return user, token
+
+        model = self.get_model()
+        User = get_user_model()
+        db = model.objects.db
+        user = User.from_db(db, snapshot_fields(User), snapshot['user'])
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.'))
+        token = model.from_db(
+            db, ['key', 'user_id', 'created'],
+            [key, user.pk, snapshot['created']])
+        token.user = user
+        return user, token
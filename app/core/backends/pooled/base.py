@@ -0,0 +1,129 @@
+"""
+PostgreSQL backend that takes connections from a per-process pool.
+
+Select it with the ENGINE 'core.backends.pooled' and tune the pool with a
+'POOL' dict in the database settings:
+
+- MAX_SIZE: connections per process (default 4).
+- TIMEOUT: seconds to wait for a free connection (default 5).
+- MAX_IDLE, MAX_LIFETIME, CHECK_AFTER: see core.pool.ConnectionPool.
+- MODE: 'session' (the default) holds a connection from the first query
+  of a request to its end. 'transaction' returns it after every query
+  run in autocommit mode and every outermost atomic block, so threads
+  busy with anything but the database hold none. Session state such as
+  SET or temporary tables does not carry over between transactions then.
+
+The pool decides how long connections live, so CONN_MAX_AGE is ignored.
+"""
+import weakref
+from functools import partial
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base, creation
+from django.db.backends.utils import CursorDebugWrapper, CursorWrapper
+
+from core.pool import close_pools, get_pool
+
+POOL_OPTIONS = ('MAX_SIZE', 'TIMEOUT', 'MAX_IDLE', 'MAX_LIFETIME',
+                'CHECK_AFTER')
+POOL_MODES = ('session', 'transaction')
+
+
+class ReleasingCursorMixin:
+    """Tell the connection when a cursor is closed."""
+
+    def close(self):
+        try:
+            with self.db.wrap_database_errors:
+                self.cursor.close()
+        finally:
+            self.db.cursor_closed(self)
+
+
+class PooledCursorWrapper(ReleasingCursorMixin, CursorWrapper):
+    pass
+
+
+class PooledCursorDebugWrapper(ReleasingCursorMixin, CursorDebugWrapper):
+    pass
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the database in use.
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = dict(self.settings_dict.get('POOL') or {})
+        self.pool_mode = options.pop('MODE', 'session')
+        if self.pool_mode not in POOL_MODES:
+            raise ImproperlyConfigured(
+                f"POOL['MODE'] must be one of {', '.join(POOL_MODES)}.")
+        unknown = set(options) - set(POOL_OPTIONS)
+        if unknown:
+            raise ImproperlyConfigured(
+                f"Unknown POOL options: {', '.join(sorted(unknown))}.")
+        self.pool_options = {
+            name.lower(): value for name, value in options.items()}
+        self.pool = None
+        self.open_cursors = weakref.WeakSet()
+        self.connecting = False
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, conn_params, self.pool_options)
+        connection = self.pool.checkout(
+            partial(super().get_new_connection, conn_params))
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level)
+        return connection
+
+    def connect(self):
+        # connection_created receivers may run queries; keep the
+        # connection until it is set up.
+        self.connecting = True
+        try:
+            super().connect()
+        finally:
+            self.connecting = False
+
+    def _close(self):
+        if self.connection is not None:
+            self.pool.release(self.connection, check=self.errors_occurred)
+
+    def close_if_unusable_or_obsolete(self):
+        # Django calls this as requests start and finish; hand the
+        # connection back to the pool instead of keeping it.
+        if self.connection is not None and not self.in_atomic_block:
+            self.close()
+
+    def make_cursor(self, cursor):
+        wrapper = PooledCursorWrapper(cursor, self)
+        self.open_cursors.add(wrapper)
+        return wrapper
+
+    def make_debug_cursor(self, cursor):
+        wrapper = PooledCursorDebugWrapper(cursor, self)
+        self.open_cursors.add(wrapper)
+        return wrapper
+
+    def cursor_closed(self, cursor):
+        self.open_cursors.discard(cursor)
+        self.release_if_idle()
+
+    def set_autocommit(self, *args, **kwargs):
+        super().set_autocommit(*args, **kwargs)
+        self.release_if_idle()
+
+    def release_if_idle(self):
+        """In transaction mode, return the connection between transactions."""
+        if (self.pool_mode == 'transaction' and self.connection is not None
+                and not self.connecting and self.autocommit
+                and not self.in_atomic_block and not self.open_cursors):
+            self.close()
@@ -0,0 +1,115 @@
+"""
+Versioned response cache for anonymous API reads.
+
+Every cached model has a generation counter in the cache. Response keys
+embed the current generation of each model a view depends on, so bumping
+a counter on write makes the old entries unreachable without scanning
+for them; they age out through the backend's own timeout and culling.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date
+from rest_framework.response import Response
+
+from core.routers import use_primary
+
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def generation_key(model):
+    return f'api-generation:{model._meta.label_lower}'
+
+
+def bump_generation(model):
+    """Invalidate every cached response that depends on `model`."""
+    cache = get_cache()
+    key = generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Start from the clock so a culled counter never comes back to a
+        # value that old entries were stored under.
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def get_generations(models):
+    """Return the current generation of each model, creating missing ones."""
+    cache = get_cache()
+    keys = [generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+class CachedResponseMixin:
+    """Serve anonymous GET responses from the cache.
+
+    Views list the models their output is built from in `cache_models`.
+    Entries are keyed on the path, the sorted query string (which covers
+    pagination) and the generations of those models. Validator headers
+    are stored with the data, so conditional requests that hit the cache
+    are answered without touching the database.
+    """
+    cache_models = ()
+
+    def get_cache_key(self, request):
+        if not settings.API_CACHE_ENABLED or not self.cache_models:
+            return None
+        if request.user.is_authenticated:
+            return None
+        query = sorted(request.query_params.lists())
+        generations = get_generations(self.cache_models)
+        media_type = request.accepted_media_type
+        raw = f'{request.path}?{query}|{media_type}'.encode()
+        digest = hashlib.md5(raw).hexdigest()
+        return f'api-response:{digest}:' + '.'.join(map(str, generations))
+
+    def get(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        if key is None:
+            return super().get(request, *args, **kwargs)
+
+        cache = get_cache()
+        entry = cache.get(key)
+        if entry is not None:
+            return self.cached_response(request, *entry)
+
+        # Build entries from the primary: a lagging replica could store
+        # old data under a generation bumped by a newer write.
+        with use_primary():
+            response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {
+                name: response[name]
+                for name in VALIDATOR_HEADERS if response.has_header(name)
+            }
+            cache.set(
+                key, (response.data, headers), settings.API_CACHE_TIMEOUT)
+        return response
+
+    def cached_response(self, request, data, headers):
+        response = None
+        if headers:
+            last_modified = headers.get('Last-Modified')
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=last_modified and parse_http_date(
+                    last_modified),
+            )
+        if response is None:
+            response = Response(data)
+        for name, value in headers.items():
+            response[name] = value
+        return response
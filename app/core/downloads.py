@@ -0,0 +1,100 @@
+"""
+File responses with HTTP range support.
+"""
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+def parse_range(header, size):
+    """Return the inclusive (start, end) of a Range header, or None.
+
+    Only single byte ranges are honoured; a missing, malformed or
+    multi-range header returns None and the whole file is sent, as
+    RFC 7233 allows. Ranges starting past the end of the file raise
+    RangeNotSatisfiable.
+    """
+    match = RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start >= size:
+            raise RangeNotSatisfiable
+        return start, min(end, size - 1)
+    if not last:
+        return None
+    length = int(last)
+    if length == 0 or size == 0:
+        raise RangeNotSatisfiable
+    return max(size - length, 0), size - 1
+
+
+def read_range(path, start, length, block_size=64 * 1024):
+    """Yield `length` bytes of the file at `path` from offset `start`."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(block_size, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def ranged_file_response(
+        request, path, filename, content_type, etag, last_modified):
+    """Serve the file at `path`, honouring Range and If-Range.
+
+    `etag` and `last_modified` (a timestamp) identify the file's version;
+    conditional requests are answered with 304, and an If-Range that does
+    not match them makes a Range request receive the whole file.
+    """
+    etag = quote_etag(etag)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified))
+    if response is not None:
+        return response
+
+    size = os.path.getsize(path)
+    header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range not in (etag, http_date(last_modified)):
+        header = None
+    try:
+        byte_range = parse_range(header, size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(
+            open(path, 'rb'), as_attachment=True, filename=filename,
+            content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            read_range(path, start, end - start + 1),
+            status=206, content_type=content_type)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"')
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
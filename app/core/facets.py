@@ -0,0 +1,133 @@
+"""
+Facet counts for filtered list views.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+
+from core.cache import get_cache, get_generations
+
+
+class FacetMixin:
+    """Add `?facets=` counts over the filtered queryset to list pages.
+
+    Views map each facet name to {output key: lookup} in `facet_fields`;
+    the first lookup identifies a bucket and the others label it. Every
+    requested facet costs one grouped query returning the `facet_limit`
+    largest buckets. Counts only depend on the filters, not on the page,
+    so with API_CACHE_ENABLED they are cached under a key built from the
+    query string without the pagination and ordering parameters.
+    """
+    facet_query_param = 'facets'
+    facet_fields = {}
+    facet_limit = 10
+    facet_ignored_params = ('page', 'cursor', 'count', 'ordering', 'facets')
+
+    def get_facet_names(self):
+        value = self.request.query_params.get(self.facet_query_param, '')
+        names = [name for name in value.split(',') if name]
+        unknown = [name for name in names if name not in self.facet_fields]
+        if unknown:
+            raise ValidationError({self.facet_query_param: [
+                f'Unknown facet "{name}". Choose from: '
+                f'{", ".join(self.facet_fields)}.'
+                for name in unknown
+            ]})
+        return list(dict.fromkeys(names))
+
+    def get_facet_cache_key(self, names):
+        if not settings.API_CACHE_ENABLED:
+            return None
+        query = sorted(
+            (key, values)
+            for key, values in self.request.query_params.lists()
+            if key not in self.facet_ignored_params
+        )
+        raw = f'{self.request.path}?{query}|{names}'.encode()
+        digest = hashlib.md5(raw).hexdigest()
+        generations = get_generations(getattr(self, 'cache_models', ()))
+        return f'api-facets:{digest}:' + '.'.join(map(str, generations))
+
+    def get_facets(self):
+        """Return {name: [bucket, ...]} for the requested facets, or None."""
+        if hasattr(self, '_facets'):
+            return self._facets
+        names = self.get_facet_names()
+        self._facets = None
+        if not names:
+            return None
+
+        key = self.get_facet_cache_key(names)
+        if key is not None:
+            self._facets = get_cache().get(key)
+        if self._facets is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            self._facets = {
+                name: self.count_facet(queryset, name) for name in names}
+            if key is not None:
+                get_cache().set(
+                    key, self._facets, settings.API_CACHE_TIMEOUT)
+        return self._facets
+
+    def count_facet(self, queryset, name):
+        """Return the largest buckets of one facet over `queryset`."""
+        fields = self.facet_fields[name]
+        keys, lookups = list(fields), list(fields.values())
+        model = queryset.model
+        field = model._meta.get_field(lookups[0].split('__')[0])
+        if field.many_to_many and lookups[0] == field.name:
+            return self.count_related_facet(queryset, field, keys, lookups)
+
+        rows = self.facet_rows(queryset, model, 'pk').values_list(
+            *lookups
+        ).annotate(count=Count('*')).order_by('-count', lookups[0])
+        return [
+            {**dict(zip(keys, values)), 'count': count}
+            for *values, count in rows[:self.facet_limit]
+        ]
+
+    def count_related_facet(self, queryset, field, keys, lookups):
+        """Count a many-to-many facet on its through table.
+
+        Labels of the top buckets are looked up afterwards, so neither
+        the filtered model nor the related model is joined while grouping.
+        """
+        through = field.remote_field.through
+        # Group on the raw column; the relation would join the target for
+        # its default ordering.
+        target = through._meta.get_field(
+            field.m2m_reverse_field_name()).attname
+        rows = self.facet_rows(
+            queryset, through, field.m2m_field_name()
+        ).values_list(target).annotate(
+            count=Count('*')
+        ).order_by('-count', target)[:self.facet_limit]
+        counts = dict(rows)
+
+        label_lookups = [lookup.split('__', 1)[1] for lookup in lookups[1:]]
+        labels = {
+            pk: values
+            for pk, *values in field.related_model._default_manager.filter(
+                pk__in=counts).values_list('pk', *label_lookups)
+        }
+        return [
+            {keys[0]: pk, **dict(zip(keys[1:], labels[pk])), 'count': count}
+            for pk, count in counts.items()
+        ]
+
+    def facet_rows(self, queryset, model, column):
+        """Return the rows of `model` whose `column` is in `queryset`."""
+        rows = model._default_manager.all()
+        if queryset.query.has_filters():
+            rows = rows.filter(**{
+                f'{column}__in': queryset.order_by().values('pk')})
+        return rows
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        facets = self.get_facets()
+        if facets is not None:
+            response.data['facets'] = facets
+        return response
@@ -0,0 +1,267 @@
+"""
+Compiled read path for list responses.
+
+ModelSerializer renders a page field by field through get_attribute()
+and to_representation(), on model instances built by the ORM and by
+prefetch_related(). For serializers made only of plain columns, primary
+key relations and nested serializers of the same kind, the page can be
+read with values() instead and rendered from precomputed accessors; the
+output is the same data, field for field.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+
+# Fields whose to_representation() only depends on the value.
+COLUMN_FIELDS = {
+    serializers.BooleanField: None,
+    serializers.CharField: str,
+    serializers.DateField: None,
+    serializers.DateTimeField: None,
+    serializers.DecimalField: None,
+    serializers.EmailField: str,
+    serializers.FloatField: float,
+    serializers.IntegerField: int,
+    serializers.SlugField: str,
+    serializers.URLField: str,
+    serializers.UUIDField: None,
+}
+
+
+class Row(dict):
+    """A values() row whose keys can also be read as attributes."""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class Relation:
+    """A forward many-to-many relation read through its table."""
+
+    def __init__(self, field, nested=None):
+        self.field = field
+        self.nested = nested
+        self.columns = set(nested.columns) if nested else set()
+        through = field.remote_field.through
+        self.through = through
+        self.source = through._meta.get_field(
+            field.m2m_field_name()).attname
+        self.target = through._meta.get_field(
+            field.m2m_reverse_field_name()).attname
+        self.related_name = field.m2m_reverse_field_name()
+
+    def load(self, rows):
+        """Attach the related rows of each row, in pk order.
+
+        Related columns are joined in, so each relation is one query.
+        """
+        columns = sorted(self.columns)
+        pairs = self.through._default_manager.filter(**{
+            f'{self.source}__in': [row['pk'] for row in rows]
+        }).order_by(self.source, self.target).values_list(
+            self.source, self.target,
+            *(f'{self.related_name}__{column}' for column in columns))
+
+        related = defaultdict(list)
+        by_pk = {}
+        for source, target, *values in pairs:
+            item = by_pk.get(target)
+            if item is None:
+                item = by_pk[target] = Row(zip(columns, values), pk=target)
+            related[source].append(item)
+
+        name = self.field.name
+        for row in rows:
+            row[name] = related[row['pk']]
+
+
+class ValuesSerializer:
+    """Render values() rows the way a ModelSerializer renders instances."""
+
+    def __init__(self, model):
+        self.model = model
+        self.columns = set()
+        self.relations = {}
+        self.outputs = []
+
+    def values(self, queryset):
+        """Return `queryset` as rows with the columns rendering needs."""
+        return queryset.prefetch_related(None).values('pk', *self.columns)
+
+    def load(self, rows):
+        """Wrap rows and attach their relations; one query per relation."""
+        rows = [row if isinstance(row, Row) else Row(row) for row in rows]
+        if rows:
+            for relation in self.relations.values():
+                relation.load(rows)
+        return rows
+
+    def render(self, rows):
+        outputs = self.outputs
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, convert in outputs:
+                value = row[source]
+                if value is None:
+                    item[name] = None
+                elif convert is None:
+                    item[name] = value
+                else:
+                    item[name] = convert(value)
+            data.append(item)
+        return data
+
+
+def pk_list(related):
+    return [row['pk'] for row in related]
+
+
+def column_converter(field, model_field):
+    """Return a callable equal to field.to_representation, or None."""
+    convert = COLUMN_FIELDS[type(field)]
+    if convert is str and model_field.get_internal_type() in (
+            'CharField', 'TextField', 'SlugField', 'EmailField',
+            'URLField'):
+        # Text columns already come back as str.
+        return None
+    if convert is int and model_field.get_internal_type() in (
+            'AutoField', 'BigAutoField', 'IntegerField', 'BigIntegerField',
+            'SmallIntegerField', 'PositiveIntegerField'):
+        return None
+    return convert or field.to_representation
+
+
+def is_pk_ordered(model):
+    ordering = list(model._meta.ordering)
+    return ordering in ([], ['pk'], [model._meta.pk.name])
+
+
+def compile_serializer(serializer, model, extra=()):
+    """Compile `serializer` to a ValuesSerializer, or return None.
+
+    `extra` lists lookups the view reads from rows besides the rendered
+    fields, such as last-modified fields or keyset columns. Anything the
+    compiled path cannot reproduce exactly returns None, and the caller
+    uses the serializer as usual.
+    """
+    serializer = getattr(serializer, 'child', serializer)
+    if type(serializer).to_representation is not \
+            serializers.Serializer.to_representation:
+        return None
+
+    compiled = ValuesSerializer(model)
+    opts = model._meta
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if '.' in source or source == '*':
+            return None
+        try:
+            model_field = opts.get_field(source)
+        except FieldDoesNotExist:
+            return None
+
+        if type(field) in COLUMN_FIELDS and model_field.concrete \
+                and not model_field.is_relation:
+            compiled.columns.add(source)
+            compiled.outputs.append(
+                (name, source, column_converter(field, model_field)))
+        elif type(field) is relations.PrimaryKeyRelatedField \
+                and field.pk_field is None and model_field.many_to_one \
+                and model_field.concrete:
+            # values() returns the key of a foreign key under its name.
+            compiled.columns.add(source)
+            compiled.outputs.append((name, source, None))
+        elif model_field.many_to_many and model_field.concrete \
+                and is_pk_ordered(model_field.related_model):
+            related_model = model_field.related_model
+            if type(field) is relations.ManyRelatedField and \
+                    type(field.child_relation) is \
+                    relations.PrimaryKeyRelatedField and \
+                    field.child_relation.pk_field is None:
+                compiled.relations[source] = Relation(model_field)
+                compiled.outputs.append((name, source, pk_list))
+            elif isinstance(field, serializers.ListSerializer) and \
+                    type(field).to_representation is \
+                    serializers.ListSerializer.to_representation:
+                nested = compile_serializer(field.child, related_model)
+                if nested is None or nested.relations:
+                    return None
+                compiled.relations[source] = Relation(model_field, nested)
+                compiled.outputs.append((name, source, nested.render))
+            else:
+                return None
+        else:
+            return None
+
+    for lookup in extra:
+        name, _, rest = lookup.partition('__')
+        if name in compiled.relations and rest:
+            compiled.relations[name].columns.add(rest)
+        elif not rest and opts.get_field(name).concrete \
+                and not opts.get_field(name).is_relation:
+            compiled.columns.add(name)
+        elif name not in compiled.relations:
+            return None
+    return compiled
+
+
+class FastListMixin:
+    """Read and render GET list pages through a compiled serializer.
+
+    The page is fetched with values() and each rendered relation with one
+    query on its through table, instead of building model instances and
+    running every field of the serializer. Views whose serializer cannot
+    be compiled, and every other request, take the usual path. Set
+    API_FAST_SERIALIZERS to false to always take it.
+    """
+
+    def get_values_serializer(self):
+        if not hasattr(self, '_values_serializer'):
+            self._values_serializer = None
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            if settings.API_FAST_SERIALIZERS \
+                    and self.request.method == 'GET' \
+                    and lookup_url_kwarg not in self.kwargs \
+                    and self.paginator is not None:
+                extra = [
+                    *getattr(self, 'get_last_modified_fields', tuple)(),
+                    *getattr(self, 'keyset_ordering', ()),
+                ]
+                self._values_serializer = compile_serializer(
+                    self.get_serializer(), self.queryset.model, extra)
+        return self._values_serializer
+
+    def paginate_queryset(self, queryset):
+        compiled = self.get_values_serializer()
+        if compiled is None:
+            return super().paginate_queryset(queryset)
+        page = super().paginate_queryset(compiled.values(queryset))
+        return compiled.load(page)
+
+    def get_serializer(self, *args, **kwargs):
+        compiled = getattr(self, '_values_serializer', None)
+        if compiled is not None and kwargs.get('many') and args and \
+                all(isinstance(row, Row) for row in args[0]):
+            return RenderedRows(compiled, args[0])
+        return super().get_serializer(*args, **kwargs)
+
+
+class RenderedRows:
+    """Stand-in for a list serializer over compiled rows."""
+
+    def __init__(self, compiled, rows):
+        self.compiled = compiled
+        self.rows = rows
+
+    @property
+    def data(self):
+        return self.compiled.render(self.rows)
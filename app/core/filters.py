@@ -0,0 +1,52 @@
+"""
+Reusable filter backends.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Search filter backed by a stored, weighted tsvector column.
+
+    `?search=` is matched against the view's `search_vector_field` using
+    PostgreSQL web search syntax and results are ordered by rank. Passing
+    `?search_mode=contains` falls back to the `icontains` lookups over
+    `search_fields` that SearchFilter performs.
+    """
+    search_mode_param = 'search_mode'
+    search_config = 'english'
+
+    def filter_queryset(self, request, queryset, view):
+        vector_field = getattr(view, 'search_vector_field', None)
+        mode = request.query_params.get(self.search_mode_param)
+        if vector_field is None or mode == 'contains':
+            return super().filter_queryset(request, queryset, view)
+
+        terms = ' '.join(self.get_search_terms(request))
+        if not terms:
+            return queryset
+
+        query = SearchQuery(
+            terms,
+            config=self.search_config,
+            search_type='websearch'
+        )
+        return queryset.filter(**{vector_field: query}).annotate(
+            search_rank=SearchRank(F(vector_field), query)
+        ).order_by('-search_rank', 'id')
+
+
+class StableOrderingFilter(OrderingFilter):
+    """Ordering filter that breaks ties on the primary key.
+
+    Without a unique last column, rows with equal sort keys may swap
+    places between page requests. Cursor pagination only accepts the
+    view's `keyset_ordering`.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering = [*ordering, 'id']
+        return ordering
@@ -0,0 +1,18 @@
+"""
+Password hashers with a cost tuned per environment.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 hasher running PASSWORD_HASH_ITERATIONS iterations.
+
+    It shares the pbkdf2_sha256 algorithm name, so existing hashes verify
+    unchanged. Hashes made with another iteration count report
+    must_update(), and Django rehashes them when their user next logs in.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
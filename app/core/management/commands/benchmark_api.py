@@ -0,0 +1,264 @@
+"""
+Django command to benchmark the API endpoints on the current database.
+"""
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from core.models import Article, Comment, Tag
+
+
+class Command(BaseCommand):
+    """Django command to record latency, queries and memory per endpoint."""
+
+    help = (
+        'Run read scenarios against every API endpoint, write the results '
+        'to JSON and optionally compare them with a baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--output', default='benchmark-results.json')
+        parser.add_argument(
+            '--baseline',
+            help='Results file from an earlier run to compare against.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Allowed p50 slowdown relative to the baseline.',
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error when a scenario regresses.',
+        )
+        parser.add_argument(
+            '--with-cache',
+            action='store_true',
+            help='Leave the API response cache as configured.',
+        )
+        parser.add_argument(
+            '--slow-serializers',
+            action='store_true',
+            help='Render lists with the regular serializers, to compare '
+                 'against the compiled path.',
+        )
+        parser.add_argument(
+            '--uncached-auth',
+            action='store_true',
+            help='Look tokens up in the database on every request, to '
+                 'compare against the token cache.',
+        )
+        parser.add_argument(
+            '--only',
+            nargs='*',
+            help='Run only the named scenarios.',
+        )
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        overrides = {'ALLOWED_HOSTS': ['testserver']}
+        if not options['with_cache']:
+            overrides['API_CACHE_ENABLED'] = False
+        if options['slow_serializers']:
+            overrides['API_FAST_SERIALIZERS'] = False
+        if options['uncached_auth']:
+            overrides['AUTH_TOKEN_CACHE_SIZE'] = 0
+            overrides['AUTH_TOKEN_CACHE_ALIAS'] = None
+
+        results = {}
+        token, created = self.get_token()
+        try:
+            with override_settings(**overrides):
+                client = Client()
+                for name, url, params, headers in self.get_scenarios(token):
+                    if options['only'] and name not in options['only']:
+                        continue
+                    results[name] = self.run_scenario(
+                        client, url, params, headers, options)
+                    self.stdout.write(
+                        self.format_result(name, results[name]))
+        finally:
+            if created:
+                token.delete()
+
+        report = {'meta': self.get_meta(options), 'scenarios': results}
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Results written to {options['output']}.")
+
+        if options['baseline']:
+            regressions = self.compare(results, options)
+            if regressions and options['fail_on_regression']:
+                raise CommandError(
+                    f"Regressions: {', '.join(regressions)}.")
+
+    def get_token(self):
+        """Return a token of the first user and whether it was created."""
+        user = get_user_model().objects.order_by('id').first()
+        if user is None:
+            return None, False
+        return Token.objects.get_or_create(user=user)
+
+    def get_scenarios(self, token=None):
+        """Return (name, url, params, headers) for each endpoint and filter.
+
+        Scenarios ending in _auth send `token`, so they also measure token
+        authentication; authenticated reads bypass the response cache.
+        """
+        article = Article.objects.order_by('id').first()
+        if article is None:
+            raise CommandError('No articles; run seed_data first.')
+        tag = article.tags.order_by('id').first()
+        author = article.authors.order_by('id').first()
+        articles_url = reverse('article:article-list')
+        scenarios = [
+            ('article_list', articles_url, {}),
+            ('article_list_cursor', articles_url, {'cursor': ''}),
+            ('article_filter_date', articles_url, {
+                'publication_date': article.publication_date}),
+            ('article_search', articles_url, {
+                'search': article.title.split()[0]}),
+            ('article_detail', reverse(
+                'article:article-detail', args=[article.pk]), {}),
+            ('comment_list', reverse('comment:comment-list'), {}),
+            ('tag_list', reverse('tag:tag-list'), {}),
+        ]
+        if author is not None:
+            scenarios.append(
+                ('article_filter_author', articles_url, {
+                    'authors': author.pk}))
+        if tag is not None:
+            scenarios += [
+                ('article_filter_tag', articles_url, {'tags': tag.pk}),
+                ('article_download', reverse('article:article-download'), {
+                    'tags': tag.pk}),
+            ]
+        scenarios = [(*scenario, {}) for scenario in scenarios]
+        if token is not None:
+            headers = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+            scenarios += [
+                ('user_me_auth', reverse('user:me'), {}, headers),
+                ('article_detail_auth', reverse(
+                    'article:article-detail', args=[article.pk]), {},
+                 headers),
+            ]
+        return scenarios
+
+    def request(self, client, url, params, headers):
+        response = client.get(url, params, **headers)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        return response.status_code, size
+
+    def run_scenario(self, client, url, params, headers, options):
+        """Time a scenario, then count its queries and peak memory."""
+        for _ in range(options['warmup']):
+            self.request(client, url, params, headers)
+
+        timings = []
+        for _ in range(options['iterations']):
+            start = time.perf_counter()
+            status, size = self.request(client, url, params, headers)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        # Capturing with CaptureQueriesContext would not work here, as the
+        # request_started signal resets the connection's query log.
+        with connection.execute_wrapper(count_query):
+            self.request(client, url, params, headers)
+
+        tracemalloc.start()
+        try:
+            self.request(client, url, params, headers)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if len(timings) > 1:
+            cuts = statistics.quantiles(timings, n=100, method='inclusive')
+        else:
+            cuts = timings * 99
+        return {
+            'url': url,
+            'params': {k: str(v) for k, v in params.items()},
+            'status': status,
+            'bytes': size,
+            'p50_ms': round(cuts[49], 3),
+            'p95_ms': round(cuts[94], 3),
+            'p99_ms': round(cuts[98], 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'queries': len(queries),
+            'peak_memory_kib': round(peak / 1024, 1),
+        }
+
+    def format_result(self, name, result):
+        return (
+            f"{name:<24} p50={result['p50_ms']:>9.2f}ms "
+            f"p95={result['p95_ms']:>9.2f}ms "
+            f"p99={result['p99_ms']:>9.2f}ms "
+            f"queries={result['queries']:>3} "
+            f"peak={result['peak_memory_kib']:>9.1f}KiB"
+        )
+
+    def get_meta(self, options):
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'iterations': options['iterations'],
+            'fast_serializers': not options['slow_serializers'],
+            'cached_auth': not options['uncached_auth'],
+            'rows': {
+                'articles': Article.objects.count(),
+                'comments': Comment.objects.count(),
+                'tags': Tag.objects.count(),
+            },
+        }
+
+    def compare(self, results, options):
+        """Print the change against the baseline; return regressions."""
+        with open(options['baseline']) as f:
+            baseline = json.load(f)['scenarios']
+
+        regressions = []
+        for name, result in results.items():
+            base = baseline.get(name)
+            if base is None:
+                continue
+            ratio = result['p50_ms'] / base['p50_ms'] if base['p50_ms'] else 1
+            regressed = (
+                ratio > 1 + options['threshold']
+                or result['queries'] > base['queries']
+            )
+            line = (
+                f"{name:<24} p50 x{ratio:.2f} "
+                f"queries {base['queries']} -> {result['queries']}"
+            )
+            if regressed:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+        return regressions
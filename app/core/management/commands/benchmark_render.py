@@ -0,0 +1,88 @@
+"""
+Django command to compare JSON encode throughput of the API renderers.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from article.views import ArticleListCreateView
+from core import renderers
+from core.models import Article
+
+
+class Command(BaseCommand):
+    """Django command to time encoding of article list pages."""
+
+    help = (
+        'Render article list pages once, then encode them repeatedly with '
+        'the standard JSONRenderer and with FastJSONRenderer.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--pages', type=int, default=5)
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        if not Article.objects.exists():
+            raise CommandError('No articles; run seed_data first.')
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson is not installed; FastJSONRenderer falls back to '
+                'the standard encoder.'))
+
+        pages = self.get_pages(options['page_size'], options['pages'])
+        expected = None
+        throughput = {}
+        for renderer in (JSONRenderer(), renderers.FastJSONRenderer()):
+            name = type(renderer).__name__
+            encoded, seconds = self.time_render(
+                renderer, pages, options['iterations'])
+            if expected is None:
+                expected = encoded
+            elif encoded != expected:
+                self.stdout.write(self.style.ERROR(
+                    f'{name} output differs from JSONRenderer.'))
+
+            size = sum(map(len, encoded)) * options['iterations']
+            count = len(pages) * options['iterations']
+            throughput[name] = count / seconds
+            self.stdout.write(
+                f'{name:>18}: {count / seconds:>9.1f} pages/s '
+                f'{size / seconds / 2**20:>8.1f} MiB/s '
+                f'{seconds / count * 1000:>7.3f} ms/page'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'Speedup: x{:.2f}'.format(
+                throughput['FastJSONRenderer'] / throughput['JSONRenderer'])))
+
+    def get_pages(self, page_size, count):
+        """Return the response data of the first `count` list pages."""
+        factory = APIRequestFactory()
+        view = ArticleListCreateView.as_view(
+            pagination_class=type(
+                'BenchmarkPagination',
+                (ArticleListCreateView.pagination_class,),
+                {'page_size': page_size},
+            ))
+        pages = []
+        with override_settings(
+                API_CACHE_ENABLED=False, ALLOWED_HOSTS=['testserver']):
+            for number in range(1, count + 1):
+                response = view(factory.get(
+                    '/api/article/', {'page': number}))
+                if response.status_code != 200:
+                    break
+                pages.append(response.data)
+        return pages
+
+    def time_render(self, renderer, pages, iterations):
+        """Return the encoded pages and the seconds spent encoding them."""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            encoded = [renderer.render(page) for page in pages]
+        return encoded, time.perf_counter() - start
@@ -0,0 +1,77 @@
+"""
+Django command to compare article search latency on a seeded corpus.
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from article.views import ArticleListCreateView
+from core.filters import FullTextSearchFilter
+from core.models import Article
+from core.seed import VOCABULARY, text
+
+
+class Command(BaseCommand):
+    """Django command to benchmark icontains vs full-text search."""
+
+    help = 'Seed a corpus and compare icontains and full-text search.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded articles instead of rolling back.',
+        )
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            self.seed(rng, options['articles'])
+            terms = rng.choices(VOCABULARY, k=options['repeat'])
+            for mode in ('contains', 'fulltext'):
+                timings = [self.time_search(term, mode) for term in terms]
+                self.stdout.write(
+                    f'{mode:>9}: p50={statistics.median(timings):.2f}ms '
+                    f'max={max(timings):.2f}ms'
+                )
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def seed(self, rng, count):
+        """Insert `count` articles with random text."""
+        self.stdout.write(f'Seeding {count} articles...')
+
+        batch = [
+            Article(
+                title=text(rng, 6),
+                abstract=text(rng, 40),
+                main_text=text(rng, 400),
+                publication_date='2025-01-01',
+            )
+            for _ in range(count)
+        ]
+        Article.objects.bulk_create(batch, batch_size=1000)
+        self.stdout.write('Analyzing core_article...')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_article')
+
+    def time_search(self, term, mode):
+        """Return the time in ms to count and fetch a page of matches."""
+        request = Request(APIRequestFactory().get(
+            '/api/article/', {'search': term, 'search_mode': mode}))
+        view = ArticleListCreateView()
+        start = time.perf_counter()
+        queryset = FullTextSearchFilter().filter_queryset(
+            request, Article.objects.all(), view)
+        queryset.count()
+        list(queryset.values_list('id', flat=True)[:100])
+        return (time.perf_counter() - start) * 1000
@@ -0,0 +1,71 @@
+"""
+Django command to print query plans for the article API filters.
+"""
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from article.views import ArticleListCreateView
+from core.models import Article
+
+
+class Command(BaseCommand):
+    """Django command to EXPLAIN ANALYZE each article filter combination."""
+
+    help = 'Print EXPLAIN ANALYZE for every filter combination the API takes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--search',
+            default='',
+            help='Also combine each filter set with this search term.',
+        )
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        samples = self.sample_values()
+        fields = ArticleListCreateView.filterset_fields
+        combos = [
+            combo
+            for size in range(1, len(fields) + 1)
+            for combo in combinations(fields, size)
+        ]
+        for combo in combos:
+            params = {field: samples[field] for field in combo}
+            self.explain(params)
+            if options['search']:
+                self.explain({**params, 'search': options['search']})
+
+    def sample_values(self):
+        """Pick the most common value of each filter from the database."""
+        through_authors = Article.authors.through.objects
+        through_tags = Article.tags.through.objects
+        samples = {
+            'publication_date': Article.objects.values_list(
+                'publication_date', flat=True),
+            'authors': through_authors.values_list('user_id', flat=True),
+            'tags': through_tags.values_list('tag_id', flat=True),
+        }
+        for field, values in samples.items():
+            value = values.annotate(n=Count('*')).order_by('-n').first()
+            if value is None:
+                raise CommandError(f'No data to sample for {field}.')
+            samples[field] = value
+        return samples
+
+    def explain(self, params):
+        """Print the plan of the page query the list view runs."""
+        view = ArticleListCreateView()
+        view.request = Request(
+            APIRequestFactory().get('/api/article/', params))
+        view.format_kwarg = None
+        view.kwargs = {}
+        queryset = view.filter_queryset(Article.objects.all())
+        page = queryset[:view.paginator.page_size]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            ' & '.join(f'{k}={v}' for k, v in params.items())))
+        self.stdout.write(page.explain(analyze=True, buffers=True))
+        self.stdout.write('')
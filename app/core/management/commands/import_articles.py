@@ -0,0 +1,390 @@
+"""
+Django command to bulk import articles from CSV or NDJSON.
+"""
+import ast
+import csv
+import io
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DataError, connection, transaction
+from django.utils.dateparse import parse_date
+
+from core.cache import bump_generation
+from core.models import Article, Tag
+
+# Column names written by ArticleDownloadCSVView, mapped to field names.
+CSV_HEADERS = {
+    'ID': 'id',
+    'Title': 'title',
+    'Abstract': 'abstract',
+    'Main Text': 'main_text',
+    'Publication Date': 'publication_date',
+    'Authors': 'authors',
+    'Tags': 'tags',
+}
+STAGING_COLUMNS = [
+    'id', 'title', 'abstract', 'main_text', 'publication_date',
+    'authors', 'author_ids', 'tags',
+]
+
+STAGING_TABLE = """
+DROP TABLE IF EXISTS import_article;
+CREATE TEMP TABLE import_article (
+    line serial,
+    inserted boolean NOT NULL DEFAULT false,
+    id bigint,
+    title text,
+    abstract text,
+    main_text text,
+    publication_date date NOT NULL,
+    authors jsonb NOT NULL,
+    author_ids jsonb NOT NULL,
+    tags jsonb NOT NULL
+);
+"""
+
+MERGE_USERS = """
+INSERT INTO auth_user (
+    password, is_superuser, username, first_name, last_name, email,
+    is_staff, is_active, date_joined
+)
+SELECT DISTINCT '!', false, a.username, '', '', '', false, true, now()
+FROM import_article s,
+    jsonb_array_elements_text(s.authors) AS a(username)
+ON CONFLICT (username) DO NOTHING;
+"""
+
+MERGE = """
+INSERT INTO core_tag (name, updated_at, article_count)
+SELECT DISTINCT t.name, now(), 0
+FROM import_article s, jsonb_array_elements_text(s.tags) AS t(name)
+ON CONFLICT (name) DO NOTHING;
+
+UPDATE import_article
+SET id = nextval(pg_get_serial_sequence('core_article', 'id'))
+WHERE id IS NULL;
+
+-- Only the first row for each id is inserted, and only rows that made a
+-- new article get authors and tags: existing articles are left alone.
+WITH inserted AS (
+    INSERT INTO core_article (
+        id, title, abstract, main_text, publication_date, updated_at,
+        comment_count, tag_count
+    )
+    SELECT DISTINCT ON (id)
+        id,
+        coalesce(title, %(title)s),
+        coalesce(abstract, %(abstract)s),
+        coalesce(main_text, %(main_text)s),
+        publication_date,
+        now(),
+        0,
+        0
+    FROM import_article
+    ORDER BY id, line
+    ON CONFLICT (id) DO NOTHING
+    RETURNING id
+)
+UPDATE import_article s
+SET inserted = true
+FROM inserted i
+WHERE s.id = i.id
+    AND s.line = (SELECT min(line) FROM import_article WHERE id = s.id);
+
+INSERT INTO core_article_authors (article_id, user_id)
+SELECT s.id, u.id
+FROM import_article s,
+    jsonb_array_elements_text(s.authors) AS a(username)
+    JOIN auth_user u ON u.username = a.username
+WHERE s.inserted
+ON CONFLICT DO NOTHING;
+
+INSERT INTO core_article_authors (article_id, user_id)
+SELECT s.id, u.id
+FROM import_article s,
+    jsonb_array_elements_text(s.author_ids) AS a(id)
+    JOIN auth_user u ON u.id = a.id::bigint
+WHERE s.inserted
+ON CONFLICT DO NOTHING;
+
+INSERT INTO core_article_tags (article_id, tag_id)
+SELECT s.id, t.id
+FROM import_article s,
+    jsonb_array_elements_text(s.tags) AS n(name)
+    JOIN core_tag t ON t.name = n.name
+WHERE s.inserted
+ON CONFLICT DO NOTHING;
+
+-- Leave the sequence past the explicit ids, so a later batch failing
+-- does not leave new articles colliding with imported ones.
+SELECT setval(
+    pg_get_serial_sequence('core_article', 'id'),
+    coalesce(max(id), 1),
+    max(id) IS NOT NULL
+)
+FROM core_article;
+"""
+
+SKIPPED_IDS = """
+SELECT id FROM import_article WHERE NOT inserted ORDER BY line;
+"""
+
+MISSING_AUTHORS = """
+SELECT a.username
+FROM import_article s,
+    jsonb_array_elements_text(s.authors) AS a(username)
+WHERE s.inserted
+    AND NOT EXISTS (SELECT 1 FROM auth_user u WHERE u.username = a.username)
+UNION
+SELECT 'id ' || a.id
+FROM import_article s,
+    jsonb_array_elements_text(s.author_ids) AS a(id)
+WHERE s.inserted
+    AND NOT EXISTS (SELECT 1 FROM auth_user u WHERE u.id = a.id::bigint)
+ORDER BY 1;
+"""
+
+MAX_ID = 2 ** 63 - 1
+TITLE_LENGTH = Article._meta.get_field('title').max_length
+
+
+def parse_items(value):
+    """Parse an Authors/Tags value: a list, a list literal or one name."""
+    if isinstance(value, list):
+        return value
+    value = (value or '').strip()
+    if not value:
+        return []
+    if value.startswith('['):
+        return ast.literal_eval(value)
+    return [value]
+
+
+def parse_names(value):
+    """Return the names of a Tags value, which may hold API tag dicts."""
+    names = []
+    for item in parse_items(value):
+        if isinstance(item, dict):
+            item = item['name']
+        if not isinstance(item, str):
+            raise ValueError(f'{item!r} is not a name')
+        names.append(item)
+    return names
+
+
+def parse_authors(value):
+    """Split an Authors value into (usernames, user ids).
+
+    Integers are user primary keys, as the API renders authors.
+    """
+    names, ids = [], []
+    for item in parse_items(value):
+        if isinstance(item, str):
+            names.append(item)
+        elif isinstance(item, int) and not isinstance(item, bool):
+            ids.append(item)
+        else:
+            raise ValueError(f'{item!r} is not a username or user id')
+    return names, ids
+
+
+def parse_record(record):
+    """Return the staging column values of one input record."""
+    pk = record.get('id') or None
+    if pk is not None:
+        pk = int(pk)
+        if not 0 < pk <= MAX_ID:
+            raise ValueError(f'invalid id {pk}')
+    title = record.get('title')
+    if title is not None and len(str(title)) > TITLE_LENGTH:
+        raise ValueError(f'title longer than {TITLE_LENGTH} characters')
+    value = record['publication_date']
+    publication_date = parse_date(str(value))
+    if publication_date is None:
+        raise ValueError(f'{value!r} is not a date')
+    names, ids = parse_authors(record.get('authors'))
+    return {
+        'id': pk,
+        'title': title,
+        'abstract': record.get('abstract'),
+        'main_text': record.get('main_text'),
+        'publication_date': publication_date.isoformat(),
+        'authors': json.dumps(names),
+        'author_ids': json.dumps(ids),
+        'tags': json.dumps(parse_names(record.get('tags'))),
+    }
+
+
+class Command(BaseCommand):
+    """Django command to import articles through PostgreSQL COPY."""
+
+    help = (
+        'Import articles from CSV (as exported by /api/article/download/) '
+        'or NDJSON, batch by batch through a staging table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for stdin.")
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'ndjson'],
+            help='Input format. Guessed from the file extension if omitted.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--checkpoint',
+            help='File recording committed rows. Defaults to '
+                 '<path>.checkpoint for file input.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip the rows recorded in the checkpoint file.',
+        )
+        parser.add_argument(
+            '--create-users',
+            action='store_true',
+            help='Create missing authors with unusable passwords.',
+        )
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        path = options['path']
+        fmt = options['format'] or (
+            'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        checkpoint = options['checkpoint']
+        if checkpoint is None and path != '-':
+            checkpoint = f'{path}.checkpoint'
+
+        skip = 0
+        if options['resume']:
+            if not checkpoint or not os.path.exists(checkpoint):
+                raise CommandError('Nothing to resume from.')
+            with open(checkpoint) as f:
+                skip = int(f.read().strip() or 0)
+            self.stdout.write(f'Resuming after row {skip}.')
+
+        self.skipped_ids = []
+        self.missing_authors = set()
+        stream = sys.stdin if path == '-' else open(path, newline='')
+        try:
+            rows = self.read_rows(stream, fmt)
+            done = self.load(rows, skip, checkpoint, options)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if self.skipped_ids:
+            self.warn(
+                f'Skipped {len(self.skipped_ids)} rows whose id already '
+                f'exists', self.skipped_ids)
+        if self.missing_authors:
+            self.warn(
+                f'Left out {len(self.missing_authors)} unknown authors '
+                f'(use --create-users to create them)',
+                sorted(self.missing_authors))
+        self.stdout.write(self.style.SUCCESS(f'Imported {done} rows.'))
+
+    def warn(self, message, values, shown=20):
+        listed = ', '.join(str(value) for value in values[:shown])
+        if len(values) > shown:
+            listed += ', ...'
+        self.stdout.write(self.style.WARNING(f'{message}: {listed}.'))
+
+    def read_rows(self, stream, fmt):
+        """Yield rows as dicts of staging column values."""
+        if fmt == 'csv':
+            label = 'Row'
+            records = enumerate((
+                {CSV_HEADERS.get(k, k): v for k, v in record.items()}
+                for record in csv.DictReader(stream)
+            ), start=1)
+        else:
+            label = 'Line'
+            records = (
+                (number, line)
+                for number, line in enumerate(stream, start=1)
+                if line.strip()
+            )
+        for number, record in records:
+            try:
+                if fmt == 'ndjson':
+                    record = json.loads(record)
+                yield parse_record(record)
+            except (KeyError, ValueError, SyntaxError, AttributeError,
+                    TypeError) as exc:
+                raise CommandError(
+                    f'{label} {number}: invalid record ({exc}).')
+
+    def load(self, rows, skip, checkpoint, options):
+        """Merge rows batch by batch, recording progress after each."""
+        batch_size = options['batch_size']
+        done = skip
+        rows = islice(rows, skip, None)
+        start = time.monotonic()
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return done
+            try:
+                with transaction.atomic():
+                    self.merge_batch(batch, options['create_users'])
+            except DataError as exc:
+                raise CommandError(
+                    f'Rows {done + 1}-{done + len(batch)} were not imported '
+                    f'({str(exc).strip().splitlines()[0]}); fix them and '
+                    f'run again with --resume.')
+            # Every committed batch is visible through the API.
+            bump_generation(Article)
+            bump_generation(Tag)
+            done += len(batch)
+            if checkpoint:
+                with open(checkpoint, 'w') as f:
+                    f.write(str(done))
+            elapsed = time.monotonic() - start
+            rate = (done - skip) / elapsed if elapsed else 0
+            self.stdout.write(f'{done} rows imported ({rate:.0f} rows/s)')
+
+    def merge_batch(self, batch, create_users):
+        """COPY a batch into the staging table and merge it.
+
+        Rows whose id is taken are skipped, and authors without a user
+        are left out; both are collected for the summary.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow([
+                r'\N' if row[column] is None else row[column]
+                for column in STAGING_COLUMNS
+            ])
+        buffer.seek(0)
+
+        defaults = {
+            name: Article._meta.get_field(name).get_default()
+            for name in ('title', 'abstract', 'main_text')
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(STAGING_TABLE)
+            # copy_expert() bypasses the wrapper that turns psycopg2
+            # errors into Django's.
+            with connection.wrap_database_errors:
+                cursor.copy_expert(
+                    'COPY import_article ({}) FROM STDIN '
+                    "WITH (FORMAT csv, NULL '\\N')".format(
+                        ', '.join(STAGING_COLUMNS)),
+                    buffer,
+                )
+            if create_users:
+                cursor.execute(MERGE_USERS)
+            cursor.execute(MERGE, defaults)
+            cursor.execute(SKIPPED_IDS)
+            self.skipped_ids.extend(row[0] for row in cursor.fetchall())
+            cursor.execute(MISSING_AUTHORS)
+            self.missing_authors.update(row[0] for row in cursor.fetchall())
+            cursor.execute('DROP TABLE import_article;')
@@ -0,0 +1,144 @@
+"""
+Django command to measure the throughput of a running server.
+"""
+import http.client
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+DEFAULT_PATHS = [
+    '/api/article/',
+    '/api/article/?cursor=',
+    '/api/tag/',
+    '/api/comment/',
+    '/health/ready/',
+]
+
+
+class Command(BaseCommand):
+    """Django command to load a server with concurrent keep-alive clients."""
+
+    help = (
+        'Send GET requests from concurrent clients to a running server for '
+        'a fixed time and report throughput and latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument(
+            '--path',
+            dest='paths',
+            action='append',
+            help='Path to request, cycled per client. Repeat for more; '
+                 'defaults to the main read endpoints.',
+        )
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument('--output', help='Write the results as JSON.')
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        url = urlsplit(options['url'])
+        if url.scheme not in ('http', 'https') or not url.netloc:
+            raise CommandError(f"Invalid --url {options['url']}.")
+        paths = options['paths'] or DEFAULT_PATHS
+
+        latencies, statuses, errors = [], Counter(), Counter()
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['duration']
+
+        def client(offset):
+            conn = None
+            reused = False
+            local_latencies, local_statuses, local_errors = [], Counter(), \
+                Counter()
+            i = offset
+            while time.perf_counter() < deadline:
+                path = url.path.rstrip('/') + paths[i % len(paths)]
+                if conn is None:
+                    conn = self.connect(url, options['timeout'])
+                    reused = False
+                start = time.perf_counter()
+                try:
+                    conn.request('GET', path, headers={
+                        'Accept': 'application/json'})
+                    response = conn.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException) as exc:
+                    conn.close()
+                    conn = None
+                    # Servers may close idle keep-alive connections; retry
+                    # on a new one, as HTTP clients do.
+                    if not (reused and isinstance(exc, RETRYABLE_ERRORS)):
+                        local_errors[type(exc).__name__] += 1
+                        i += 1
+                    continue
+                i += 1
+                reused = True
+                local_latencies.append((time.perf_counter() - start) * 1000)
+                local_statuses[response.status] += 1
+                if response.will_close:
+                    conn.close()
+                    conn = None
+            if conn is not None:
+                conn.close()
+            with lock:
+                latencies.extend(local_latencies)
+                statuses.update(local_statuses)
+                errors.update(local_errors)
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=client, args=(n,))
+            for n in range(options['concurrency'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        result = self.summarize(latencies, statuses, errors, elapsed, options)
+        self.stdout.write(
+            f"{result['requests']} requests in {elapsed:.1f}s, "
+            f"{result['requests_per_second']:.1f} req/s, "
+            f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms "
+            f"p99={result['p99_ms']:.1f}ms"
+        )
+        self.stdout.write(f"statuses={result['statuses']} "
+                          f"errors={result['errors']}")
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(result, f, indent=2)
+
+    def connect(self, url, timeout):
+        if url.scheme == 'https':
+            return http.client.HTTPSConnection(url.netloc, timeout=timeout)
+        return http.client.HTTPConnection(url.netloc, timeout=timeout)
+
+    def summarize(self, latencies, statuses, errors, elapsed, options):
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        else:
+            cuts = (latencies or [0.0]) * 99
+        return {
+            'url': options['url'],
+            'concurrency': options['concurrency'],
+            'duration_s': round(elapsed, 3),
+            'requests': len(latencies),
+            'requests_per_second': round(len(latencies) / elapsed, 2),
+            'p50_ms': round(cuts[49], 3),
+            'p95_ms': round(cuts[94], 3),
+            'p99_ms': round(cuts[98], 3),
+            'statuses': {str(k): v for k, v in sorted(statuses.items())},
+            'errors': dict(errors),
+        }
@@ -0,0 +1,92 @@
+"""
+Django command to recompute the denormalized article and tag counters.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from core.cache import bump_generation
+from core.models import Article, Tag
+
+RECOUNT_ARTICLES = """
+UPDATE core_article a
+SET comment_count = c.comment_count,
+    tag_count = c.tag_count,
+    updated_at = clock_timestamp()
+FROM (
+    SELECT
+        a.id,
+        coalesce(cc.n, 0) AS comment_count,
+        coalesce(tc.n, 0) AS tag_count
+    FROM core_article a
+    LEFT JOIN (
+        SELECT article_id, count(*) AS n
+        FROM core_comment
+        WHERE article_id >= %(start)s AND article_id < %(stop)s
+        GROUP BY article_id
+    ) cc ON cc.article_id = a.id
+    LEFT JOIN (
+        SELECT article_id, count(*) AS n
+        FROM core_article_tags
+        WHERE article_id >= %(start)s AND article_id < %(stop)s
+        GROUP BY article_id
+    ) tc ON tc.article_id = a.id
+    WHERE a.id >= %(start)s AND a.id < %(stop)s
+) c
+WHERE a.id = c.id
+    AND (a.comment_count, a.tag_count)
+        IS DISTINCT FROM (c.comment_count, c.tag_count);
+"""
+
+RECOUNT_TAGS = """
+UPDATE core_tag t
+SET article_count = c.article_count
+FROM (
+    SELECT t.id, coalesce(ac.n, 0) AS article_count
+    FROM core_tag t
+    LEFT JOIN (
+        SELECT tag_id, count(*) AS n
+        FROM core_article_tags
+        WHERE tag_id >= %(start)s AND tag_id < %(stop)s
+        GROUP BY tag_id
+    ) ac ON ac.tag_id = t.id
+    WHERE t.id >= %(start)s AND t.id < %(stop)s
+) c
+WHERE t.id = c.id AND t.article_count <> c.article_count;
+"""
+
+
+class Command(BaseCommand):
+    """Django command to repair drift of the trigger-maintained counters."""
+
+    help = (
+        'Recompute Article.comment_count, Article.tag_count and '
+        'Tag.article_count from the underlying tables, one id range at a '
+        'time.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        articles = self.recount(
+            Article, RECOUNT_ARTICLES, options['batch_size'])
+        tags = self.recount(Tag, RECOUNT_TAGS, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Repaired the counters of {articles} articles and {tags} tags.'))
+
+    def recount(self, model, sql, batch_size):
+        """Run `sql` over every id range of `model`; return rows changed."""
+        bounds = model.objects.aggregate(first=Min('id'), last=Max('id'))
+        repaired = 0
+        if bounds['first'] is not None:
+            for start in range(
+                    bounds['first'], bounds['last'] + 1, batch_size):
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(
+                        sql, {'start': start, 'stop': start + batch_size})
+                    repaired += cursor.rowcount
+        if repaired:
+            bump_generation(model)
+        return repaired
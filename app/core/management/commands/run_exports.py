@@ -0,0 +1,70 @@
+"""
+Django command to run queued article export jobs.
+"""
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from article.exports import (
+    claim_job, purge_expired_exports, requeue_stale_jobs, run_export)
+
+
+class Command(BaseCommand):
+    """Django command to work through the ExportJob queue."""
+
+    help = (
+        'Claim pending article exports one at a time and write their files '
+        'to EXPORT_ROOT. Run as many workers as needed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of polling.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait for new jobs when the queue is empty.',
+        )
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        self.stopping = False
+        previous = {
+            signum: signal.signal(signum, self.stop)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.work(options['once'], options['poll_interval'])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def stop(self, signum, frame):
+        """Finish the current job, then exit."""
+        self.stopping = True
+
+    def work(self, once, poll_interval):
+        while not self.stopping:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(f'Queued {requeued} stalled exports again.')
+            job = claim_job()
+            if job is None:
+                purge_expired_exports()
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f'Export {job.pk}: running.')
+            job = run_export(job)
+            message = f'Export {job.pk}: {job.status}, {job.rows} rows.'
+            if job.status == job.Status.DONE:
+                self.stdout.write(self.style.SUCCESS(message))
+            else:
+                self.stdout.write(self.style.ERROR(message))
@@ -0,0 +1,42 @@
+"""
+Django command to seed a deterministic dataset for benchmarks.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seed import SCALES, USERNAME, seed_database
+
+
+class Command(BaseCommand):
+    """Django command to seed users, tags, articles and comments."""
+
+    help = 'Seed a reproducible dataset at a given scale.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='1k')
+        for table in ('users', 'tags', 'articles', 'comments'):
+            parser.add_argument(
+                f'--{table}',
+                type=int,
+                help=f'Override the number of {table} of the scale.',
+            )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        """Endpoint for command."""
+        if get_user_model().objects.filter(
+                username=USERNAME.format(0)).exists():
+            raise CommandError('The database is already seeded.')
+
+        sizes = {
+            table: options[table] if options[table] is not None else count
+            for table, count in SCALES[options['scale']].items()
+        }
+        seed_database(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+            **sizes,
+        )
+        self.stdout.write(self.style.SUCCESS('Seeding complete.'))
@@ -0,0 +1,192 @@
+"""
+Request instrumentation and database routing middleware.
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from core.routers import routed_to, use_replica
+
+logger = logging.getLogger('core.timing')
+
+IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(sql):
+    """Normalize SQL so repeats of one statement compare equal."""
+    sql = IN_LIST.sub('IN (...)', sql)
+    return LITERAL.sub('?', sql)
+
+
+class RequestTimingMiddleware:
+    """Measure SQL, view and render time of sampled requests.
+
+    Adds a Server-Timing header and logs one JSON line per sampled
+    request. Statements that run REQUEST_TIMING_DUPLICATE_THRESHOLD times
+    or more with the same fingerprint are reported as likely N+1
+    patterns. When REQUEST_TIMING_ENABLED is off the middleware removes
+    itself from the chain at startup.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.threshold = settings.REQUEST_TIMING_DUPLICATE_THRESHOLD
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timing = request._timing = {
+            'db': 0.0,
+            'queries': Counter(),
+            'view_start': None,
+            'view_end': None,
+        }
+
+        def record_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                timing['db'] += time.perf_counter() - start
+                timing['queries'][fingerprint(sql)] += 1
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+            response = self.get_response(request)
+        end = time.perf_counter()
+        self.report(request, response, timing, start, end)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_timing'):
+            request._timing['view_start'] = time.perf_counter()
+            request._timing['db_before_view'] = request._timing['db']
+
+    def process_template_response(self, request, response):
+        if hasattr(request, '_timing'):
+            request._timing['view_end'] = time.perf_counter()
+            request._timing['db_in_view'] = (
+                request._timing['db'] - request._timing['db_before_view'])
+        return response
+
+    def report(self, request, response, timing, start, end):
+        # Streaming bodies are produced after this point and are not timed.
+        metrics = {'db': timing['db'] * 1000}
+        view_start, view_end = timing['view_start'], timing['view_end']
+        if view_start is not None and view_end is not None:
+            view = view_end - view_start - timing['db_in_view']
+            metrics['serialize'] = view * 1000
+            metrics['render'] = (end - view_end) * 1000
+        metrics['total'] = (end - start) * 1000
+
+        queries = timing['queries']
+        count = sum(queries.values())
+        duplicates = {
+            sql: n for sql, n in queries.items() if n >= self.threshold
+        }
+        descriptions = {
+            'db': f'{count} queries',
+            'serialize': 'View and serializer code, excluding SQL',
+            'render': 'Response rendering',
+        }
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={value:.1f}' + (
+                f';desc="{descriptions[name]}"'
+                if name in descriptions else '')
+            for name, value in metrics.items()
+        )
+
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': count,
+            **{f'{name}_ms': round(value, 2)
+               for name, value in metrics.items()},
+        }
+        if duplicates:
+            entry['duplicate_queries'] = duplicates
+            logger.warning(json.dumps(entry))
+        else:
+            logger.info(json.dumps(entry))
+
+
+class ReplicaRoutingMiddleware:
+    """Serve reads of safe requests from a read replica.
+
+    Clients are pinned to the primary for DB_REPLICA_PIN_SECONDS after
+    any other request, so they read their own writes. Pins are kept in
+    the DB_REPLICA_PIN_CACHE_ALIAS cache, which must be shared by all
+    processes for pins to hold across them. Without DB_REPLICAS the
+    middleware removes itself from the chain at startup.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DB_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            self.pin(request)
+            return response
+        if self.is_pinned(request):
+            return self.get_response(request)
+
+        with use_replica() as choice:
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.stream_from(
+                choice, response.streaming_content)
+        return response
+
+    def stream_from(self, choice, content):
+        # Streamed bodies are read after the view returns.
+        content = iter(content)
+        while True:
+            with routed_to(choice):
+                chunk = next(content, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def pin_keys(self, request):
+        # Clients are known by address and by token, so a client that
+        # writes before it has a token is still pinned when it uses one.
+        idents = [
+            BaseThrottle().get_ident(request),
+            request.META.get('HTTP_AUTHORIZATION'),
+        ]
+        return [
+            'db-pin:' + hashlib.sha256(ident.encode()).hexdigest()
+            for ident in idents if ident
+        ]
+
+    def pin(self, request):
+        caches[settings.DB_REPLICA_PIN_CACHE_ALIAS].set_many(
+            dict.fromkeys(self.pin_keys(request), True),
+            settings.DB_REPLICA_PIN_SECONDS)
+
+    def is_pinned(self, request):
+        return bool(caches[settings.DB_REPLICA_PIN_CACHE_ALIAS].get_many(
+            self.pin_keys(request)))
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:51
+
+from django.db import migrations, models
+
+
+# The M2M through tables are auto-created, so their reverse lookup indexes
+# cannot be declared in Meta.indexes. The unique (article_id, <fk>_id)
+# constraint already serves forward lookups.
+THROUGH_INDEXES = """
+CREATE INDEX article_authors_user_article_idx
+    ON core_article_authors (user_id, article_id);
+CREATE INDEX article_tags_tag_article_idx
+    ON core_article_tags (tag_id, article_id);
+"""
+
+DROP_THROUGH_INDEXES = """
+DROP INDEX IF EXISTS article_authors_user_article_idx;
+DROP INDEX IF EXISTS article_tags_tag_article_idx;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_article_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['publication_date', 'id'], name='article_pubdate_id_idx'),
+        ),
+        migrations.RunSQL(THROUGH_INDEXES, DROP_THROUGH_INDEXES),
+    ]
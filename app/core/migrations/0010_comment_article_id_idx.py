@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'id'], name='comment_article_id_idx'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:04
+
+from django.db import migrations, models
+
+
+# Statement-level triggers fold a whole bulk insert or delete into one
+# UPDATE per affected article. The counters are part of the article
+# representation, so updated_at moves with them.
+COUNT_TRIGGERS = """
+CREATE FUNCTION core_article_count_update() RETURNS trigger AS $$
+DECLARE
+    deltas text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        deltas := 'SELECT article_id, 1 AS n FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        deltas := 'SELECT article_id, -1 AS n FROM old_rows';
+    ELSE
+        deltas := 'SELECT article_id, 1 AS n FROM new_rows '
+            'UNION ALL SELECT article_id, -1 AS n FROM old_rows';
+    END IF;
+    EXECUTE format(
+        'UPDATE core_article a SET %1$I = a.%1$I + d.n, updated_at = clock_timestamp() '
+        'FROM (SELECT article_id, sum(n) AS n FROM (%2$s) c '
+        '      WHERE article_id IS NOT NULL '
+        '      GROUP BY article_id HAVING sum(n) <> 0) d '
+        'WHERE a.id = d.article_id',
+        TG_ARGV[0], deltas);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_article_comment_count_insert
+    AFTER INSERT ON core_comment
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE core_article_count_update('comment_count');
+CREATE TRIGGER core_article_comment_count_update
+    AFTER UPDATE ON core_comment
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE core_article_count_update('comment_count');
+CREATE TRIGGER core_article_comment_count_delete
+    AFTER DELETE ON core_comment
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE core_article_count_update('comment_count');
+CREATE TRIGGER core_article_tag_count_insert
+    AFTER INSERT ON core_article_tags
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE core_article_count_update('tag_count');
+CREATE TRIGGER core_article_tag_count_delete
+    AFTER DELETE ON core_article_tags
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE core_article_count_update('tag_count');
+
+UPDATE core_article a
+SET comment_count = (
+        SELECT count(*) FROM core_comment c WHERE c.article_id = a.id),
+    tag_count = (
+        SELECT count(*) FROM core_article_tags t WHERE t.article_id = a.id);
+"""
+
+DROP_COUNT_TRIGGERS = """
+DROP TRIGGER IF EXISTS core_article_comment_count_insert ON core_comment;
+DROP TRIGGER IF EXISTS core_article_comment_count_update ON core_comment;
+DROP TRIGGER IF EXISTS core_article_comment_count_delete ON core_comment;
+DROP TRIGGER IF EXISTS core_article_tag_count_insert ON core_article_tags;
+DROP TRIGGER IF EXISTS core_article_tag_count_delete ON core_article_tags;
+DROP FUNCTION IF EXISTS core_article_count_update();
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_comment_article_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='tag_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(COUNT_TRIGGERS, DROP_COUNT_TRIGGERS),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-comment_count', 'id'], name='article_comment_count_idx'),
+        ),
+    ]
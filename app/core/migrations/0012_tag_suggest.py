@@ -0,0 +1,86 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+TAG_COUNT_TRIGGERS = """
+CREATE FUNCTION core_tag_article_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE core_tag t SET article_count = t.article_count + d.n
+        FROM (SELECT tag_id, count(*) AS n FROM new_rows GROUP BY tag_id) d
+        WHERE t.id = d.tag_id;
+    ELSE
+        UPDATE core_tag t SET article_count = t.article_count - d.n
+        FROM (SELECT tag_id, count(*) AS n FROM old_rows GROUP BY tag_id) d
+        WHERE t.id = d.tag_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_tag_article_count_insert
+    AFTER INSERT ON core_article_tags
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE core_tag_article_count_update();
+CREATE TRIGGER core_tag_article_count_delete
+    AFTER DELETE ON core_article_tags
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE core_tag_article_count_update();
+
+UPDATE core_tag t
+SET article_count = (
+    SELECT count(*) FROM core_article_tags a WHERE a.tag_id = t.id);
+"""
+
+DROP_TAG_COUNT_TRIGGERS = """
+DROP TRIGGER IF EXISTS core_tag_article_count_insert ON core_article_tags;
+DROP TRIGGER IF EXISTS core_tag_article_count_delete ON core_article_tags;
+DROP FUNCTION IF EXISTS core_tag_article_count_update();
+"""
+
+# Prefix lookups on lower(name) are served by a btree in pattern order.
+# Similarity lookups need pg_trgm, which is only created where the server
+# ships it; the suggest view falls back to prefixes without it.
+TAG_NAME_INDEXES = """
+CREATE INDEX tag_name_pattern_idx ON core_tag (lower(name) text_pattern_ops);
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'
+    ) THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX tag_name_trgm_idx ON core_tag
+            USING gin (name gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+DROP_TAG_NAME_INDEXES = """
+DROP INDEX IF EXISTS tag_name_pattern_idx;
+DROP INDEX IF EXISTS tag_name_trgm_idx;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_article_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='article_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(TAG_COUNT_TRIGGERS, DROP_TAG_COUNT_TRIGGERS),
+        migrations.RunSQL(TAG_NAME_INDEXES, DROP_TAG_NAME_INDEXES),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-article_count', 'name'], name='tag_usage_idx'),
+        ),
+    ]
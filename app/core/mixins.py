@@ -0,0 +1,269 @@
+"""
+Reusable view mixins.
+"""
+import hashlib
+
+from django.db.models import Count, Max, Prefetch
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ListSerializer
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+class EagerLoadingMixin:
+    """Plan the view queryset from the fields its serializer renders.
+
+    Forward foreign keys are joined with select_related() and many-valued
+    relations are fetched with prefetch_related(), so a page of results
+    costs the same number of queries whatever its size.
+    """
+
+    def get_related_lookups(self, serializer):
+        """Return (select_related, prefetch_related) lookups for fields."""
+        select, prefetch = [], []
+        for field in serializer.fields.values():
+            if field.write_only or field.source == '*':
+                continue
+            source = field.source.replace('.', '__')
+            if isinstance(field, (ManyRelatedField, ListSerializer)):
+                prefetch.append(source)
+            elif isinstance(field, BaseSerializer):
+                select.append(source)
+            elif isinstance(field, RelatedField) and \
+                    not field.use_pk_only_optimization():
+                select.append(source)
+        return select, prefetch
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select, prefetch = self.get_related_lookups(self.get_serializer())
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*(
+                self.get_prefetch(queryset.model, lookup)
+                for lookup in prefetch
+            ))
+        return queryset
+
+    def get_prefetch(self, model, lookup):
+        # Related rows of a model without a default ordering come back in
+        # whatever order the plan produces; sort them so output is stable.
+        if '__' in lookup:
+            return lookup
+        related = model._meta.get_field(lookup).related_model
+        if related._meta.ordering:
+            return lookup
+        return Prefetch(
+            lookup, queryset=related._default_manager.order_by('pk'))
+
+
+class ConditionalGetMixin:
+    """Answer GET requests with ETag/Last-Modified validators.
+
+    Detail views take their validators from one aggregate query over the
+    object row. List views take an ETag from the page they are about to
+    render, so no query is added: it covers the page's rows, their
+    latest `last_modified_fields` value and the pagination metadata.
+    Lists send no Last-Modified, as that latest value goes back when a
+    row leaves the page. A matching If-None-Match, or If-Modified-Since
+    on a detail, gets a 304 before anything is serialized.
+    """
+    last_modified_fields = ('updated_at',)
+
+    def get(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return self.conditional_retrieve(request, *args, **kwargs)
+        return self.conditional_list(request)
+
+    def conditional_retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        aggregates = {
+            f'last_modified_{i}': Max(field)
+            for i, field in enumerate(self.get_last_modified_fields())
+        }
+        values = self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).order_by().aggregate(
+            count=Count('pk', distinct=True), **aggregates)
+        stamps = [
+            value for key, value in values.items()
+            if key != 'count' and value is not None
+        ]
+        if not stamps:
+            return super().get(request, *args, **kwargs)
+
+        last_modified = max(stamps)
+        etag = self.make_etag(request, [last_modified.isoformat()])
+        return self.conditional_response(
+            request, etag, last_modified,
+            lambda: super(ConditionalGetMixin, self).get(
+                request, *args, **kwargs))
+
+    def conditional_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+
+        def render():
+            serializer = self.get_serializer(rows, many=True)
+            if page is None:
+                return Response(serializer.data)
+            return self.get_paginated_response(serializer.data)
+
+        stamps = [
+            stamp for row in rows for stamp in self.get_modified_values(row)
+        ]
+        if not stamps:
+            return render()
+
+        parts = [[row.pk for row in rows], max(stamps).isoformat()]
+        if page is not None:
+            metadata = self.get_paginated_response([]).data
+            parts.append({k: v for k, v in metadata.items() if k != 'results'})
+        etag = self.make_etag(request, parts)
+        return self.conditional_response(request, etag, None, render)
+
+    def get_last_modified_fields(self):
+        return self.last_modified_fields
+
+    def get_modified_values(self, instance):
+        """Yield the last_modified_fields values reachable from instance.
+
+        Lookups may span relations, which should be prefetched.
+        """
+        for field in self.get_last_modified_fields():
+            values = [instance]
+            for name in field.split('__'):
+                found = []
+                for value in values:
+                    attr = getattr(value, name)
+                    if hasattr(attr, 'all'):
+                        found += attr.all()
+                    elif isinstance(attr, list):
+                        found += attr
+                    else:
+                        found.append(attr)
+                values = found
+            yield from (value for value in values if value is not None)
+
+    def make_etag(self, request, parts):
+        raw = '|'.join([
+            request.get_full_path(),
+            request.accepted_media_type,
+            *map(str, parts),
+        ])
+        return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+    def conditional_response(self, request, etag, last_modified, render):
+        timestamp = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class SparseFieldsMixin:
+    """Let GET requests pick the serializer fields with ?fields=/?omit=.
+
+    `?fields=` names the fields to render and `?omit=` removes fields from
+    the default set. Lists leave out `list_omit_fields` unless asked for
+    by name. Model columns that are not rendered are deferred, so they are
+    not read from the database either; columns the view itself relies on
+    (last_modified_fields, keyset_ordering) are always loaded.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    list_omit_fields = ()
+
+    def is_list_request(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return lookup_url_kwarg not in self.kwargs
+
+    def get_sparse_fields(self, available):
+        """Return the names of the fields to render, or None for all."""
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        params = request.query_params
+        requested = params.get(self.fields_query_param)
+        omitted = params.get(self.omit_query_param)
+        default_omit = self.list_omit_fields if self.is_list_request() else ()
+        if requested is None and omitted is None and not default_omit:
+            return None
+
+        if requested is None:
+            names = [name for name in available if name not in default_omit]
+        else:
+            names = [name for name in requested.split(',') if name]
+        omit = [name for name in (omitted or '').split(',') if name]
+        errors = {
+            param: [f'Unknown field "{name}".' for name in values
+                    if name not in available]
+            for param, values in (
+                (self.fields_query_param, names),
+                (self.omit_query_param, omit),
+            )
+        }
+        errors = {param: errors for param, errors in errors.items() if errors}
+        if errors:
+            raise ValidationError(errors)
+        return [name for name in available if name in names and
+                name not in omit]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        target = getattr(serializer, 'child', serializer)
+        names = self.get_sparse_fields(list(target.fields))
+        if names is not None:
+            for name in list(target.fields):
+                if name not in names:
+                    target.fields.pop(name)
+        return serializer
+
+    def get_rendered_sources(self):
+        # Asked for once per row by ConditionalGetMixin; the answer only
+        # depends on the request.
+        if not hasattr(self, '_rendered_sources'):
+            serializer = self.get_serializer()
+            target = getattr(serializer, 'child', serializer)
+            self._rendered_sources = {
+                field.source.split('.')[0]
+                for field in target.fields.values() if not field.write_only
+            }
+        return set(self._rendered_sources)
+
+    def get_last_modified_fields(self):
+        # Relations that are not rendered cannot change the response.
+        opts = self.queryset.model._meta
+        rendered = self.get_rendered_sources()
+        return [
+            field for field in super().get_last_modified_fields()
+            if not opts.get_field(field.split('__')[0]).is_relation
+            or field.split('__')[0] in rendered
+        ]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return queryset
+        required = self.get_rendered_sources()
+        required.update(
+            field.split('__')[0]
+            for field in getattr(self, 'last_modified_fields', ()))
+        required.update(getattr(self, 'keyset_ordering', ()))
+        deferred = [
+            field.name for field in queryset.model._meta.concrete_fields
+            if not field.primary_key and field.name not in required
+        ]
+        return queryset.defer(*deferred) if deferred else queryset
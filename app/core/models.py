@@ -1,21 +1,80 @@
 """
 Database models.
 """
+import os
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchVectorField, TrigramSimilarity)
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
-class Tag(models.Model):
+class CounterModel(models.Model):
+    """Model with COUNTER_FIELDS maintained by database triggers."""
+    COUNTER_FIELDS = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Never write back a copy of the counters that may be stale.
+        if not self._state.adding and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class TagQuerySet(models.QuerySet):
+    """Queryset for tags."""
+
+    def name_prefix(self, prefix):
+        """Return the tags whose name starts with `prefix`, in any case."""
+        return self.alias(lower_name=Lower('name')).filter(
+            lower_name__startswith=prefix.lower())
+
+    def similar_name(self, name):
+        """Return the tags similar to `name`, annotated with `similarity`.
+
+        Requires the pg_trgm extension.
+        """
+        return self.filter(name__trigram_similar=name).annotate(
+            similarity=TrigramSimilarity('name', name))
+
+
+class Tag(CounterModel):
     """Tag model."""
     name = models.CharField(
         max_length=255,
         unique=True,
         default="Tag name to be added")
+    updated_at = models.DateTimeField(auto_now=True)
+    # Number of articles using the tag, maintained by the
+    # core_tag_article_count_update triggers on core_article_tags.
+    article_count = models.IntegerField(default=0, editable=False)
+
+    objects = TagQuerySet.as_manager()
+
+    COUNTER_FIELDS = ('article_count',)
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            # Lets short, unselective prefixes walk tags in usage order.
+            models.Index(
+                fields=['-article_count', 'name'], name='tag_usage_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -30,15 +89,31 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         related_name='comments',
         null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            # Serves one article's comments in id order.
+            models.Index(
+                fields=['article', 'id'], name='comment_article_id_idx'),
+        ]
 
     def __str__(self):
         return self.content
 
 
-class Article(models.Model):
+class ArticleQuerySet(models.QuerySet):
+    """Queryset for articles."""
+
+    def editable_by(self, user):
+        """Return the articles `user` may change."""
+        if not user.is_authenticated:
+            return self.none()
+        return self.filter(authors=user)
+
+
+class Article(CounterModel):
     """Article model."""
     authors = models.ManyToManyField(User, related_name="articles")
     title = models.CharField(max_length=255, default="Title to be added")
@@ -46,9 +121,82 @@ class Article(models.Model):
     abstract = models.TextField(default="Abstract to be added")
     publication_date = models.DateField()
     tags = models.ManyToManyField(Tag, related_name="tags")
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the core_article_search_vector_update trigger.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Maintained by the core_article_count_update triggers on core_comment
+    # and core_article_tags; `recount_articles` repairs drift.
+    comment_count = models.IntegerField(default=0, editable=False)
+    tag_count = models.IntegerField(default=0, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
+
+    COUNTER_FIELDS = ('comment_count', 'tag_count')
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='article_search_gin'),
+            models.Index(
+                fields=['publication_date', 'id'],
+                name='article_pubdate_id_idx',
+            ),
+            models.Index(
+                fields=['-comment_count', 'id'],
+                name='article_comment_count_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class ExportJob(models.Model):
+    """Article export requested through the API and run by a worker.
+
+    Jobs are queued in this table and claimed by `run_exports` workers
+    with SELECT ... FOR UPDATE SKIP LOCKED, so no broker is needed.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        DONE = 'done'
+        FAILED = 'failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name='+')
+    # Query parameters of the export, as {name: [value, ...]}.
+    params = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    rows = models.PositiveBigIntegerField(default=0)
+    size = models.PositiveBigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    # Refreshed after every chunk; running jobs whose worker stopped
+    # refreshing it are queued again.
+    heartbeat_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # Keeps claiming the oldest pending job cheap as jobs pile up.
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status='pending'),
+                name='exportjob_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'Export {self.pk} ({self.status})'
+
+    @property
+    def path(self):
+        """Location of the finished file under EXPORT_ROOT."""
+        return os.path.join(settings.EXPORT_ROOT, f'{self.pk}.csv')
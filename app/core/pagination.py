@@ -0,0 +1,212 @@
+"""
+Pagination classes shared by the API views.
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError as APIError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination keyed on the values of the last row seen.
+
+    The view's `keyset_ordering` (default `('id',)`) must be ascending and
+    unique as a whole. Each page is a range scan starting at the cursor,
+    so deep pages cost the same as the first one and no COUNT is run.
+    Querysets the filters ordered some other way, as by `?search=` rank
+    or `?ordering=`, are refused with a 400 rather than reordered.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('id',)
+    invalid_cursor_message = 'Invalid cursor.'
+    unsupported_ordering_message = (
+        'Cursors only follow the default ordering; use page numbers with '
+        'this search or ordering.')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        self.check_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor['r']
+        if cursor is not None:
+            try:
+                queryset = queryset.filter(
+                    self.keyset_filter(cursor['v'], reverse))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        prefix = '-' if reverse else ''
+        queryset = queryset.order_by(*(prefix + f for f in self.ordering))
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.first_key = self.get_key(results[0]) if results else None
+        self.last_key = self.get_key(results[-1]) if results else None
+        return results
+
+    def check_ordering(self, queryset):
+        """Refuse querysets explicitly ordered other than by the keyset."""
+        requested = tuple(queryset.query.order_by)
+        if requested and requested not in (
+                self.ordering, tuple(f for f in self.ordering if f != 'id')):
+            raise APIError(
+                {self.cursor_query_param: [self.unsupported_ordering_message]})
+
+    def keyset_filter(self, values, reverse=False):
+        """Return a Q matching rows strictly after (or before) `values`."""
+        op = 'lt' if reverse else 'gt'
+        clauses = []
+        for i, field in enumerate(self.ordering):
+            equal = dict(zip(self.ordering[:i], values[:i]))
+            clauses.append(Q(**equal, **{f'{field}__{op}': values[i]}))
+        # The redundant bound on the leading column lets Postgres start an
+        # index range scan at the cursor.
+        bound = {f'{self.ordering[0]}__{op}e': values[0]}
+        return Q(**bound) & reduce(or_, clauses)
+
+    def get_key(self, instance):
+        key = []
+        for field in self.ordering:
+            if isinstance(instance, dict):
+                value = instance[field]
+            else:
+                value = getattr(instance, field)
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            key.append(value)
+        return key
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')))
+            if not isinstance(cursor['r'], bool) or \
+                    len(cursor['v']) != len(self.ordering):
+                raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, key, reverse):
+        cursor = json.dumps({'v': key, 'r': reverse}, separators=(',', ':'))
+        encoded = b64encode(cursor.encode('ascii')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_key is None:
+            return None
+        return self.encode_cursor(self.last_key, False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_key is None:
+            return None
+        return self.encode_cursor(self.first_key, True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class OptionalKeysetPagination(PageNumberPagination):
+    """Page number pagination with opt-in keyset cursors.
+
+    Requests that pass `?cursor=` (empty for the first page) are paginated
+    with KeysetPagination. Page number requests may pass `?count=false` to
+    skip the COUNT query; `next` is then worked out by fetching one extra
+    row.
+    """
+    count_query_param = 'count'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        self.skip_count = False
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.get_page_size(request)
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        count = request.query_params.get(self.count_query_param, '')
+        if count.lower() not in ('false', '0'):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.skip_count = True
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(
+                request.query_params.get(self.page_query_param, 1))
+            if self.page_number < 1:
+                raise InvalidPage
+        except (TypeError, ValueError, InvalidPage):
+            raise NotFound(self.invalid_page_message)
+        offset = (self.page_number - 1) * page_size
+        results = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(results) > page_size
+        return results[:page_size]
+
+    def get_next_link(self):
+        if not self.skip_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if not self.skip_count:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        if self.skip_count:
+            return Response(OrderedDict([
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data),
+            ]))
+        return super().get_paginated_response(data)
@@ -0,0 +1,241 @@
+"""
+Per-process pools of PostgreSQL connections.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection was returned to a full pool within its timeout."""
+
+
+def close_quietly(conn):
+    try:
+        conn.close()
+    except psycopg2.Error:
+        pass
+
+
+def ping(conn):
+    """Return whether `conn` answers a query."""
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+    except psycopg2.Error:
+        return False
+    return True
+
+
+class ConnectionPool:
+    """A bounded set of psycopg2 connections shared by a process's threads.
+
+    Connections are opened on demand, up to `max_size`. Past that a
+    checkout waits up to `timeout` seconds for one to be returned, then
+    raises PoolTimeout. Returned connections are reused last in, first
+    out, so the ones left over after a burst stay idle and are closed
+    after `max_idle` seconds. Connections older than `max_lifetime`
+    seconds are replaced, and those idle for over `check_after` seconds
+    are pinged before they are handed out.
+    """
+
+    def __init__(self, max_size=4, timeout=5.0, max_idle=300.0,
+                 max_lifetime=3600.0, check_after=10.0):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.lock = threading.Lock()
+        self.returned = threading.Condition(self.lock)
+        # (connection, time returned), most recently returned last.
+        self.idle = deque()
+        self.opened_at = {}
+        # Open connections plus slots reserved by checkouts connecting.
+        self.size = 0
+        self.waiting = 0
+        self.counters = dict.fromkeys((
+            'checkouts', 'timeouts', 'connections_opened',
+            'connections_closed'), 0)
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def checkout(self, connect):
+        """Return an idle connection, or one made by calling `connect`."""
+        deadline = time.monotonic() + self.timeout
+        waited = 0.0
+        while True:
+            conn, idle_for, wait = self.reserve(deadline)
+            waited += wait
+            if conn is None:
+                try:
+                    conn = connect()
+                except BaseException:
+                    self.discard(None)
+                    raise
+                with self.lock:
+                    self.opened_at[conn] = time.monotonic()
+                    self.counters['connections_opened'] += 1
+                break
+            if idle_for < self.check_after or ping(conn):
+                break
+            self.discard(conn)
+        with self.lock:
+            self.counters['checkouts'] += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return conn
+
+    def reserve(self, deadline):
+        """Take an idle connection or a slot for a new one.
+
+        Return (connection or None, seconds it was idle, seconds waited).
+        """
+        started = time.monotonic()
+        stale = []
+        try:
+            with self.returned:
+                self.waiting += 1
+                try:
+                    while True:
+                        now = time.monotonic()
+                        self.prune(now, stale)
+                        while self.idle:
+                            conn, returned_at = self.idle.pop()
+                            if now - self.opened_at[conn] < self.max_lifetime:
+                                return conn, now - returned_at, now - started
+                            stale.append(self.forget(conn))
+                        if self.size < self.max_size:
+                            self.size += 1
+                            return None, 0.0, now - started
+                        if now >= deadline:
+                            self.counters['timeouts'] += 1
+                            break
+                        self.returned.wait(deadline - now)
+                finally:
+                    self.waiting -= 1
+        finally:
+            for conn in stale:
+                close_quietly(conn)
+        logger.warning('Database pool exhausted: %s', self.stats())
+        raise PoolTimeout(
+            f'No database connection was free within {self.timeout}s '
+            f'({self.max_size} in use).')
+
+    def release(self, conn, check=False):
+        """Return `conn` for reuse, or close it if it is unusable.
+
+        Open transactions are rolled back. With `check`, the connection is
+        pinged first, as after an error that may have broken it.
+        """
+        if not self.reset(conn) or (check and not ping(conn)):
+            self.discard(conn)
+            return
+        stale = []
+        with self.returned:
+            now = time.monotonic()
+            self.idle.append((conn, now))
+            self.prune(now, stale)
+            self.returned.notify()
+        for conn in stale:
+            close_quietly(conn)
+
+    def reset(self, conn):
+        """Roll back `conn` if needed; return whether it can be reused."""
+        if conn.closed:
+            return False
+        status = conn.info.transaction_status
+        if status == extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status in (extensions.TRANSACTION_STATUS_INTRANS,
+                      extensions.TRANSACTION_STATUS_INERROR):
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+            return True
+        return False
+
+    def discard(self, conn):
+        """Close `conn`, or give up a reserved slot if it is None."""
+        with self.returned:
+            if conn is None:
+                self.size -= 1
+            else:
+                self.forget(conn)
+            self.returned.notify()
+        if conn is not None:
+            close_quietly(conn)
+
+    def forget(self, conn):
+        del self.opened_at[conn]
+        self.size -= 1
+        self.counters['connections_closed'] += 1
+        return conn
+
+    def prune(self, now, stale):
+        while self.idle and now - self.idle[0][1] >= self.max_idle:
+            conn, _ = self.idle.popleft()
+            stale.append(self.forget(conn))
+
+    def close(self):
+        """Close the idle connections."""
+        with self.returned:
+            stale = [self.forget(conn) for conn, _ in self.idle]
+            self.idle.clear()
+            self.returned.notify_all()
+        for conn in stale:
+            close_quietly(conn)
+
+    def stats(self):
+        """Return a snapshot of the pool's gauges and counters."""
+        with self.lock:
+            idle = len(self.idle)
+            checkouts = self.counters['checkouts'] or 1
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'in_use': self.size - idle,
+                'idle': idle,
+                'waiting': self.waiting,
+                **self.counters,
+                'wait_ms_avg': round(self.wait_total * 1000 / checkouts, 3),
+                'wait_ms_max': round(self.wait_max * 1000, 3),
+            }
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params, options):
+    """Return this process's pool for `alias` and `conn_params`."""
+    # Pools inherited from a parent process stay in the registry, so the
+    # connections the parent still uses are never closed from here.
+    key = (os.getpid(), alias, repr(sorted(conn_params.items())))
+    with pools_lock:
+        pool = pools.get(key)
+        if pool is None:
+            pool = pools[key] = ConnectionPool(**options)
+        return pool
+
+
+def close_pools(alias):
+    """Close the idle connections of every pool of `alias`."""
+    pid = os.getpid()
+    with pools_lock:
+        found = [
+            pool for (owner, name, _), pool in pools.items()
+            if owner == pid and name == alias
+        ]
+    for pool in found:
+        pool.close()
@@ -0,0 +1,66 @@
+"""
+JSON renderer backed by orjson when it is installed.
+"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Datetimes, dates and times are passed to DRF's encoder so they follow
+# its isoformat() rules; dict keys are stringified like json.dumps() does.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+encode_default = JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Render JSON with orjson, falling back to DRF's encoder.
+
+    The output is byte-for-byte what JSONRenderer produces for compact,
+    unindented, non-ASCII-escaped JSON, which is DRF's default. Values
+    without a native orjson encoding, such as Decimal, lazy translation
+    strings and dates, are converted by DRF's JSONEncoder.default().
+    Floats are the exception: orjson writes exponents as 1e16 rather than
+    1e+16, and NaN as null where STRICT_JSON would raise. The API renders
+    no float fields.
+
+    Requests for indented output, non-default JSON settings, a missing
+    orjson or API_FAST_JSON turned off use JSONRenderer itself.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self.can_use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and the like.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape the separators that are valid JSON but not valid
+        # JavaScript, as JSONRenderer does.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+    def can_use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and settings.API_FAST_JSON
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(
+                accepted_media_type, renderer_context or {}) is None
+        )
@@ -0,0 +1,140 @@
+"""
+Routing of reads to read replicas.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Seconds a replica is behind the primary; 0 on a primary, or when the
+# replica has replayed everything it received.
+LAG_SQL = '''
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+'''
+
+UNSET = object()
+
+
+class ReplicaHealth:
+    """Remember for DB_REPLICA_CHECK_INTERVAL seconds if replicas work.
+
+    A replica is healthy when it answers a query and is no more than
+    DB_REPLICA_MAX_LAG seconds behind the primary.
+    """
+
+    def __init__(self):
+        self.checked = {}
+        self.lock = threading.Lock()
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        with self.lock:
+            healthy, expires = self.checked.get(alias, (None, 0.0))
+        if now < expires:
+            return healthy
+        healthy = self.check(alias)
+        with self.lock:
+            self.checked[alias] = (
+                healthy, now + settings.DB_REPLICA_CHECK_INTERVAL)
+        return healthy
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = cursor.fetchone()[0]
+        except DatabaseError:
+            logger.warning('Replica %s is unavailable.', alias, exc_info=True)
+            connection.close()
+            return False
+        if lag is not None and lag > settings.DB_REPLICA_MAX_LAG:
+            logger.warning('Replica %s is %.1fs behind.', alias, lag)
+            return False
+        return True
+
+    def pick(self):
+        """Return a random healthy replica, or None."""
+        healthy = [
+            alias for alias in settings.DB_REPLICAS
+            if self.is_healthy(alias)
+        ]
+        return random.choice(healthy) if healthy else None
+
+    def clear(self):
+        with self.lock:
+            self.checked.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+class ReplicaChoice:
+    """The replica for a block of reads, picked when it first reads."""
+
+    def __init__(self):
+        self.alias = UNSET
+
+    def get(self):
+        if self.alias is UNSET:
+            self.alias = replica_health.pick()
+        return self.alias
+
+
+# Where reads in the current context go: a ReplicaChoice, or None for
+# the primary.
+replica_choice = ContextVar('replica_choice', default=None)
+
+
+@contextmanager
+def routed_to(choice):
+    token = replica_choice.set(choice)
+    try:
+        yield choice
+    finally:
+        replica_choice.reset(token)
+
+
+def use_replica():
+    """Send reads in the block to a healthy replica, or the primary."""
+    return routed_to(ReplicaChoice())
+
+
+def use_primary():
+    """Send reads in the block to the primary."""
+    return routed_to(None)
+
+
+class ReplicaRouter:
+    """Route reads inside use_replica() to its replica.
+
+    Writes, and reads anywhere else or inside a transaction on the
+    primary, go to the primary. Replicas hold the primary's data, so
+    relations between their objects are allowed.
+    """
+
+    def db_for_read(self, model, **hints):
+        choice = replica_choice.get()
+        if choice is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return choice.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DB_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,129 @@
+"""
+Deterministic data generation for benchmarks.
+"""
+import random
+from datetime import date, timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from core.cache import bump_generation
+from core.models import Article, Comment, Tag
+
+SYLLABLES = [
+    'ba', 'co', 'di', 'fe', 'gu', 'ha', 'ki', 'lo', 'me', 'nu', 'pa', 're',
+    'si', 'to', 'vu', 'xe', 'za', 'mor', 'tan', 'vel', 'qui', 'ost', 'ric',
+]
+VOCABULARY = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in 'rnl']
+# Word frequencies follow a Zipf distribution, as in natural text.
+CUM_WEIGHTS = list(accumulate(
+    1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+SCALES = {
+    '1k': {'users': 100, 'tags': 200, 'articles': 1000, 'comments': 2000},
+    '100k': {
+        'users': 5000, 'tags': 10000, 'articles': 100000, 'comments': 200000,
+    },
+    '1m': {
+        'users': 50000,
+        'tags': 100000,
+        'articles': 1000000,
+        'comments': 2000000,
+    },
+}
+FIRST_DATE = date(2000, 1, 1)
+USERNAME = 'bench_user_{}'
+TAG_NAME = 'bench_tag_{}'
+
+
+def text(rng, length):
+    """Return `length` Zipf-distributed words."""
+    words = rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=length)
+    return ' '.join(words)
+
+
+def chunks(total, size):
+    """Yield (start, stop) ranges covering `total` in steps of `size`."""
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+def seed_database(users, tags, articles, comments, seed=0, batch_size=5000,
+                  log=None):
+    """Insert a reproducible dataset of the given size.
+
+    Every batch draws from its own Random(seed, table, batch), so the same
+    arguments always produce the same rows, in memory bounded by
+    `batch_size`.
+    """
+    log = log or (lambda message: None)
+    User = get_user_model()
+
+    def rng(table, batch):
+        return random.Random(f'{seed}:{table}:{batch}')
+
+    log(f'Seeding {users} users...')
+    user_ids = []
+    for start, stop in chunks(users, batch_size):
+        created = User.objects.bulk_create([
+            User(username=USERNAME.format(i), password='!')
+            for i in range(start, stop)
+        ])
+        user_ids += [user.pk for user in created]
+
+    log(f'Seeding {tags} tags...')
+    tag_ids = []
+    for start, stop in chunks(tags, batch_size):
+        created = Tag.objects.bulk_create([
+            Tag(name=TAG_NAME.format(i)) for i in range(start, stop)
+        ])
+        tag_ids += [tag.pk for tag in created]
+
+    log(f'Seeding {articles} articles...')
+    # Popular tags are used far more than the long tail.
+    tag_weights = list(accumulate(
+        1 / rank for rank in range(1, len(tag_ids) + 1)))
+    article_ids = []
+    for batch, (start, stop) in enumerate(chunks(articles, batch_size)):
+        r = rng('article', batch)
+        with transaction.atomic():
+            created = Article.objects.bulk_create([
+                Article(
+                    title=text(r, 8),
+                    abstract=text(r, 40),
+                    main_text=text(r, 300),
+                    publication_date=FIRST_DATE + timedelta(
+                        days=r.randrange(9000)),
+                )
+                for _ in range(start, stop)
+            ])
+            authors, article_tags = [], []
+            for article in created:
+                count = min(len(user_ids), r.randint(1, 3))
+                for user_id in r.sample(user_ids, count):
+                    authors.append(Article.authors.through(
+                        article_id=article.pk, user_id=user_id))
+                for tag_id in set(r.choices(
+                        tag_ids, cum_weights=tag_weights, k=r.randint(1, 5))):
+                    article_tags.append(Article.tags.through(
+                        article_id=article.pk, tag_id=tag_id))
+            Article.authors.through.objects.bulk_create(authors)
+            Article.tags.through.objects.bulk_create(article_tags)
+        article_ids += [article.pk for article in created]
+        log(f'  {stop} articles')
+
+    log(f'Seeding {comments} comments...')
+    for batch, (start, stop) in enumerate(chunks(comments, batch_size)):
+        r = rng('comment', batch)
+        Comment.objects.bulk_create([
+            Comment(
+                author_id=r.choice(user_ids),
+                article_id=r.choice(article_ids),
+                content=text(r, 30),
+            )
+            for _ in range(start, stop)
+        ])
+
+    for model in (Article, Comment, Tag):
+        bump_generation(model)
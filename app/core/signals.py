@@ -0,0 +1,142 @@
+"""
+Signal handlers for the core models.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.authentication import token_cache
+from core.cache import bump_generation
+from core.models import Article, Comment, Tag
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Tag)
+def invalidate_model_cache(sender, **kwargs):
+    """Invalidate cached responses built from the changed model."""
+    bump_generation(sender)
+
+
+@receiver(post_delete, sender=Article)
+def invalidate_article_comments_cache(sender, **kwargs):
+    """Invalidate cached comment pages, which 404 once the article is gone.
+
+    Articles with comments cascade to them, which bumps Comment anyway;
+    this covers articles without any.
+    """
+    bump_generation(Comment)
+
+
+@receiver(m2m_changed, sender=Article.authors.through)
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_article_relations_cache(
+        sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate cached articles when their authors or tags change."""
+    if not action.startswith('post_'):
+        return
+    article_ids = pk_set if reverse else [instance.pk]
+    if article_ids:
+        Article.objects.filter(pk__in=article_ids).update(
+            updated_at=timezone.now())
+    bump_generation(Article)
+
+
+@receiver(pre_delete, sender=get_user_model())
+def touch_authored_articles(sender, instance, **kwargs):
+    """Mark a deleted user's articles as changed.
+
+    The cascade removes their author rows without m2m_changed, and the
+    articles' validators come from updated_at.
+    """
+    Article.objects.filter(authors=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=get_user_model())
+def invalidate_authored_cache(sender, **kwargs):
+    """Invalidate cached articles and comments of a deleted user."""
+    bump_generation(Article)
+    bump_generation(Comment)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance, **kwargs):
+    """Forget the cached user of a changed or deleted token."""
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens_cache(sender, instance, created, **kwargs):
+    """Forget cached snapshots of a changed user.
+
+    Deleted users take their tokens with them, which clears their entries.
+    """
+    if created or not token_cache.enabled:
+        return
+    for key in Token.objects.filter(user=instance).values_list(
+            'key', flat=True):
+        token_cache.delete(key)
+
+
+@receiver(pre_save, sender=get_user_model())
+def note_username_change(sender, instance, update_fields=None, **kwargs):
+    """Remember whether a saved user's username is about to change."""
+    instance._username_changed = False
+    if instance.pk is None or (
+            update_fields is not None and 'username' not in update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list(
+        'username', flat=True).first()
+    instance._username_changed = previous not in (None, instance.username)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_author_labels_cache(sender, instance, **kwargs):
+    """Invalidate cached article facets, which label authors by username."""
+    if getattr(instance, '_username_changed', False):
+        bump_generation(Article)
+
+
+@receiver(request_started)
+def close_broken_connections(sender, **kwargs):
+    """Close kept database connections that no longer work.
+
+    Runs after Django's close_old_connections(), which only drops expired
+    connections and those that raised errors, so a request never starts
+    on a connection the database or a proxy has dropped meanwhile. Only
+    connections idle for DB_CONN_HEALTH_CHECK_AFTER seconds are checked;
+    busy ones were just shown to work by the previous request.
+    """
+    if not settings.DB_CONN_HEALTH_CHECKS:
+        return
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        idle_since = getattr(connection, 'idle_since', None)
+        if idle_since is not None and \
+                now - idle_since < settings.DB_CONN_HEALTH_CHECK_AFTER:
+            continue
+        if not connection.is_usable():
+            connection.close()
+
+
+@receiver(request_finished)
+def mark_connections_idle(sender, **kwargs):
+    """Note when the kept connections were last used."""
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.idle_since = now
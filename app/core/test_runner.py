@@ -0,0 +1,27 @@
+"""
+Test runner for the project.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Run tests with a fast password hasher.
+
+    PBKDF2 at production cost dominates every test that creates a user or
+    logs in. The configured hashers stay listed after MD5, so tests that
+    need them can still verify their hashes or select them explicitly.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.hashers = override_settings(PASSWORD_HASHERS=[
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+            *settings.PASSWORD_HASHERS,
+        ])
+        self.hashers.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.hashers.disable()
+        super().teardown_test_environment(**kwargs)
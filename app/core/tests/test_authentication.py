@@ -0,0 +1,159 @@
+"""
+Tests for cached token authentication.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import exceptions, status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import CachedTokenAuthentication, token_cache
+
+ME_URL = reverse('user:me')
+
+
+def create_token(username='user', **params):
+    user = get_user_model().objects.create_user(
+        username=username, password='testpass123', **params)
+    return Token.objects.create(user=user)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token lookups are cached and invalidated."""
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.auth = CachedTokenAuthentication()
+        self.token = create_token(email='user@example.com')
+
+    def test_cached_token_skips_query(self):
+        """Test a known token authenticates without queries."""
+        with self.assertNumQueries(1):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            cached_user, cached_token = self.auth.authenticate_credentials(
+                self.token.key)
+
+        self.assertEqual(cached_user, user)
+        self.assertEqual(cached_token, token)
+        self.assertEqual(cached_token.user, cached_user)
+        for name in ('username', 'email', 'is_active', 'date_joined'):
+            self.assertEqual(getattr(cached_user, name), getattr(user, name))
+        self.assertTrue(cached_user.check_password('testpass123'))
+
+    def test_invalid_tokens_are_not_cached(self):
+        """Test unknown tokens fail as with TokenAuthentication."""
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                with self.assertRaisesMessage(
+                        exceptions.AuthenticationFailed, 'Invalid token.'):
+                    self.auth.authenticate_credentials('missing')
+
+    def test_deleted_token_is_forgotten(self):
+        """Test deleting a token revokes it at once."""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        self.token.delete()
+
+        with self.assertRaisesMessage(
+                exceptions.AuthenticationFailed, 'Invalid token.'):
+            self.auth.authenticate_credentials(key)
+
+    def test_user_changes_are_seen(self):
+        """Test saving or deleting a user invalidates their tokens."""
+        self.auth.authenticate_credentials(self.token.key)
+        user = self.token.user
+        user.email = 'new@example.com'
+        user.save()
+        cached_user, _ = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(cached_user.email, 'new@example.com')
+
+        user.is_active = False
+        user.save()
+        with self.assertRaisesMessage(
+                exceptions.AuthenticationFailed, 'User inactive or deleted.'):
+            self.auth.authenticate_credentials(self.token.key)
+
+        other = create_token('other')
+        self.auth.authenticate_credentials(other.key)
+        get_user_model().objects.filter(pk=other.user_id).delete()
+        with self.assertRaisesMessage(
+                exceptions.AuthenticationFailed, 'Invalid token.'):
+            self.auth.authenticate_credentials(other.key)
+
+    @override_settings(AUTH_TOKEN_CACHE_SIZE=2)
+    def test_lru_is_bounded(self):
+        """Test the least recently used token is evicted."""
+        tokens = [self.token, create_token('b'), create_token('c')]
+        for token in tokens:
+            self.auth.authenticate_credentials(token.key)
+
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(tokens[2].key)
+        with self.assertNumQueries(1):
+            self.auth.authenticate_credentials(tokens[0].key)
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=0)
+    def test_entries_expire(self):
+        """Test entries older than the TTL are looked up again."""
+        self.auth.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(1):
+            self.auth.authenticate_credentials(self.token.key)
+
+    @override_settings(AUTH_TOKEN_CACHE_ALIAS='default')
+    def test_shared_cache(self):
+        """Test tokens cached by another process are found."""
+        self.addCleanup(cache.clear)
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        token_cache.clear()
+
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(key)
+        self.assertIsNone(cache.get(key))
+
+        self.token.delete()
+        token_cache.clear()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    @override_settings(AUTH_TOKEN_CACHE_SIZE=0, AUTH_TOKEN_CACHE_ALIAS=None)
+    def test_disabled_cache_queries_every_time(self):
+        """Test a disabled cache behaves like TokenAuthentication."""
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.auth.authenticate_credentials(self.token.key)
+
+    def test_update_through_cached_user_keeps_password(self):
+        """Test updating a cached user leaves the password intact."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        client.get(ME_URL)
+
+        res = client.patch(ME_URL, {'email': 'patched@example.com'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user = get_user_model().objects.get(pk=self.token.user_id)
+        self.assertEqual(user.email, 'patched@example.com')
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_update_through_cached_user_keeps_other_columns(self):
+        """Test a stale cached user does not write back old flags."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        client.get(ME_URL)
+        # Changed by another process, whose cache entry was dropped there.
+        get_user_model().objects.filter(pk=self.token.user_id).update(
+            is_staff=True)
+
+        res = client.patch(ME_URL, {'email': 'patched@example.com'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user = get_user_model().objects.get(pk=self.token.user_id)
+        self.assertEqual(user.email, 'patched@example.com')
+        self.assertTrue(user.is_staff)
@@ -2,11 +2,20 @@
 Test custom Django command.
 """
 
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
 from unittest.mock import patch
 from psycopg2 import OperationalError as Psycopg2Error
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase
+
+from core.models import Article, Comment, Tag
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -31,3 +40,319 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class ExplainFiltersCommandTests(TestCase):
+    """Test the explain_filters command."""
+
+    def test_explain_filters_prints_plans(self):
+        """Test a plan is printed for each filter combination."""
+        user = get_user_model().objects.create_user('author', password='pw')
+        tag = Tag.objects.create(name='tag')
+        article = Article.objects.create(
+            title='Title', publication_date=date(2025, 1, 1))
+        article.authors.add(user)
+        article.tags.add(tag)
+        out = StringIO()
+
+        call_command('explain_filters', stdout=out)
+
+        output = out.getvalue()
+        self.assertEqual(output.count('Execution Time'), 7)
+        self.assertIn(f'authors={user.id} & tags={tag.id}', output)
+
+    def test_explain_filters_requires_data(self):
+        """Test the command fails clearly on an empty database."""
+        with self.assertRaises(CommandError):
+            call_command('explain_filters', stdout=StringIO())
+
+
+class ImportArticlesCommandTests(TestCase):
+    """Test the import_articles command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'author', password='pw')
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_import_exported_csv(self):
+        """Test the CSV produced by the download view imports back."""
+        path = self.write('articles.csv', (
+            'ID,Title,Abstract,Publication Date,Authors,Tags\n'
+            '10,First,Abs,2025-01-01,"[\'author\']","[\'a\', \'b\']"\n'
+            '11,Second,Abs,2025-02-01,[],"[\'b\']"\n'
+        ))
+
+        call_command('import_articles', path, stdout=StringIO())
+
+        first = Article.objects.get(pk=10)
+        self.assertEqual(first.title, 'First')
+        self.assertEqual(list(first.authors.all()), [self.user])
+        self.assertEqual(
+            sorted(first.tags.values_list('name', flat=True)), ['a', 'b'])
+        self.assertEqual(Tag.objects.count(), 2)
+        self.assertEqual(first.main_text, 'Full text to be added')
+        new = Article.objects.create(
+            title='New', publication_date=date.today())
+        self.assertEqual(new.pk, 12)
+
+    def test_import_ndjson_in_batches_and_resume(self):
+        """Test NDJSON import, checkpoints and resuming."""
+        lines = [
+            json.dumps({
+                'title': f'Article {i}',
+                'publication_date': '2025-01-01',
+                'authors': ['author', 'newcomer'],
+                'tags': [{'name': 'shared'}],
+            })
+            for i in range(5)
+        ]
+        path = self.write('articles.ndjson', '\n'.join(lines))
+        out = StringIO()
+
+        call_command(
+            'import_articles', path, batch_size=2, create_users=True,
+            stdout=out)
+
+        self.assertIn('5 rows imported', out.getvalue())
+        self.assertEqual(Article.objects.count(), 5)
+        newcomer = get_user_model().objects.get(username='newcomer')
+        self.assertFalse(newcomer.has_usable_password())
+        self.assertEqual(newcomer.articles.count(), 5)
+        with open(f'{path}.checkpoint') as f:
+            self.assertEqual(f.read(), '5')
+
+        self.write('articles.ndjson.checkpoint', '3')
+        call_command('import_articles', path, resume=True, stdout=StringIO())
+        self.assertEqual(Article.objects.count(), 7)
+
+    def test_invalid_record(self):
+        """Test a record without a publication date is rejected."""
+        path = self.write('bad.ndjson', '{"title": "No date"}\n')
+
+        with self.assertRaises(CommandError):
+            call_command('import_articles', path, stdout=StringIO())
+
+    def test_malformed_json_names_line(self):
+        """Test NDJSON that does not parse fails with its line number."""
+        path = self.write('bad.ndjson', (
+            '{"title": "Fine", "publication_date": "2025-01-01"}\n'
+            '\n'
+            '{"title": \n'
+        ))
+
+        with self.assertRaisesMessage(CommandError, 'Line 3: invalid record'):
+            call_command('import_articles', path, stdout=StringIO())
+
+    def test_invalid_date_names_row(self):
+        """Test impossible dates are rejected before reaching COPY."""
+        path = self.write('bad.csv', (
+            'ID,Title,Abstract,Publication Date,Authors,Tags\n'
+            '10,First,Abs,2025-01-01,[],[]\n'
+            '11,Second,Abs,2020-13-45,[],[]\n'
+        ))
+
+        with self.assertRaisesMessage(CommandError, 'Row 2: invalid record'):
+            call_command('import_articles', path, stdout=StringIO())
+
+    def test_failed_batch_leaves_sequence_past_imported_ids(self):
+        """Test batches committed before a failure keep ids consistent."""
+        path = self.write('articles.ndjson', '\n'.join([
+            json.dumps({'id': 50, 'publication_date': '2025-01-01'}),
+            json.dumps({'id': 10 ** 20, 'publication_date': '2025-01-01'}),
+        ]))
+
+        with self.assertRaisesMessage(CommandError, 'Line 2: invalid record'):
+            call_command(
+                'import_articles', path, batch_size=1, stdout=StringIO())
+
+        self.assertTrue(Article.objects.filter(pk=50).exists())
+        new = Article.objects.create(
+            title='New', publication_date=date.today())
+        self.assertEqual(new.pk, 51)
+
+    def test_author_ids_link_users(self):
+        """Test integer authors, as the API renders them, are user ids."""
+        path = self.write('articles.ndjson', json.dumps({
+            'publication_date': '2025-01-01',
+            'authors': [self.user.pk, 'author', 999999],
+        }))
+        out = StringIO()
+
+        call_command(
+            'import_articles', path, create_users=True, stdout=out)
+
+        article = Article.objects.get()
+        self.assertEqual(list(article.authors.all()), [self.user])
+        self.assertFalse(get_user_model().objects.filter(
+            username__in=[str(self.user.pk), '999999']).exists())
+        self.assertIn('Left out 1 unknown authors', out.getvalue())
+        self.assertIn('id 999999', out.getvalue())
+
+    def test_existing_ids_are_skipped(self):
+        """Test rows whose id exists do not touch the existing article."""
+        existing = Article.objects.create(
+            pk=10, title='Existing', publication_date=date.today())
+        path = self.write('articles.csv', (
+            'ID,Title,Abstract,Publication Date,Authors,Tags\n'
+            '10,Clash,Abs,2025-01-01,"[\'author\']","[\'a\']"\n'
+            '11,New,Abs,2025-01-01,"[\'author\']","[\'a\']"\n'
+            '11,Repeat,Abs,2025-01-01,[],"[\'b\']"\n'
+        ))
+        out = StringIO()
+
+        call_command('import_articles', path, stdout=out)
+
+        self.assertIn('Skipped 2 rows whose id already exists: 10, 11.',
+                      out.getvalue())
+        existing.refresh_from_db()
+        self.assertEqual(existing.title, 'Existing')
+        self.assertFalse(existing.authors.exists())
+        self.assertFalse(existing.tags.exists())
+        new = Article.objects.get(pk=11)
+        self.assertEqual(new.title, 'New')
+        self.assertEqual(list(new.tags.values_list('name', flat=True)), ['a'])
+
+    def test_unknown_authors_are_reported(self):
+        """Test authors without a user are listed when not created."""
+        path = self.write('articles.ndjson', json.dumps({
+            'publication_date': '2025-01-01',
+            'authors': ['author', 'ghost', 'phantom'],
+        }))
+        out = StringIO()
+
+        call_command('import_articles', path, stdout=out)
+
+        self.assertIn('Left out 2 unknown authors', out.getvalue())
+        self.assertIn('ghost, phantom.', out.getvalue())
+        article = Article.objects.get()
+        self.assertEqual(list(article.authors.all()), [self.user])
+
+
+class RecountArticlesCommandTests(TestCase):
+    """Test the counter repair command."""
+
+    def test_recount_repairs_drift(self):
+        """Test drifted counters are recomputed and others left alone."""
+        user = get_user_model().objects.create_user('u', password='pw')
+        drifted, correct = [
+            Article.objects.create(title=t, publication_date=date.today())
+            for t in ('drifted', 'correct')
+        ]
+        Comment.objects.create(author=user, article=drifted, content='c')
+        drifted.tags.add(Tag.objects.create(name='t'))
+        Article.objects.filter(pk=drifted.pk).update(
+            comment_count=7, tag_count=-1)
+        Tag.objects.update(article_count=5)
+
+        out = StringIO()
+        call_command('recount_articles', batch_size=1, stdout=out)
+
+        drifted.refresh_from_db()
+        correct.refresh_from_db()
+        self.assertEqual((drifted.comment_count, drifted.tag_count), (1, 1))
+        self.assertEqual((correct.comment_count, correct.tag_count), (0, 0))
+        self.assertEqual(Tag.objects.get().article_count, 1)
+        self.assertIn(
+            'Repaired the counters of 1 articles and 1 tags.',
+            out.getvalue())
+
+
+class BenchmarkCommandTests(TestCase):
+    """Test the seed_data and benchmark_api commands."""
+
+    sizes = {'users': 3, 'tags': 4, 'articles': 10, 'comments': 5}
+
+    def test_seed_data_is_deterministic(self):
+        """Test seeding twice with one seed produces the same rows."""
+        call_command('seed_data', stdout=StringIO(), **self.sizes)
+        titles = list(Article.objects.values_list('title', flat=True))
+
+        self.assertEqual(len(titles), 10)
+        self.assertEqual(Comment.objects.count(), 5)
+        with self.assertRaises(CommandError):
+            call_command('seed_data', stdout=StringIO(), **self.sizes)
+
+        Article.objects.all().delete()
+        Tag.objects.all().delete()
+        get_user_model().objects.all().delete()
+        call_command('seed_data', stdout=StringIO(), **self.sizes)
+        self.assertEqual(
+            list(Article.objects.values_list('title', flat=True)), titles)
+
+    def test_benchmark_api_writes_results_and_compares(self):
+        """Test results are recorded and regressions detected."""
+        call_command('seed_data', stdout=StringIO(), **self.sizes)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        output = os.path.join(tmpdir.name, 'results.json')
+
+        call_command(
+            'benchmark_api', iterations=2, warmup=0, output=output,
+            stdout=StringIO())
+
+        with open(output) as f:
+            results = json.load(f)
+        self.assertEqual(results['meta']['rows']['articles'], 10)
+        detail = results['scenarios']['article_detail']
+        self.assertEqual(detail['status'], 200)
+        self.assertGreater(detail['queries'], 0)
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'peak_memory_kib'):
+            self.assertIn(key, detail)
+
+        for result in results['scenarios'].values():
+            result['queries'] = 0
+        with open(output, 'w') as f:
+            json.dump(results, f)
+        with self.assertRaises(CommandError):
+            call_command(
+                'benchmark_api', iterations=2, warmup=0,
+                output=os.path.join(tmpdir.name, 'new.json'),
+                baseline=output, fail_on_regression=True,
+                stdout=StringIO())
+
+    def test_benchmark_render_compares_renderers(self):
+        """Test both renderers are timed and produce the same output."""
+        call_command('seed_data', stdout=StringIO(), **self.sizes)
+        out = StringIO()
+
+        call_command(
+            'benchmark_render', page_size=4, pages=2, iterations=2,
+            stdout=out)
+
+        self.assertIn('JSONRenderer', out.getvalue())
+        self.assertIn('FastJSONRenderer', out.getvalue())
+        self.assertIn('Speedup', out.getvalue())
+        self.assertNotIn('differs', out.getvalue())
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    """Test the load_test command."""
+
+    def test_load_test_reports_throughput(self):
+        """Test requests are sent for the duration and summarised."""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        output = os.path.join(tmpdir.name, 'load.json')
+
+        call_command(
+            'load_test', url=self.live_server_url, paths=['/health/live/'],
+            concurrency=2, duration=0.5, output=output, stdout=StringIO())
+
+        with open(output) as f:
+            result = json.load(f)
+        self.assertGreater(result['requests'], 0)
+        self.assertEqual(result['statuses'], {'200': result['requests']})
+        self.assertEqual(result['errors'], {})
+
+    def test_load_test_rejects_invalid_url(self):
+        """Test an URL without a scheme is refused."""
+        with self.assertRaises(CommandError):
+            call_command('load_test', url='localhost:8000', stdout=StringIO())
@@ -0,0 +1,33 @@
+"""
+Tests for ranged file responses.
+"""
+from django.test import SimpleTestCase
+
+from core.downloads import RangeNotSatisfiable, parse_range
+
+
+class ParseRangeTests(SimpleTestCase):
+    """Test Range headers are parsed as RFC 7233 describes."""
+
+    def test_satisfiable_ranges(self):
+        """Test closed, open and suffix ranges are clamped to the file."""
+        self.assertEqual(parse_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range('bytes=90-200', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=10-', 100), (10, 99))
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-500', 100), (0, 99))
+
+    def test_ignored_ranges(self):
+        """Test missing, malformed and multiple ranges send the file."""
+        for header in [None, '', 'bytes=9-0', 'items=0-9', 'bytes=-',
+                       'bytes=0-1,5-9']:
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 100))
+
+    def test_unsatisfiable_ranges(self):
+        """Test ranges past the end of the file are rejected."""
+        for header, size in [('bytes=100-', 100), ('bytes=-0', 100),
+                             ('bytes=0-', 0), ('bytes=-5', 0)]:
+            with self.subTest(header=header, size=size):
+                with self.assertRaises(RangeNotSatisfiable):
+                    parse_range(header, size)
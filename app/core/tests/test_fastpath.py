@@ -0,0 +1,84 @@
+"""
+Tests for the compiled list serializers.
+"""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from article.serializers import ArticleSerializer
+from core.fastpath import compile_serializer
+from core.models import Article, Comment, Tag
+
+
+class FastPathParityTests(TestCase):
+    """Test compiled lists render exactly what the serializers render."""
+
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+        users = [User.objects.create_user(f'user{i}') for i in range(3)]
+        tags = [Tag.objects.create(name=f'tag {i}') for i in range(3)]
+        for i in range(5):
+            article = Article.objects.create(
+                title=f'Article {i}',
+                abstract='Sample abstract' if i % 2 else '',
+                main_text=f'Body {i}',
+                publication_date=date(2020, 1, 5 - i),
+            )
+            # Related rows are added out of key order on purpose.
+            article.authors.add(*reversed(users[:i % 3 + 1]))
+            article.tags.add(*reversed(tags[:i % 4]))
+            Comment.objects.create(
+                author=users[i % 3], article=article, content=f'Note {i}')
+        Comment.objects.create(author=users[0], content='Orphan')
+        self.article = article
+
+    def assertSameResponse(self, url, params=None):
+        with override_settings(API_FAST_SERIALIZERS=False):
+            expected = self.client.get(url, params)
+        res = self.client.get(url, params)
+
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content, expected.content)
+        self.assertEqual(res.get('ETag'), expected.get('ETag'))
+
+    def test_article_list(self):
+        """Test article pages match across fields, filters and cursors."""
+        url = reverse('article:article-list')
+        for params in [
+            {},
+            {'cursor': ''},
+            {'count': 'false', 'ordering': '-tag_count'},
+            {'fields': 'id,main_text,authors'},
+            {'omit': 'tags', 'search': 'article'},
+            {'tags': Tag.objects.first().pk, 'facets': 'tags,year'},
+        ]:
+            with self.subTest(params=params):
+                self.assertSameResponse(url, params)
+
+    def test_comment_and_tag_lists(self):
+        """Test comment and tag pages match."""
+        self.assertSameResponse(reverse('comment:comment-list'))
+        self.assertSameResponse(
+            reverse('comment:comment-list'), {'article': self.article.pk})
+        self.assertSameResponse(
+            reverse('article:article-comments', args=[self.article.pk]))
+        self.assertSameResponse(reverse('tag:tag-list'))
+
+    def test_unsupported_serializer_is_not_compiled(self):
+        """Test serializers with computed fields keep the regular path."""
+        class Computed(ArticleSerializer):
+            summary = serializers.SerializerMethodField()
+
+            class Meta(ArticleSerializer.Meta):
+                fields = ArticleSerializer.Meta.fields + ['summary']
+
+            def get_summary(self, obj):
+                return obj.abstract[:10]
+
+        self.assertIsNone(compile_serializer(Computed(), Article))
+        self.assertIsNotNone(compile_serializer(ArticleSerializer(), Article))
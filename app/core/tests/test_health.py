@@ -0,0 +1,101 @@
+"""
+Tests for the health check endpoints and kept connection checks.
+"""
+from unittest.mock import Mock, patch
+
+from django.db import OperationalError, connection, connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.signals import close_broken_connections, mark_connections_idle
+
+LIVE_URL = reverse('health-live')
+READY_URL = reverse('health-ready')
+
+
+class HealthCheckTests(TestCase):
+    """Test the health check endpoints."""
+    databases = '__all__'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_live(self):
+        """Test the liveness check answers without queries."""
+        with self.assertNumQueries(0):
+            res = self.client.get(LIVE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'status': 'ok'})
+
+    def test_ready(self):
+        """Test the readiness check queries the database."""
+        res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['status'], 'ok')
+        self.assertEqual(res.json()['databases']['default'], 'ok')
+
+    def test_ready_database_unavailable(self):
+        """Test the readiness check fails when the database does."""
+        with patch.object(connection, 'cursor', side_effect=OperationalError):
+            with self.assertLogs('core.views', 'ERROR'):
+                res = self.client.get(READY_URL)
+
+        self.assertEqual(
+            res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res.json()['status'], 'unavailable')
+        self.assertEqual(res.json()['databases']['default'], 'unavailable')
+
+    def test_ready_reports_pool_stats(self):
+        """Test pooled databases report their pool's metrics."""
+        pool = Mock(**{'stats.return_value': {'in_use': 1, 'idle': 2}})
+        with patch.object(connections['default'], 'pool', pool, create=True):
+            res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json()['pools']['default'], {'in_use': 1, 'idle': 2})
+
+
+@override_settings(DB_CONN_HEALTH_CHECK_AFTER=0)
+@patch.object(connection, 'close')
+class CloseBrokenConnectionsTests(TestCase):
+    """Test kept connections are checked when a request starts."""
+
+    def setUp(self):
+        self.addCleanup(vars(connections['default']).pop, 'idle_since', None)
+
+    def test_usable_connection_is_kept(self, patched_close):
+        """Test a working connection is left open."""
+        close_broken_connections(sender=None)
+
+        patched_close.assert_not_called()
+
+    def test_broken_connection_is_closed(self, patched_close):
+        """Test a connection failing the check is closed."""
+        mark_connections_idle(sender=None)
+        with patch.object(connection, 'is_usable', return_value=False):
+            close_broken_connections(sender=None)
+
+        patched_close.assert_called_once_with()
+
+    @override_settings(DB_CONN_HEALTH_CHECK_AFTER=60)
+    def test_recently_used_connection_is_not_checked(self, patched_close):
+        """Test connections used within the threshold skip the check."""
+        mark_connections_idle(sender=None)
+        with patch.object(connection, 'is_usable') as patched_usable:
+            close_broken_connections(sender=None)
+
+        patched_usable.assert_not_called()
+
+    @override_settings(DB_CONN_HEALTH_CHECKS=False)
+    def test_checks_disabled(self, patched_close):
+        """Test nothing is checked when health checks are off."""
+        with patch.object(connection, 'is_usable') as patched_usable:
+            close_broken_connections(sender=None)
+
+        patched_usable.assert_not_called()
+        patched_close.assert_not_called()
@@ -0,0 +1,66 @@
+"""
+Tests for the request timing middleware.
+"""
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.middleware import fingerprint
+
+TAG_LIST_URL = reverse('tag:tag-list')
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    """Test Server-Timing headers and timing logs."""
+
+    def test_disabled_by_default(self):
+        """Test no header is added when the setting is off."""
+        with override_settings(REQUEST_TIMING_ENABLED=False):
+            res = APIClient().get(TAG_LIST_URL)
+
+        self.assertFalse(res.has_header('Server-Timing'))
+
+    @override_settings(REQUEST_TIMING_ENABLED=True)
+    def test_server_timing_header_and_log(self):
+        """Test sampled requests report their timings."""
+        with self.assertLogs('core.timing', level='INFO') as logs:
+            res = APIClient().get(TAG_LIST_URL)
+
+        header = res['Server-Timing']
+        for metric in ('db;dur=', 'serialize;dur=', 'render;dur=',
+                       'total;dur='):
+            self.assertIn(metric, header)
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry['path'], TAG_LIST_URL)
+        self.assertEqual(entry['status'], 200)
+        self.assertEqual(entry['queries'], 1)
+        self.assertNotIn('duplicate_queries', entry)
+
+    @override_settings(
+        REQUEST_TIMING_ENABLED=True,
+        REQUEST_TIMING_DUPLICATE_THRESHOLD=1)
+    def test_duplicate_queries_flagged(self):
+        """Test repeated statements are logged as a warning."""
+        with self.assertLogs('core.timing', level='WARNING') as logs:
+            APIClient().get(TAG_LIST_URL)
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(list(entry['duplicate_queries'].values()), [1])
+
+    @override_settings(
+        REQUEST_TIMING_ENABLED=True,
+        REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_untouched(self):
+        """Test requests outside the sample are not instrumented."""
+        res = APIClient().get(TAG_LIST_URL)
+
+        self.assertFalse(res.has_header('Server-Timing'))
+
+    def test_fingerprint(self):
+        """Test literals and IN lists are normalized."""
+        self.assertEqual(
+            fingerprint('SELECT 1 FROM t WHERE a IN (%s, %s) AND b = \'x\''),
+            fingerprint('SELECT 2 FROM t WHERE a IN (%s) AND b = \'y\''),
+        )
@@ -3,6 +3,7 @@ Tests for models.
 """
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from core.models import Article, Tag, Comment
 from datetime import date
 
@@ -148,3 +149,78 @@ class CommentModelTest(TestCase):
             author=user
         )
         self.assertEqual(str(comment), 'this is a string!')
+
+
+class ArticleQuerySetTest(TestCase):
+    """Test for the article queryset."""
+    def test_editable_by(self):
+        """Test only the authors' articles are editable."""
+        user = get_user_model().objects.create_user('author', password='pw')
+        other = get_user_model().objects.create_user('other', password='pw')
+        article = Article.objects.create(
+            title='Mine', publication_date=date.today())
+        article.authors.set([user])
+        Article.objects.create(title='Theirs', publication_date=date.today())
+
+        self.assertEqual(list(Article.objects.editable_by(user)), [article])
+        self.assertFalse(Article.objects.editable_by(other).exists())
+        self.assertFalse(
+            Article.objects.editable_by(AnonymousUser()).exists())
+
+
+class ArticleCounterTests(TestCase):
+    """Test for the trigger-maintained article counters."""
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('u', password='pw')
+        self.article = Article.objects.create(
+            title='Counted', publication_date=date.today())
+
+    def counters(self, article):
+        article.refresh_from_db()
+        return article.comment_count, article.tag_count
+
+    def test_comment_count(self):
+        """Test comments are counted on insert, move and delete."""
+        other = Article.objects.create(
+            title='Other', publication_date=date.today())
+        Comment.objects.bulk_create([
+            Comment(author=self.user, article=self.article, content='c')
+            for _ in range(3)
+        ])
+        self.assertEqual(self.counters(self.article), (3, 0))
+
+        comment = Comment.objects.filter(article=self.article).first()
+        comment.article = other
+        comment.save()
+        self.assertEqual(self.counters(self.article), (2, 0))
+        self.assertEqual(self.counters(other), (1, 0))
+
+        Comment.objects.filter(article=self.article).delete()
+        self.assertEqual(self.counters(self.article), (0, 0))
+
+    def test_tag_count(self):
+        """Test tags are counted when the relation changes."""
+        tags = [Tag.objects.create(name=f'tag{i}') for i in range(3)]
+        self.article.tags.set(tags)
+        self.assertEqual(self.counters(self.article), (0, 3))
+
+        self.article.tags.remove(tags[0])
+        self.assertEqual(self.counters(self.article), (0, 2))
+        self.assertEqual(
+            list(Tag.objects.values_list('article_count', flat=True)),
+            [0, 1, 1])
+
+        self.article.tags.clear()
+        self.assertEqual(self.counters(self.article), (0, 0))
+
+    def test_save_keeps_counters(self):
+        """Test saving a stale instance does not overwrite the counters."""
+        stale = Article.objects.get(pk=self.article.pk)
+        Comment.objects.create(
+            author=self.user, article=self.article, content='c')
+
+        stale.title = 'Renamed'
+        stale.save()
+
+        self.assertEqual(self.counters(self.article), (1, 0))
+        self.assertEqual(self.article.title, 'Renamed')
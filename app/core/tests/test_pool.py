@@ -0,0 +1,281 @@
+"""
+Tests for the connection pool and the pooled database backend.
+"""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import psycopg2
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection, connections
+from django.test import SimpleTestCase
+from psycopg2 import extensions
+
+from core.backends.pooled.base import DatabaseWrapper
+from core.pool import ConnectionPool, PoolTimeout, close_pools, get_pool
+
+
+class FakeConnection:
+    """Enough of a psycopg2 connection for the pool."""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.info = SimpleNamespace(
+            transaction_status=extensions.TRANSACTION_STATUS_IDLE)
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.broken:
+            raise psycopg2.OperationalError('server closed the connection')
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql):
+        if self.conn.broken:
+            raise psycopg2.OperationalError('server closed the connection')
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the pool without a database."""
+
+    def setUp(self):
+        self.opened = []
+
+    def connect(self):
+        conn = FakeConnection()
+        self.opened.append(conn)
+        return conn
+
+    def test_connections_are_reused(self):
+        """Test a returned connection is handed out again."""
+        pool = ConnectionPool(max_size=2)
+        first = pool.checkout(self.connect)
+        second = pool.checkout(self.connect)
+        pool.release(first)
+
+        self.assertIs(pool.checkout(self.connect), first)
+        self.assertEqual(len(self.opened), 2)
+        stats = pool.stats()
+        self.assertEqual(stats['in_use'], 2)
+        self.assertEqual(stats['idle'], 0)
+        self.assertEqual(stats['checkouts'], 3)
+        self.assertEqual(stats['connections_opened'], 2)
+        pool.release(second)
+        self.assertEqual(pool.stats()['idle'], 1)
+
+    def test_checkout_times_out(self):
+        """Test a full pool raises PoolTimeout after the timeout."""
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.checkout(self.connect)
+
+        with self.assertLogs('core.pool', 'WARNING'):
+            with self.assertRaises(PoolTimeout):
+                pool.checkout(self.connect)
+
+        self.assertEqual(pool.stats()['timeouts'], 1)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_waiting_checkout_gets_returned_connection(self):
+        """Test a checkout waits for a connection to be returned."""
+        pool = ConnectionPool(max_size=1, timeout=5)
+        conn = pool.checkout(self.connect)
+        timer = threading.Timer(0.05, pool.release, args=(conn,))
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertIs(pool.checkout(self.connect), conn)
+        self.assertGreater(pool.stats()['wait_ms_max'], 0)
+
+    def test_open_transactions_are_rolled_back(self):
+        """Test connections come back without a transaction."""
+        pool = ConnectionPool(max_size=1)
+        conn = pool.checkout(self.connect)
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_INERROR
+
+        pool.release(conn)
+
+        self.assertEqual(
+            conn.info.transaction_status,
+            extensions.TRANSACTION_STATUS_IDLE)
+        self.assertIs(pool.checkout(self.connect), conn)
+
+    def test_broken_connections_are_discarded(self):
+        """Test closed or failing connections are not reused."""
+        pool = ConnectionPool(max_size=1, check_after=0)
+        conn = pool.checkout(self.connect)
+        conn.closed = 2
+        pool.release(conn)
+
+        conn = pool.checkout(self.connect)
+        self.assertEqual(len(self.opened), 2)
+        pool.release(conn)
+        conn.broken = True
+
+        self.assertIsNot(pool.checkout(self.connect), conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['connections_closed'], 2)
+
+    def test_release_after_error_pings(self):
+        """Test a connection that saw an error is checked on release."""
+        pool = ConnectionPool(max_size=1)
+        conn = pool.checkout(self.connect)
+        conn.broken = True
+
+        pool.release(conn, check=True)
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_old_connections_are_replaced(self):
+        """Test connections past max_lifetime are closed, not reused."""
+        pool = ConnectionPool(max_size=1, max_lifetime=60)
+        conn = pool.checkout(self.connect)
+        pool.release(conn)
+
+        with patch('core.pool.time.monotonic',
+                   return_value=time.monotonic() + 61):
+            self.assertIsNot(pool.checkout(self.connect), conn)
+        self.assertTrue(conn.closed)
+
+    def test_idle_connections_are_closed(self):
+        """Test connections idle for max_idle are closed."""
+        pool = ConnectionPool(max_size=2, max_idle=30)
+        first = pool.checkout(self.connect)
+        second = pool.checkout(self.connect)
+        now = time.monotonic()
+        pool.release(first)
+
+        with patch('core.pool.time.monotonic') as monotonic:
+            monotonic.return_value = now + 20
+            pool.release(second)
+            monotonic.return_value = now + 40
+            self.assertIs(pool.checkout(self.connect), second)
+
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_failed_connect_frees_its_slot(self):
+        """Test a connection error does not shrink the pool."""
+        pool = ConnectionPool(max_size=1, timeout=0)
+
+        def fail():
+            raise psycopg2.OperationalError('could not connect')
+
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.checkout(fail)
+        pool.checkout(self.connect)
+
+    def test_pools_are_per_process(self):
+        """Test a forked process gets a new pool."""
+        params = {'database': 'db'}
+        pool = get_pool('pool-test', params, {})
+        self.assertIs(get_pool('pool-test', params, {}), pool)
+        self.assertIsNot(get_pool('pool-test', {'database': 'x'}, {}), pool)
+
+        with patch('core.pool.os.getpid', return_value=-1):
+            self.assertIsNot(get_pool('pool-test', params, {}), pool)
+
+
+class PooledBackendTests(SimpleTestCase):
+    """Test the pooled backend against the test database.
+
+    The wrappers made here use their own connections and only read, so
+    they need no test transaction.
+    """
+
+    def setUp(self):
+        self.wrappers = []
+        self.addCleanup(self.close_wrappers)
+
+    def close_wrappers(self):
+        for wrapper in self.wrappers:
+            wrapper.close()
+        if self.wrappers:
+            del connections[self.id()]
+        close_pools(self.id())
+
+    def make_wrapper(self, **pool):
+        settings_dict = {
+            **connection.settings_dict,
+            'ENGINE': 'core.backends.pooled',
+            'POOL': pool,
+        }
+        wrapper = DatabaseWrapper(settings_dict, alias=self.id())
+        self.wrappers.append(wrapper)
+        # django.contrib.postgres looks new connections up by alias.
+        connections[self.id()] = wrapper
+        return wrapper
+
+    def query(self, wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            return cursor.fetchone()[0]
+
+    def test_session_mode_keeps_connection_until_closed(self):
+        """Test a connection is held until Django closes it."""
+        wrapper = self.make_wrapper()
+        self.query(wrapper)
+        self.query(wrapper)
+        conn = wrapper.connection
+        self.assertEqual(wrapper.pool.stats()['in_use'], 1)
+
+        wrapper.close_if_unusable_or_obsolete()
+
+        self.assertIsNone(wrapper.connection)
+        other = self.make_wrapper()
+        self.assertEqual(self.query(other), 1)
+        self.assertIs(other.connection, conn)
+        self.assertEqual(other.pool.stats()['connections_opened'], 1)
+
+    def test_transaction_mode_releases_between_transactions(self):
+        """Test a connection is returned after each transaction."""
+        wrapper = self.make_wrapper(MODE='transaction')
+        self.assertEqual(self.query(wrapper), 1)
+        self.assertIsNone(wrapper.connection)
+
+        wrapper.set_autocommit(False)
+        self.query(wrapper)
+        self.query(wrapper)
+        self.assertIsNotNone(wrapper.connection)
+        wrapper.commit()
+        wrapper.set_autocommit(True)
+
+        self.assertIsNone(wrapper.connection)
+        stats = wrapper.pool.stats()
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['idle'], 1)
+
+    def test_checkout_timeout(self):
+        """Test a full pool fails the query with OperationalError."""
+        holder = self.make_wrapper(MAX_SIZE=1, TIMEOUT=0.01)
+        self.query(holder)
+        wrapper = self.make_wrapper(MAX_SIZE=1, TIMEOUT=0.01)
+
+        with self.assertLogs('core.pool', 'WARNING'):
+            with self.assertRaises(OperationalError):
+                self.query(wrapper)
+
+    def test_invalid_options(self):
+        """Test unknown pool options and modes are refused."""
+        with self.assertRaises(ImproperlyConfigured):
+            self.make_wrapper(SIZE=3)
+        with self.assertRaises(ImproperlyConfigured):
+            self.make_wrapper(MODE='statement')
@@ -0,0 +1,76 @@
+"""
+Tests for the JSON renderer.
+"""
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from core import renderers
+from core.renderers import FastJSONRenderer
+
+SAMPLE = ReturnDict({
+    'id': 2**40,
+    'title': 'Ελληνικά & unicode \u2028 line \u2029 separators',
+    'published': date(2021, 6, 1),
+    'updated_at': datetime(2021, 6, 1, 12, 30, 5, 120, tzinfo=timezone.utc),
+    'naive': datetime(2021, 6, 1, 12, 30),
+    'offset': datetime(
+        2021, 6, 1, tzinfo=timezone(timedelta(hours=3))),
+    'at': time(8, 15),
+    'duration': timedelta(minutes=90),
+    'price': Decimal('12.50'),
+    'label': gettext_lazy('Articles'),
+    'uuid': uuid.UUID(int=7),
+    'tags': (1, 2, 3),
+    'empty': None,
+    'flags': [True, False],
+    'nested': [OrderedDict(name='tag', count=3)],
+    'facets': {2021: 4},
+}, serializer=None)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test FastJSONRenderer matches JSONRenderer."""
+
+    def assertSameRender(self, data, *args):
+        self.assertEqual(
+            FastJSONRenderer().render(data, *args),
+            JSONRenderer().render(data, *args))
+
+    def test_matches_json_renderer(self):
+        """Test dates, decimals, lazy strings and unicode render the same."""
+        self.assertSameRender(SAMPLE)
+        self.assertSameRender([SAMPLE, {}, []])
+        self.assertSameRender(None)
+
+    def test_uses_orjson_when_installed(self):
+        """Test compact responses are encoded by orjson."""
+        if renderers.orjson is None:
+            self.skipTest('orjson is not installed.')
+        with patch.object(
+                renderers.orjson, 'dumps',
+                wraps=renderers.orjson.dumps) as dumps:
+            FastJSONRenderer().render(SAMPLE)
+        dumps.assert_called_once()
+
+    def test_falls_back_to_json_renderer(self):
+        """Test indented, disabled and unsupported renders fall back."""
+        self.assertSameRender(SAMPLE, 'application/json; indent=4')
+        self.assertSameRender(SAMPLE, None, {'indent': 2})
+        self.assertSameRender({'big': 2**70})
+        with override_settings(API_FAST_JSON=False):
+            self.assertSameRender(SAMPLE)
+        with patch.object(renderers, 'orjson', None):
+            self.assertSameRender(SAMPLE)
+
+    def test_unsupported_values_raise(self):
+        """Test values neither encoder handles raise TypeError."""
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'value': object()})
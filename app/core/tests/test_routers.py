@@ -0,0 +1,143 @@
+"""
+Tests for read replica routing.
+"""
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, override_settings)
+
+from core.middleware import ReplicaRoutingMiddleware
+from core.models import Article
+from core.routers import (
+    ReplicaHealth, ReplicaRouter, replica_health, use_primary, use_replica)
+
+router = ReplicaRouter()
+
+
+def read_db():
+    return router.db_for_read(Article)
+
+
+@override_settings(
+    DB_REPLICAS=['replica_1'], DB_REPLICA_PIN_SECONDS=5,
+    DB_REPLICA_CHECK_INTERVAL=5)
+@patch.object(ReplicaHealth, 'check', return_value=True)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Test reads of safe requests go to replicas."""
+
+    def setUp(self):
+        cache.clear()
+        replica_health.clear()
+        self.addCleanup(replica_health.clear)
+        self.factory = RequestFactory()
+        self.seen = []
+
+    def get_response(self, request):
+        self.seen.append(read_db())
+        return HttpResponse()
+
+    def call(self, method, **extra):
+        middleware = ReplicaRoutingMiddleware(self.get_response)
+        request = getattr(self.factory, method)('/api/article/', **extra)
+        return middleware(request)
+
+    def test_router(self, patched_check):
+        """Test only reads in use_replica() leave the primary."""
+        self.assertEqual(read_db(), 'default')
+        with use_replica():
+            self.assertEqual(read_db(), 'replica_1')
+            self.assertEqual(router.db_for_write(Article), 'default')
+            with use_primary():
+                self.assertEqual(read_db(), 'default')
+        self.assertEqual(read_db(), 'default')
+
+    def test_safe_requests_read_replicas(self, patched_check):
+        """Test GET requests read from a replica and writes do not."""
+        self.call('get')
+        self.call('post')
+
+        self.assertEqual(self.seen, ['replica_1', 'default'])
+
+    def test_writers_are_pinned_to_primary(self, patched_check):
+        """Test a client reads its own writes from the primary."""
+        self.call('post', REMOTE_ADDR='10.0.0.1')
+        self.call('get', REMOTE_ADDR='10.0.0.1', HTTP_AUTHORIZATION='Token a')
+        self.call('post', REMOTE_ADDR='10.0.0.2', HTTP_AUTHORIZATION='Token b')
+        self.call('get', REMOTE_ADDR='10.0.0.3', HTTP_AUTHORIZATION='Token b')
+        self.call('get', REMOTE_ADDR='10.0.0.3', HTTP_AUTHORIZATION='Token c')
+
+        self.assertEqual(
+            self.seen, ['default', 'default', 'default', 'default',
+                        'replica_1'])
+
+    @override_settings(DB_REPLICA_PIN_SECONDS=0.001)
+    def test_pins_expire(self, patched_check):
+        """Test pinned clients go back to replicas after the window."""
+        self.call('delete', REMOTE_ADDR='10.0.0.1')
+        time.sleep(0.01)
+        self.call('get', REMOTE_ADDR='10.0.0.1')
+
+        self.assertEqual(self.seen, ['default', 'replica_1'])
+
+    def test_unhealthy_replicas_fall_back(self, patched_check):
+        """Test reads go to the primary while replicas fail checks."""
+        patched_check.return_value = False
+        self.call('get')
+        self.call('get')
+
+        self.assertEqual(self.seen, ['default', 'default'])
+        patched_check.assert_called_once_with('replica_1')
+
+    def test_replica_picked_on_first_read(self, patched_check):
+        """Test requests that do not read skip the health check."""
+        self.get_response = lambda request: HttpResponse()
+        self.call('get')
+
+        patched_check.assert_not_called()
+
+    def test_streamed_bodies_read_replicas(self, patched_check):
+        """Test streamed content is produced on the request's replica."""
+        def get_response(request):
+            return StreamingHttpResponse(
+                read_db().encode() for _ in range(2))
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        response = middleware(self.factory.get('/api/article/download/'))
+
+        self.assertEqual(b''.join(response), b'replica_1replica_1')
+        self.assertEqual(read_db(), 'default')
+
+    def test_relations_across_replicas(self, patched_check):
+        """Test objects from replicas and the primary can be related."""
+        replica, primary = Article(), Article()
+        replica._state.db, primary._state.db = 'replica_1', 'default'
+
+        self.assertTrue(router.allow_relation(replica, primary))
+
+
+class ReplicaHealthTests(TestCase):
+    """Test replica health checks."""
+
+    def test_primary_has_no_lag(self):
+        """Test a database that is not in recovery is healthy."""
+        self.assertTrue(ReplicaHealth().check('default'))
+
+    @override_settings(DB_REPLICA_MAX_LAG=-1)
+    def test_lagging_replica(self):
+        """Test replicas too far behind are unhealthy."""
+        with self.assertLogs('core.routers', 'WARNING'):
+            self.assertFalse(ReplicaHealth().check('default'))
+
+    def test_failing_replica(self):
+        """Test replicas that fail the query are unhealthy."""
+        with patch.object(connection, 'close') as patched_close:
+            with patch.object(
+                    connection, 'cursor', side_effect=OperationalError):
+                with self.assertLogs('core.routers', 'WARNING'):
+                    self.assertFalse(ReplicaHealth().check('default'))
+
+        patched_close.assert_called_once_with()
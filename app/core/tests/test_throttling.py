@@ -0,0 +1,85 @@
+"""
+Tests for the token bucket throttles.
+"""
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from core.throttling import PasswordHashThrottle, TokenBucketThrottle
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        'DEFAULT_THROTTLE_RATES': rates})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    """Test buckets allow bursts and refill over time."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.clock = Clock()
+        self.factory = APIRequestFactory()
+
+    def make_throttle(self, cls=TokenBucketThrottle, scope='test'):
+        throttle = cls()
+        throttle.timer = self.clock
+        if scope:
+            throttle.scope = scope
+        return throttle
+
+    def request(self, throttle, ip='10.0.0.1'):
+        return throttle.allow_request(
+            self.factory.post('/', REMOTE_ADDR=ip), None)
+
+    @throttle_rates(test='3/min')
+    def test_burst_then_refill(self):
+        """Test a burst uses the bucket and tokens refill at the rate."""
+        throttle = self.make_throttle()
+        self.assertEqual(
+            [self.request(throttle) for _ in range(4)],
+            [True, True, True, False])
+        self.assertAlmostEqual(throttle.wait(), 20)
+        self.assertTrue(self.request(throttle, ip='10.0.0.2'))
+
+        self.clock.now += 19
+        self.assertFalse(self.request(throttle))
+        self.clock.now += 1
+        self.assertTrue(self.request(throttle))
+        self.assertFalse(self.request(throttle))
+
+        self.clock.now += 3600
+        self.assertEqual(
+            [self.request(throttle) for _ in range(4)],
+            [True, True, True, False])
+
+    def test_missing_and_invalid_rates(self):
+        """Test scopes without a rate are unlimited; bad rates raise."""
+        throttle = self.make_throttle()
+        with throttle_rates():
+            self.assertTrue(all(self.request(throttle) for _ in range(50)))
+        with throttle_rates(test='lots'):
+            with self.assertRaises(ImproperlyConfigured):
+                self.request(throttle)
+
+    @throttle_rates(password_hash='2/min', password_hash_total='3/min')
+    def test_password_hash_total_bucket(self):
+        """Test the shared bucket limits all clients together."""
+        throttle = self.make_throttle(PasswordHashThrottle, scope=None)
+        results = [
+            self.request(throttle, ip)
+            for ip in ['10.0.0.1', '10.0.0.1', '10.0.0.1', '10.0.0.2']
+        ]
+        # The refused third request did not use the shared bucket.
+        self.assertEqual(results, [True, True, False, True])
+        self.assertFalse(self.request(throttle, ip='10.0.0.3'))
@@ -0,0 +1,94 @@
+"""
+Token bucket throttles.
+"""
+import time
+
+from django.core.cache import cache as default_cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle each client with a token bucket kept in the default cache.
+
+    A rate of 'N/period' in DEFAULT_THROTTLE_RATES[scope] lets a client
+    burst N requests, after which its bucket refills at N per period. A
+    scope without a rate is not throttled. Like DRF's own throttles, the
+    read-modify-write of a bucket is not atomic, so concurrent requests
+    may occasionally get through together.
+    """
+    cache = default_cache
+    timer = time.time
+    cache_format = 'throttle_bucket_%(scope)s_%(ident)s'
+    scope = None
+
+    def parse_rate(self, scope):
+        """Return (capacity, seconds to refill it) for `scope`, or None."""
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return None
+        try:
+            num, period = rate.split('/')
+            return int(num), PERIODS[period[0]]
+        except (KeyError, ValueError):
+            raise ImproperlyConfigured(
+                f'Invalid throttle rate "{rate}" for scope "{scope}".')
+
+    def take(self, scope, ident):
+        """Take a token from a bucket; return 0 or the seconds to wait."""
+        rate = self.parse_rate(scope)
+        if rate is None:
+            return 0
+        capacity, duration = rate
+        key = self.cache_format % {'scope': scope, 'ident': ident}
+        now = self.timer()
+        tokens, stamp = self.cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - stamp) * capacity / duration)
+        if tokens < 1:
+            return (1 - tokens) * duration / capacity
+        # A bucket left alone for `duration` is full again, like a new one.
+        self.cache.set(key, (tokens - 1, now), duration)
+        return 0
+
+    def allow_request(self, request, view):
+        self.wait_seconds = self.take(self.scope, self.get_ident(request))
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class PasswordHashThrottle(TokenBucketThrottle):
+    """Limit requests that hash a password, per client and in total.
+
+    Requests take a token from the client's 'password_hash' bucket, then
+    from the 'password_hash_total' bucket shared by everyone, so a login
+    storm from many addresses cannot spend all worker CPU on hashing.
+    Requests refused by their own bucket leave the shared one alone.
+    """
+    scope = 'password_hash'
+    total_scope = 'password_hash_total'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = (
+            self.take(self.scope, self.get_ident(request))
+            or self.take(self.total_scope, 'all')
+        )
+        return not self.wait_seconds
+
+
+class ExportThrottle(TokenBucketThrottle):
+    """Limit the exports each user can queue.
+
+    Buckets are kept per user rather than per address, as every export
+    is requested with a token.
+    """
+    scope = 'export'
+
+    def get_ident(self, request):
+        if request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return super().get_ident(request)
@@ -0,0 +1,47 @@
+"""
+Health check endpoints for load balancers and orchestrators.
+"""
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+
+def live(request):
+    """Report that the process serves requests, without touching the DB."""
+    return JsonResponse({'status': 'ok'})
+
+
+def ready(request):
+    """Report whether every configured database answers a query.
+
+    Replicas are reported but do not fail the check, as reads fall back
+    to the primary without them. Databases using the pooled backend also
+    report their pool's metrics.
+    """
+    databases = {}
+    for connection in connections.all():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            databases[connection.alias] = 'ok'
+        except DatabaseError:
+            logger.exception('Database %s is unavailable.', connection.alias)
+            databases[connection.alias] = 'unavailable'
+    healthy = all(
+        state == 'ok' for alias, state in databases.items()
+        if alias not in settings.DB_REPLICAS
+    )
+    body = {'status': 'ok' if healthy else 'unavailable',
+            'databases': databases}
+    pools = {
+        connection.alias: connection.pool.stats()
+        for connection in connections.all()
+        if getattr(connection, 'pool', None) is not None
+    }
+    if pools:
+        body['pools'] = pools
+    return JsonResponse(body, status=200 if healthy else 503)
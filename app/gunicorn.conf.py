@@ -0,0 +1,39 @@
+"""
+Gunicorn settings for the production serving profile.
+
+`gunicorn` run from this directory picks this file up. SERVER_MODE=wsgi
+(the default) serves app/wsgi.py with threaded workers; SERVER_MODE=asgi
+serves app/asgi.py with uvicorn workers. Every setting can be tuned from
+the environment.
+"""
+import multiprocessing
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'app.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'app.wsgi:application'
+    worker_class = 'gthread'
+
+# Each worker is a process; each of its threads holds its own database
+# connection when DB_CONN_MAX_AGE keeps them, so Postgres sees up to
+# workers * threads connections.
+workers = int(os.environ.get(
+    'WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then to bound slow memory growth.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-' if os.environ.get('GUNICORN_ACCESS_LOG') == 'true' else None
+errorlog = '-'
@@ -12,3 +12,10 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
     name = serializers.CharField(required=True, allow_blank=False)
+
+
+class TagSuggestionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tag
+        fields = ['id', 'name', 'article_count']
+        read_only_fields = fields
@@ -1,16 +1,21 @@
 """
 Test for tag api.
 """
+import time
+from datetime import date
+from unittest.mock import patch
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from core.models import Tag
+from core.models import Article, Tag
 from tag.serializers import TagSerializer
+from tag.views import TRIGRAM_CHECK_INTERVAL, has_trigram, trigram_checks
 
 
 TAG_LIST_URL = reverse('tag:tag-list')
+TAG_SUGGEST_URL = reverse('tag:tag-suggest')
 
 
 def create_user(**params):
@@ -40,6 +45,73 @@ class PublicTagApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data["results"], serializer.data)
 
+    def test_list_tags_without_count(self):
+        """Test count=false skips the COUNT query."""
+        Tag.objects.create(name='test1')
+        Tag.objects.create(name='test2')
+
+        with self.assertNumQueries(1):
+            res = self.client.get(TAG_LIST_URL, {'count': 'false'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', res.data)
+        self.assertIsNone(res.data['next'])
+        self.assertEqual(len(res.data["results"]), 2)
+
+
+class TagSuggestTests(TestCase):
+    """Test the tag autocomplete endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        names = ['Python', 'pytest', 'pyramid', 'django', 'typing']
+        self.tags = {name: Tag.objects.create(name=name) for name in names}
+        for used in (['pytest'], ['pytest', 'pyramid'], ['typing']):
+            article = Article.objects.create(
+                title='t', publication_date=date.today())
+            article.tags.set([self.tags[name] for name in used])
+
+    def suggest(self, **params):
+        res = self.client.get(TAG_SUGGEST_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [(tag['name'], tag['article_count']) for tag in res.data]
+
+    def test_prefix_matches_ranked_by_usage(self):
+        """Test prefix matches ignore case and the most used come first."""
+        self.assertEqual(
+            self.suggest(q='PY'),
+            [('pytest', 2), ('pyramid', 1), ('Python', 0)])
+
+    def test_limit(self):
+        """Test the number of suggestions is capped and validated."""
+        self.assertEqual(self.suggest(q='py', limit=1), [('pytest', 2)])
+
+        res = self.client.get(TAG_SUGGEST_URL, {'q': 'py', 'limit': 'all'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_empty_query(self):
+        """Test nothing is suggested without a query."""
+        self.assertEqual(self.suggest(q=' '), [])
+
+    def test_similar_names_follow_prefixes(self):
+        """Test misspelt queries are completed by trigram similarity."""
+        if not has_trigram():
+            self.skipTest('pg_trgm is not installed')
+        self.assertEqual(self.suggest(q='pytset'), [('pytest', 2)])
+
+    def test_trigram_check_expires(self):
+        """Test the pg_trgm check is repeated after its interval."""
+        trigram_checks.clear()
+        self.addCleanup(trigram_checks.clear)
+        with self.assertNumQueries(1):
+            has_trigram()
+            has_trigram()
+
+        later = time.monotonic() + TRIGRAM_CHECK_INTERVAL
+        with patch('tag.views.time.monotonic', return_value=later):
+            with self.assertNumQueries(1):
+                has_trigram()
+
 
 class PrivateTagApiTests(TestCase):
     """Test the authorized user tag api."""
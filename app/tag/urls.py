@@ -8,5 +8,6 @@ app_name = 'tag'
 
 urlpatterns = [
     path('', views.TagListCreateView.as_view(), name='tag-list'),
+    path('suggest/', views.TagSuggestView.as_view(), name='tag-suggest'),
     path('<int:pk>/', views.TagDetailView.as_view(), name='tag-detail'),
 ]
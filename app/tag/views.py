@@ -1,15 +1,47 @@
 """
 Views for the tag API.
 """
+import time
+from django.db import connections
 from rest_framework import generics, permissions
-from core.models import Tag
-from tag.serializers import TagSerializer
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from core.cache import CachedResponseMixin
+from core.fastpath import FastListMixin
+from core.models import Article, Tag
+from tag.serializers import TagSerializer, TagSuggestionSerializer
 
 
-class TagListCreateView(generics.ListCreateAPIView):
+# Seconds a process trusts its answer from has_trigram().
+TRIGRAM_CHECK_INTERVAL = 60
+trigram_checks = {}
+
+
+def has_trigram(using='default'):
+    """Return whether the pg_trgm extension is installed.
+
+    The answer is kept for TRIGRAM_CHECK_INTERVAL seconds, so installing
+    or dropping the extension takes effect without a restart.
+    """
+    now = time.monotonic()
+    installed, expires = trigram_checks.get(using, (None, 0.0))
+    if now < expires:
+        return installed
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        installed = cursor.fetchone() is not None
+    trigram_checks[using] = (installed, now + TRIGRAM_CHECK_INTERVAL)
+    return installed
+
+
+class TagListCreateView(
+        CachedResponseMixin,
+        FastListMixin,
+        generics.ListCreateAPIView):
     """View for listing and creating tags."""
     queryset = Tag.objects.all().order_by('id')
     serializer_class = TagSerializer
+    cache_models = (Tag,)
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -17,11 +49,63 @@ class TagListCreateView(generics.ListCreateAPIView):
         return [permissions.AllowAny()]
 
 
-class TagDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TagDetailView(
+        CachedResponseMixin,
+        generics.RetrieveUpdateDestroyAPIView):
     queryset = Tag.objects.all().order_by('id')
     serializer_class = TagSerializer
+    cache_models = (Tag,)
 
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
+
+
+class TagSuggestView(
+        CachedResponseMixin,
+        generics.ListAPIView):
+    """View for suggesting tags for a partly typed name.
+
+    Tags starting with `?q=` come first, most used first. Remaining slots
+    are filled with similarly spelled tags when pg_trgm is installed.
+    """
+    queryset = Tag.objects.all()
+    serializer_class = TagSuggestionSerializer
+    pagination_class = None
+    # Usage counts change with the tags of articles.
+    cache_models = (Article, Tag)
+    default_limit = 10
+    max_limit = 50
+    min_similar_length = 3
+
+    def get_limit(self):
+        value = self.request.query_params.get('limit', self.default_limit)
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({
+                'limit': [f'Must be between 1 and {self.max_limit}.']
+            })
+        return limit
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        limit = self.get_limit()
+        if not query:
+            return Response([])
+
+        queryset = self.get_queryset()
+        tags = list(queryset.name_prefix(query).order_by(
+            '-article_count', 'name')[:limit])
+        if len(tags) < limit and len(query) >= self.min_similar_length \
+                and has_trigram(queryset.db):
+            tags += queryset.similar_name(query).exclude(
+                pk__in=[tag.pk for tag in tags]
+            ).order_by('-similarity', '-article_count', 'name')[
+                :limit - len(tags)]
+
+        serializer = self.get_serializer(tags, many=True)
+        return Response(serializer.data)
@@ -1,7 +1,9 @@
 """
 Tests for the user API.
 """
-from django.test import TestCase
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
@@ -21,6 +23,8 @@ class PublicUserApiTests(TestCase):
     """Test the public features of the user API."""
     def setUp(self):
         self.client = APIClient()
+        # Start every test with full throttle buckets.
+        cache.clear()
 
     def test_create_user_success(self):
         """Test creating a user is successful."""
@@ -102,6 +106,47 @@ class PublicUserApiTests(TestCase):
         self.assertNotIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    @override_settings(PASSWORD_HASHERS=[
+        'core.hashers.TunablePBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_login_upgrades_password_hash(self):
+        """Test logging in rehashes with the configured hasher and cost."""
+        with override_settings(PASSWORD_HASHERS=[
+                'django.contrib.auth.hashers.MD5PasswordHasher']):
+            user = create_user(username='testuser', password='testpass123')
+        payload = {'username': 'testuser', 'password': 'testpass123'}
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.client.post(TOKEN_URL, payload)
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+            self.assertTrue(user.check_password('testpass123'))
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'password_hash': '10/min'},
+    })
+    def test_token_requests_are_throttled(self):
+        """Test password-hashing endpoints refuse bursts from one client."""
+        payload = {'username': 'testuser', 'password': 'wrong'}
+        for _ in range(10):
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(TOKEN_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', res)
+        res = self.client.post(CREATE_USER_URL, {
+            'username': 'other', 'password': 'testpass123'})
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
     def test_retrieve_user_unauthorized(self):
         """Test authentication is required for users."""
         res = self.client.get(ME_URL)